@@ -17,6 +17,13 @@ from pathlib import Path
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Optional fast JSON rendering for large responses
+try:
+    import orjson  # noqa: F401 - required by ORJSONResponse at render time
+    from fastapi.responses import ORJSONResponse as FastJSONResponse
+except ImportError:
+    FastJSONResponse = JSONResponse
+
 # Optional audio modules (may fail on Python 3.13+)
 try:
     from modules.voice_recognition import VoiceRecognizer
@@ -1027,7 +1034,7 @@ async def get_status():
 async def get_complete_system_stats():
     """Get complete comprehensive system statistics"""
     try:
-        return system_monitor.get_complete_system_stats()
+        return await asyncio.to_thread(system_monitor.get_complete_system_stats)
     except Exception as e:
         logger.error(f"Error getting system stats: {e}")
         return JSONResponse(status_code=500, content={"error": str(e)})
@@ -3811,7 +3818,8 @@ async def benchmark_function_performance(request: dict):
             file_path=request.get("file_path", ""),
             function_name=request.get("function_name", ""),
             iterations=request.get("iterations", 1000),
-            compare_to_baseline=request.get("compare_to_baseline", False)
+            compare_to_baseline=request.get("compare_to_baseline", False),
+            jit=request.get("jit", False)
         )
         return result
     except Exception as e:
@@ -3843,7 +3851,7 @@ async def generate_api_mock(request: dict):
         result = await testing.generate_api_mock(
             openapi_spec=request.get("openapi_spec", {})
         )
-        return result
+        return FastJSONResponse(content=result)
     except Exception as e:
         logger.error(f"Error generating API mock: {e}")
         return JSONResponse(status_code=500, content={"error": str(e), "success": False})
@@ -0,0 +1,15 @@
+"""
+Pytest fixtures for the endpoint checks in the backend root
+"""
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def client():
+    """One in-process client per worker, so the app is built once"""
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    with TestClient(app) as client:
+        yield client
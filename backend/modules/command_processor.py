@@ -29,42 +29,50 @@ logger = logging.getLogger(__name__)
 
 
 class CommandProcessor:
-    def __init__(self, app_launcher: AppLauncher, tts: TextToSpeech, gemini=None, browser_automation=None):
+    def __init__(self, app_launcher: AppLauncher, tts: TextToSpeech, gemini=None, browser_automation=None,
+                 use_gemini: bool = True):
         self.app_launcher = app_launcher
         self.tts = tts
         self.browser_automation = browser_automation
 
+        # Set for every mode so stats and fallbacks work without AI
+        self.openrouter = None
+        self.enable_multi_model = False
+        self.usage_stats = {
+            'cloud_queries': 0,
+            'fallback_count': 0
+        }
+
         # Initialize Gemini for AI processing
-        try:
-            # Use provided instance or create new one
-            if gemini is None:
-                self.gemini = GeminiProcessor()
-            else:
-                self.gemini = gemini
+        if use_gemini:
+            try:
+                # Use provided instance or create new one
+                if gemini is None:
+                    self.gemini = GeminiProcessor()
+                else:
+                    self.gemini = gemini
 
-            self.query_analyzer = QueryAnalyzer()
+                self.query_analyzer = QueryAnalyzer()
             
-            # Initialize OpenRouter for fallback and multi-model responses
-            self.openrouter = None
-            if OPENROUTER_AVAILABLE:
-                try:
-                    self.openrouter = OpenRouterAPI()
-                    logger.info("✅ OpenRouter available for fallback and multi-model responses")
-                except Exception as e:
-                    logger.warning(f"OpenRouter initialization failed: {e}")
-
-            self.use_ai = True
-            self.enable_multi_model = os.getenv('ENABLE_MULTI_MODEL', 'false').lower() == 'true'
-
-            # Usage tracking
-            self.usage_stats = {
-                'cloud_queries': 0,
-                'fallback_count': 0
-            }
-
-            logger.info("Gemini AI system initialized")
-        except Exception as e:
-            logger.warning(f"Failed to initialize Gemini: {e}. Falling back to regex patterns.")
+                # Initialize OpenRouter for fallback and multi-model responses
+                if OPENROUTER_AVAILABLE:
+                    try:
+                        self.openrouter = OpenRouterAPI()
+                        logger.info("✅ OpenRouter available for fallback and multi-model responses")
+                    except Exception as e:
+                        logger.warning(f"OpenRouter initialization failed: {e}")
+
+                self.use_ai = True
+                self.enable_multi_model = os.getenv('ENABLE_MULTI_MODEL', 'false').lower() == 'true'
+
+                logger.info("Gemini AI system initialized")
+            except Exception as e:
+                logger.warning(f"Failed to initialize Gemini: {e}. Falling back to regex patterns.")
+                self.gemini = None
+                self.query_analyzer = None
+                self.use_ai = False
+        else:
+            # Regex patterns only, so no AI provider is set up or contacted
             self.gemini = None
             self.query_analyzer = None
             self.use_ai = False
@@ -2,14 +2,42 @@
 Local-only LLM mode using Ollama
 Provides privacy-focused AI without sending data to cloud
 """
+import asyncio
+import json
 import os
+import time
 import aiohttp
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, AsyncIterator
 from dotenv import load_dotenv
 
+# Optional fast JSON for request bodies and Ollama's NDJSON responses
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Load environment variables
 load_dotenv()
 
+# Seconds an /api/tags answer is reused before asking Ollama again
+TAGS_CACHE_TTL = 5
+
+
+def _dumps(obj: Any) -> str:
+    """Serialize to JSON, using orjson when installed"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj)
+
+
+def _loads(data: Any) -> Any:
+    """Parse JSON, using orjson when installed"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
 class LocalLLM:
     # Predefined models available in F.R.I.D.A.Y.
     AVAILABLE_MODELS = {
@@ -27,17 +55,52 @@ class LocalLLM:
         self.model = os.getenv('LOCAL_MODEL', 'llama3.2:3b')
         self.available = False
         self.installed_models = []
+        self._installed_set = set()
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._tags_cache: Optional[tuple] = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Shared keep-alive session, opened on first use"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=32, keepalive_timeout=60),
+                headers={"Connection": "keep-alive"},
+                json_serialize=_dumps
+            )
+        return self._session
+
+    async def close(self):
+        """Close the shared HTTP session"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def _fetch_installed(self, timeout: float = 10) -> List[str]:
+        """Installed model names, cached for TAGS_CACHE_TTL seconds"""
+        if self._tags_cache and time.monotonic() - self._tags_cache[0] < TAGS_CACHE_TTL:
+            return self._tags_cache[1]
+
+        session = self._get_session()
+        async with session.get(f"{self.base_url}/api/tags", timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+            response.raise_for_status()
+            data = await response.json(loads=_loads)
+
+        self.installed_models = [m['name'] for m in data.get('models', [])]
+        self._installed_set = set(self.installed_models)
+        self._tags_cache = (time.monotonic(), self.installed_models)
+        return self.installed_models
 
     async def check_availability(self) -> bool:
         """Check if Ollama is running"""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(f"{self.base_url}/api/tags", timeout=aiohttp.ClientTimeout(total=2)) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        self.installed_models = [m['name'] for m in data.get('models', [])]
-                        self.available = len(self.installed_models) > 0
-                        return self.available
+            self.available = len(await self._fetch_installed(timeout=2)) > 0
+            return self.available
         except Exception as e:
             print(f"Ollama not available: {e}")
             self.available = False
@@ -46,11 +109,7 @@ class LocalLLM:
     async def list_models(self) -> List[str]:
         """List available local models"""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(f"{self.base_url}/api/tags") as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return [m['name'] for m in data.get('models', [])]
+            return await self._fetch_installed()
         except Exception as e:
             print(f"Error listing models: {e}")
             return []
@@ -66,7 +125,7 @@ class LocalLLM:
                 "size": info["size"],
                 "type": info["type"],
                 "icon": info["icon"],
-                "installed": model_id in self.installed_models,
+                "installed": model_id in self._installed_set,
                 "active": model_id == self.model
             })
         return models
@@ -91,13 +150,13 @@ class LocalLLM:
             }
         return None
 
-    async def generate(self, prompt: str, system: str = None, stream: bool = False) -> Optional[str]:
+    async def generate(self, prompt: str, system: str = None, stream: bool = False,
+                       model: str = None) -> Optional[str]:
         """Generate response using local model"""
         try:
-            import json
-            
             payload = {
-                "model": self.model,
+                # An explicit model leaves self.model alone for concurrent callers
+                "model": model or self.model,
                 "prompt": prompt,
                 "stream": False  # Always disable streaming for simpler handling
             }
@@ -105,37 +164,105 @@ class LocalLLM:
             if system:
                 payload["system"] = system
 
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f"{self.base_url}/api/generate",
-                    json=payload,
-                    timeout=aiohttp.ClientTimeout(total=120)  # Increased timeout
-                ) as response:
-                    if response.status == 200:
-                        # Ollama always returns NDJSON (newline delimited JSON)
-                        full_response = ""
-                        async for line in response.content:
-                            if line:
-                                try:
-                                    chunk = json.loads(line.decode('utf-8'))
-                                    if 'response' in chunk:
-                                        full_response += chunk['response']
-                                    # Check if generation is done
-                                    if chunk.get('done', False):
-                                        break
-                                except json.JSONDecodeError:
-                                    continue
-                        return full_response if full_response else None
-                    else:
-                        error_text = await response.text()
-                        print(f"Ollama API error: {response.status} - {error_text}")
-                        return None
+            session = self._get_session()
+            async with session.post(
+                f"{self.base_url}/api/generate",
+                json=payload,
+                timeout=aiohttp.ClientTimeout(total=120)  # Increased timeout
+            ) as response:
+                if response.status == 200:
+                    # Ollama always returns NDJSON (newline delimited JSON)
+                    full_response = ""
+                    async for line in response.content:
+                        if line:
+                            try:
+                                chunk = _loads(line)
+                                if 'response' in chunk:
+                                    full_response += chunk['response']
+                                # Check if generation is done
+                                if chunk.get('done', False):
+                                    break
+                            except json.JSONDecodeError:
+                                continue
+                    return full_response if full_response else None
+                else:
+                    error_text = await response.text()
+                    print(f"Ollama API error: {response.status} - {error_text}")
+                    return None
         except Exception as e:
             print(f"Error generating with local model: {e}")
             import traceback
             traceback.print_exc()
             return None
 
+    async def stream_generate(self, prompt: str, system: str = None, model: str = None) -> AsyncIterator[str]:
+        """Yield response text as the local model produces it"""
+        payload = {
+            "model": model or self.model,
+            "prompt": prompt,
+            "stream": True
+        }
+
+        if system:
+            payload["system"] = system
+
+        try:
+            session = self._get_session()
+            async with session.post(
+                f"{self.base_url}/api/generate",
+                json=payload,
+                timeout=aiohttp.ClientTimeout(total=120)
+            ) as response:
+                if response.status != 200:
+                    error_text = await response.text()
+                    print(f"Ollama API error: {response.status} - {error_text}")
+                    return
+
+                # One JSON object per line, each carrying the next token
+                async for line in response.content:
+                    if not line.strip():
+                        continue
+                    chunk = _loads(line)
+                    if chunk.get('response'):
+                        yield chunk['response']
+                    if chunk.get('done', False):
+                        break
+        except Exception as e:
+            print(f"Error streaming from local model: {e}")
+
+    async def generate_with_metrics(self, prompt: str, system: str = None,
+                                    model: str = None) -> Optional[Dict[str, Any]]:
+        """Generate a response, timing the first token and the decode rate"""
+        start = time.perf_counter()
+        first_token = None
+        pieces = []
+
+        async for piece in self.stream_generate(prompt, system=system, model=model):
+            if first_token is None:
+                first_token = time.perf_counter()
+            pieces.append(piece)
+        end = time.perf_counter()
+
+        if first_token is None:
+            return None
+
+        # Tokens after the first are the decode phase; one token has no rate
+        decode_time = end - first_token
+        decoded = len(pieces) - 1
+        return {
+            "response": "".join(pieces),
+            "ttft": first_token - start,
+            "duration": end - start,
+            "tokens": len(pieces),
+            "tokens_per_second": decoded / decode_time if decoded and decode_time > 0 else None
+        }
+
+    async def generate_batch(self, prompts: List[str], system: str = None,
+                             model: str = None) -> List[Optional[str]]:
+        """Generate responses for several prompts concurrently"""
+        # In-flight requests let Ollama batch them when OLLAMA_NUM_PARALLEL > 1
+        return await asyncio.gather(*(self.generate(prompt, system=system, model=model) for prompt in prompts))
+
     async def chat(self, messages: List[Dict[str, str]]) -> Optional[str]:
         """Chat with local model using conversation history"""
         try:
@@ -145,15 +272,15 @@ class LocalLLM:
                 "stream": False
             }
 
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f"{self.base_url}/api/chat",
-                    json=payload,
-                    timeout=aiohttp.ClientTimeout(total=60)
-                ) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return data.get('message', {}).get('content', '')
+            session = self._get_session()
+            async with session.post(
+                f"{self.base_url}/api/chat",
+                json=payload,
+                timeout=aiohttp.ClientTimeout(total=60)
+            ) as response:
+                if response.status == 200:
+                    data = await response.json(loads=_loads)
+                    return data.get('message', {}).get('content', '')
         except Exception as e:
             print(f"Error in chat: {e}")
             return None
@@ -161,17 +288,39 @@ class LocalLLM:
     async def pull_model(self, model_name: str) -> bool:
         """Pull a model from Ollama registry"""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f"{self.base_url}/api/pull",
-                    json={"name": model_name},
-                    timeout=aiohttp.ClientTimeout(total=300)  # 5 minutes for download
-                ) as response:
-                    return response.status == 200
+            session = self._get_session()
+            async with session.post(
+                f"{self.base_url}/api/pull",
+                json={"name": model_name},
+                timeout=aiohttp.ClientTimeout(total=300)  # 5 minutes for download
+            ) as response:
+                # A new model changes the installed list
+                self._tags_cache = None
+                return response.status == 200
         except Exception as e:
             print(f"Error pulling model: {e}")
             return False
 
+    async def preload(self, model_name: str = None) -> bool:
+        """Load a model into memory and keep it resident"""
+        try:
+            # A generate request with no prompt only loads the model
+            session = self._get_session()
+            async with session.post(
+                f"{self.base_url}/api/generate",
+                json={"model": model_name or self.model, "keep_alive": -1},
+                timeout=aiohttp.ClientTimeout(total=300)
+            ) as response:
+                return response.status == 200
+        except Exception as e:
+            print(f"Error preloading model: {e}")
+            return False
+
+    async def preload_models(self, model_names: List[str]) -> Dict[str, bool]:
+        """Load several models at once"""
+        results = await asyncio.gather(*(self.preload(name) for name in model_names))
+        return dict(zip(model_names, results))
+
     def get_setup_instructions(self) -> Dict[str, Any]:
         """Get setup instructions for Ollama"""
         return {
@@ -3,36 +3,184 @@ Snippet Manager - Code Snippet Library with AI Search
 Save, organize, and search code snippets with AI-powered semantic search
 """
 
+import asyncio
 import logging
+import queue
+import re
 import sqlite3
+import threading
+from contextlib import contextmanager
 from typing import List, Dict, Optional, Any
-from datetime import datetime
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+try:
+    import numpy as np
+    import faiss
+    FAISS_AVAILABLE = True
+except ImportError:
+    FAISS_AVAILABLE = False
+
+try:
+    import google.generativeai as genai
+    GEMINI_AVAILABLE = True
+except ImportError:
+    GEMINI_AVAILABLE = False
+
+DEFAULT_POOL_SIZE = 4
+
+# Semantic index settings
+EMBEDDING_MODEL = "models/text-embedding-004"
+EMBEDDING_DIM = 768
+EMBEDDING_BATCH_SIZE = 100
+EMBEDDING_CODE_CHARS = 2000
+# Unit vectors are stored as int8 scaled by this factor (768 bytes each)
+EMBEDDING_INT8_SCALE = 127
+
+# Candidates offered to the LLM for semantic search
+SEMANTIC_CANDIDATES = 50
+
+# Search query parsing
+_TERM_RE = re.compile(r"\w+")
+_DIGIT_RE = re.compile(r"\d+")
+
+# Per-connection prepared statement cache size
+STATEMENT_CACHE_SIZE = 512
+
+# Fixed SQL statements, reused verbatim so the connection statement cache hits
+_SQL_INSERT = """
+    INSERT INTO snippets 
+    (title, description, code, language, tags, category, user_id, is_public)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+_SQL_GET = "SELECT * FROM snippets WHERE id = ?"
+_SQL_DELETE = "DELETE FROM snippets WHERE id = ?"
+_SQL_INCREMENT_USAGE = "UPDATE snippets SET usage_count = usage_count + 1 WHERE id = ?"
+_SQL_POPULAR = """
+    SELECT * FROM snippets 
+    WHERE is_public = 1 
+    ORDER BY usage_count DESC 
+    LIMIT ?
+"""
+_SQL_STATS = """
+    SELECT COUNT(*), COUNT(DISTINCT language), COUNT(DISTINCT category)
+    FROM snippets
+"""
+_SQL_MISSING_EMBEDDINGS = """
+    SELECT s.id, s.title, s.description, s.tags, s.code
+    FROM snippets s
+    LEFT JOIN snippet_embeddings e ON e.snippet_id = s.id
+    WHERE e.snippet_id IS NULL
+"""
+_SQL_MISSING_EMBEDDINGS_BATCH = _SQL_MISSING_EMBEDDINGS + " LIMIT ?"
+_SQL_SAVE_EMBEDDING = (
+    "INSERT OR REPLACE INTO snippet_embeddings (snippet_id, embedding) VALUES (?, ?)"
+)
+_SQL_ALL_EMBEDDINGS = "SELECT snippet_id, embedding FROM snippet_embeddings"
+
 
 class SnippetManager:
     """Manage code snippets with AI-powered search"""
     
-    def __init__(self, db_path: str = "snippets.db", gemini_processor=None):
+    def __init__(
+        self,
+        db_path: str = "snippets.db",
+        gemini_processor=None,
+        pool_size: int = DEFAULT_POOL_SIZE
+    ):
         """
         Initialize snippet manager
         
         Args:
             db_path: Path to SQLite database
             gemini_processor: Gemini AI for semantic search
+            pool_size: Number of pooled SQLite connections
         """
         self.db_path = db_path
         self.gemini = gemini_processor
         self._init_database()
+        
+        # In-memory ANN index over stored embeddings, built on first use
+        self._semantic_index = None
+        self._index_lock = threading.Lock()
+        self._backfill_thread: Optional[threading.Thread] = None
+        
+        # Long-lived connections shared by all methods
+        self._pool_size = pool_size
+        self._pool: queue.Queue = queue.Queue(maxsize=pool_size)
+        for _ in range(pool_size):
+            self._pool.put(self._create_connection())
+        
+        # Embed snippets saved before they had vectors, off the request path
+        self.start_embedding_backfill()
+        
         logger.info("Snippet Manager initialized")
     
+    def _create_connection(self) -> sqlite3.Connection:
+        """Open a pooled connection with tuned PRAGMAs"""
+        conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            cached_statements=STATEMENT_CACHE_SIZE
+        )
+        conn.row_factory = sqlite3.Row
+        # journal_mode is persisted by _init_database; these are per-connection
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA mmap_size=268435456")
+        conn.execute("PRAGMA cache_size=-65536")
+        return conn
+    
+    @contextmanager
+    def get_conn(self):
+        """Borrow a connection from the pool"""
+        conn = self._pool.get()
+        try:
+            yield conn
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self._pool.put(conn)
+    
+    @contextmanager
+    def transaction(self):
+        """Run a group of writes in one IMMEDIATE transaction (single commit)"""
+        with self.get_conn() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            yield conn
+            conn.commit()
+    
+    def get_pool_stats(self) -> Dict[str, int]:
+        """Get connection pool usage"""
+        available = self._pool.qsize()
+        return {
+            "pool_size": self._pool_size,
+            "available": available,
+            "in_use": self._pool_size - available
+        }
+    
+    def close(self):
+        """Close all pooled connections"""
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
+    
     def _init_database(self):
         """Initialize SQLite database"""
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
         
+        # WAL lets readers run alongside a writer and, with synchronous=NORMAL,
+        # avoids an fsync per committed write. The mode persists in the file.
+        cursor.execute("PRAGMA journal_mode=WAL")
+        journal_mode = cursor.fetchone()[0]
+        if journal_mode.lower() != "wal":
+            logger.warning(f"Could not enable WAL for {self.db_path}, using {journal_mode}")
+        
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS snippets (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -60,9 +208,127 @@ class SnippetManager:
             ON snippets(tags)
         """)
         
+        # Composite indexes matching list_snippets / get_popular_snippets
+        # filters, so their ORDER BY is served without a sort step
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_snippets_user_created
+            ON snippets(user_id, is_public, created_at DESC)
+        """)
+        
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_snippets_lang_created
+            ON snippets(language, created_at DESC)
+        """)
+        
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_snippets_cat_created
+            ON snippets(category, created_at DESC)
+        """)
+        
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_snippets_public_usage
+            ON snippets(is_public, usage_count DESC)
+        """)
+        
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS snippets_touch
+            AFTER UPDATE OF title, description, code, tags, category ON snippets
+            BEGIN
+                UPDATE snippets SET updated_at = CURRENT_TIMESTAMP WHERE id = new.id;
+            END
+        """)
+        
+        self._fts_enabled = self._init_fts(cursor)
+        
+        # Snippet embeddings (int8-quantized unit vectors) for semantic
+        # search. Rows are dropped when the snippet is deleted or its text
+        # changes; snippets are re-embedded when saved, or by the backfill.
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS snippet_embeddings (
+                snippet_id INTEGER PRIMARY KEY,
+                embedding BLOB NOT NULL
+            )
+        """)
+        
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS snippet_embeddings_delete AFTER DELETE ON snippets
+            BEGIN
+                DELETE FROM snippet_embeddings WHERE snippet_id = old.id;
+            END
+        """)
+        
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS snippet_embeddings_update
+            AFTER UPDATE OF title, description, code, tags ON snippets
+            BEGIN
+                DELETE FROM snippet_embeddings WHERE snippet_id = old.id;
+            END
+        """)
+        
         conn.commit()
+        
+        # Collect planner statistics the first time, refresh cheaply after
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'")
+        if cursor.fetchone() is None:
+            cursor.execute("ANALYZE")
+        else:
+            cursor.execute("PRAGMA optimize")
+        
         conn.close()
     
+    def _init_fts(self, cursor: sqlite3.Cursor) -> bool:
+        """Create the FTS5 index over snippets, kept in sync by triggers"""
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'snippets_fts'"
+        )
+        exists = cursor.fetchone() is not None
+        
+        try:
+            cursor.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS snippets_fts USING fts5(
+                    title, description, code, tags,
+                    content='snippets', content_rowid='id',
+                    tokenize='porter unicode61'
+                )
+            """)
+        except sqlite3.OperationalError as e:
+            logger.warning(f"FTS5 unavailable, using keyword scan for search: {e}")
+            return False
+        
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS snippets_fts_insert AFTER INSERT ON snippets
+            BEGIN
+                INSERT INTO snippets_fts (rowid, title, description, code, tags)
+                VALUES (new.id, new.title, new.description, new.code, new.tags);
+            END
+        """)
+        
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS snippets_fts_delete AFTER DELETE ON snippets
+            BEGIN
+                INSERT INTO snippets_fts (snippets_fts, rowid, title, description, code, tags)
+                VALUES ('delete', old.id, old.title, old.description, old.code, old.tags);
+            END
+        """)
+        
+        # Only indexed columns re-index; usage_count updates skip the FTS table
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS snippets_fts_update
+            AFTER UPDATE OF title, description, code, tags ON snippets
+            BEGIN
+                INSERT INTO snippets_fts (snippets_fts, rowid, title, description, code, tags)
+                VALUES ('delete', old.id, old.title, old.description, old.code, old.tags);
+                INSERT INTO snippets_fts (rowid, title, description, code, tags)
+                VALUES (new.id, new.title, new.description, new.code, new.tags);
+            END
+        """)
+        
+        if not exists:
+            # Index snippets saved before the FTS table existed
+            cursor.execute("INSERT INTO snippets_fts (snippets_fts) VALUES ('rebuild')")
+        
+        return True
+    
     def create_snippet(
         self,
         title: str,
@@ -91,37 +357,82 @@ class SnippetManager:
             Created snippet object
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
             tags_str = ",".join(tags) if tags else ""
             
-            cursor.execute("""
-                INSERT INTO snippets 
-                (title, description, code, language, tags, category, user_id, is_public)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (title, description, code, language, tags_str, category, user_id, is_public))
-            
-            snippet_id = cursor.lastrowid
-            conn.commit()
-            conn.close()
+            with self.get_conn() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    _SQL_INSERT,
+                    (title, description, code, language, tags_str, category, user_id, is_public)
+                )
+                
+                snippet_id = cursor.lastrowid
+                conn.commit()
             
+            self._embed_snippets([snippet_id])
             return self.get_snippet(snippet_id)
             
         except Exception as e:
             logger.error(f"Error creating snippet: {e}")
             return {"error": str(e)}
     
+    def create_snippets_bulk(self, snippets: List[Dict[str, Any]]) -> int:
+        """
+        Create many snippets in a single transaction
+        
+        Args:
+            snippets: Dicts with the same fields as create_snippet arguments
+            
+        Returns:
+            Number of snippets created
+        """
+        try:
+            rows = [
+                (
+                    s["title"],
+                    s.get("description", ""),
+                    s["code"],
+                    s["language"],
+                    ",".join(s["tags"]) if s.get("tags") else "",
+                    s.get("category", ""),
+                    s.get("user_id"),
+                    s.get("is_public", False)
+                )
+                for s in snippets
+            ]
+            
+            with self.transaction() as conn:
+                conn.executemany(_SQL_INSERT, rows)
+            
+            self.start_embedding_backfill()
+            return len(rows)
+            
+        except Exception as e:
+            logger.error(f"Error creating snippets: {e}")
+            return 0
+    
+    def _query_snippets(self, sql: str, params) -> List[Dict[str, Any]]:
+        """Run a snippet query and return rows as dicts with tags split"""
+        with self.get_conn() as conn:
+            # Plain tuples zipped with the column names once, instead of
+            # per-row sqlite3.Row -> dict conversion
+            cursor = conn.cursor()
+            cursor.row_factory = None
+            cursor.execute(sql, params)
+            columns = [column[0] for column in cursor.description]
+            snippets = [dict(zip(columns, row)) for row in cursor.fetchall()]
+        
+        for snippet in snippets:
+            tags = snippet["tags"]
+            snippet["tags"] = tags.split(",") if tags else []
+        
+        return snippets
+    
     def get_snippet(self, snippet_id: int) -> Optional[Dict[str, Any]]:
         """Get snippet by ID"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            
-            cursor.execute("SELECT * FROM snippets WHERE id = ?", (snippet_id,))
-            row = cursor.fetchone()
-            conn.close()
+            with self.get_conn() as conn:
+                row = conn.execute(_SQL_GET, (snippet_id,)).fetchone()
             
             if row:
                 snippet = dict(row)
@@ -143,10 +454,6 @@ class SnippetManager:
     ) -> List[Dict[str, Any]]:
         """List snippets with optional filters"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            
             query = "SELECT * FROM snippets WHERE 1=1"
             params = []
             
@@ -165,17 +472,7 @@ class SnippetManager:
             query += " ORDER BY created_at DESC LIMIT ?"
             params.append(limit)
             
-            cursor.execute(query, params)
-            rows = cursor.fetchall()
-            conn.close()
-            
-            snippets = []
-            for row in rows:
-                snippet = dict(row)
-                snippet["tags"] = snippet["tags"].split(",") if snippet["tags"] else []
-                snippets.append(snippet)
-            
-            return snippets
+            return self._query_snippets(query, params)
             
         except Exception as e:
             logger.error(f"Error listing snippets: {e}")
@@ -192,9 +489,6 @@ class SnippetManager:
     ) -> bool:
         """Update snippet"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
             updates = []
             params = []
             
@@ -219,15 +513,17 @@ class SnippetManager:
                 params.append(category)
             
             if updates:
-                updates.append("updated_at = ?")
-                params.append(datetime.now().isoformat())
+                # updated_at is maintained by the snippets_touch trigger
                 params.append(snippet_id)
                 
                 query = f"UPDATE snippets SET {', '.join(updates)} WHERE id = ?"
-                cursor.execute(query, params)
-                conn.commit()
+                with self.get_conn() as conn:
+                    conn.execute(query, params)
+                    conn.commit()
+                
+                # Text edits drop the stored vector; the call is a no-op otherwise
+                self._embed_snippets([snippet_id])
             
-            conn.close()
             return True
             
         except Exception as e:
@@ -237,11 +533,9 @@ class SnippetManager:
     def delete_snippet(self, snippet_id: int) -> bool:
         """Delete snippet"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM snippets WHERE id = ?", (snippet_id,))
-            conn.commit()
-            conn.close()
+            with self.get_conn() as conn:
+                conn.execute(_SQL_DELETE, (snippet_id,))
+                conn.commit()
             return True
             
         except Exception as e:
@@ -268,39 +562,28 @@ class SnippetManager:
             List of matching snippets
         """
         try:
-            # Get all snippets (with filters)
-            snippets = self.list_snippets(user_id, language, limit=1000)
-            
-            if not snippets:
-                return []
-            
-            # Simple keyword search first
-            keyword_matches = []
-            for snippet in snippets:
-                score = 0
-                query_lower = query.lower()
-                
-                if query_lower in snippet["title"].lower():
-                    score += 10
-                if query_lower in snippet["description"].lower():
-                    score += 5
-                if query_lower in snippet["code"].lower():
-                    score += 3
-                if snippet["tags"]:
-                    for tag in snippet["tags"]:
-                        if query_lower in tag.lower():
-                            score += 7
-                
-                if score > 0:
-                    snippet["search_score"] = score
-                    keyword_matches.append(snippet)
-            
-            # Sort by score
-            keyword_matches.sort(key=lambda x: x["search_score"], reverse=True)
+            # SQLite work runs in a worker thread so the event loop stays free
+            if self._fts_enabled:
+                keyword_matches = await asyncio.to_thread(
+                    self._fts_search, query, language, user_id, limit
+                )
+            else:
+                keyword_matches = await asyncio.to_thread(
+                    self._keyword_search, query, language, user_id, limit
+                )
             
             # AI semantic search if Gemini available
             if self.gemini and len(keyword_matches) < 5:
-                semantic_matches = await self._semantic_search(query, snippets)
+                semantic_matches = None
+                if self._semantic_index_available():
+                    semantic_matches = await self._vector_search(
+                        query, language, user_id, limit
+                    )
+                if semantic_matches is None:
+                    snippets = await asyncio.to_thread(
+                        self.list_snippets, user_id, language, None, SEMANTIC_CANDIDATES
+                    )
+                    semantic_matches = await self._semantic_search(query, snippets)
                 
                 # Merge results
                 seen_ids = {s["id"] for s in keyword_matches}
@@ -314,6 +597,292 @@ class SnippetManager:
             logger.error(f"Error searching snippets: {e}")
             return []
     
+    @staticmethod
+    def _build_fts_query(query: str) -> Optional[str]:
+        """Turn free text into an FTS5 query matching any term by prefix"""
+        terms = _TERM_RE.findall(query)
+        if not terms:
+            return None
+        return " OR ".join(f'"{term}"*' for term in terms)
+    
+    def _fts_search(
+        self,
+        query: str,
+        language: Optional[str],
+        user_id: Optional[int],
+        limit: int
+    ) -> List[Dict[str, Any]]:
+        """Rank snippets with FTS5 BM25, weighting title > tags > description > code"""
+        match = self._build_fts_query(query)
+        if match is None:
+            return []
+        
+        sql = """
+            SELECT s.*, bm25(snippets_fts, 10.0, 5.0, 3.0, 7.0) AS rank
+            FROM snippets_fts
+            JOIN snippets s ON s.id = snippets_fts.rowid
+            WHERE snippets_fts MATCH ?
+        """
+        params: List[Any] = [match]
+        
+        if user_id is not None:
+            sql += " AND (s.user_id = ? OR s.is_public = 1)"
+            params.append(user_id)
+        
+        if language:
+            sql += " AND s.language = ?"
+            params.append(language)
+        
+        sql += " ORDER BY rank LIMIT ?"
+        params.append(limit)
+        
+        with self.get_conn() as conn:
+            rows = conn.execute(sql, params).fetchall()
+        
+        matches = []
+        for row in rows:
+            snippet = dict(row)
+            # bm25() is lower-is-better; expose a higher-is-better score
+            snippet["search_score"] = -snippet.pop("rank")
+            snippet["tags"] = snippet["tags"].split(",") if snippet["tags"] else []
+            matches.append(snippet)
+        
+        return matches
+    
+    def _keyword_search(
+        self,
+        query: str,
+        language: Optional[str],
+        user_id: Optional[int],
+        limit: int
+    ) -> List[Dict[str, Any]]:
+        """Substring keyword scoring in SQL, used when FTS5 is unavailable"""
+        escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        pattern = f"%{escaped}%"
+        
+        sql = """
+            SELECT *,
+                (CASE WHEN title LIKE :p ESCAPE '\\' THEN 10 ELSE 0 END)
+                + (CASE WHEN description LIKE :p ESCAPE '\\' THEN 5 ELSE 0 END)
+                + (CASE WHEN code LIKE :p ESCAPE '\\' THEN 3 ELSE 0 END)
+                + (CASE WHEN tags LIKE :p ESCAPE '\\' THEN 7 ELSE 0 END) AS search_score
+            FROM snippets
+            WHERE (title LIKE :p ESCAPE '\\' OR description LIKE :p ESCAPE '\\'
+                   OR code LIKE :p ESCAPE '\\' OR tags LIKE :p ESCAPE '\\')
+        """
+        params: Dict[str, Any] = {"p": pattern, "limit": limit}
+        
+        if user_id is not None:
+            sql += " AND (user_id = :user_id OR is_public = 1)"
+            params["user_id"] = user_id
+        
+        if language:
+            sql += " AND language = :language"
+            params["language"] = language
+        
+        sql += " ORDER BY search_score DESC LIMIT :limit"
+        
+        return self._query_snippets(sql, params)
+    
+    def _semantic_index_available(self) -> bool:
+        """Whether embeddings and the ANN index can be used"""
+        return FAISS_AVAILABLE and GEMINI_AVAILABLE and self.gemini is not None
+    
+    def _embed(self, texts: List[str], task_type: str) -> "np.ndarray":
+        """Embed texts with Gemini, returning int8-quantized unit vectors"""
+        vectors = []
+        for start in range(0, len(texts), EMBEDDING_BATCH_SIZE):
+            result = genai.embed_content(
+                model=EMBEDDING_MODEL,
+                content=texts[start:start + EMBEDDING_BATCH_SIZE],
+                task_type=task_type
+            )
+            vectors.extend(result["embedding"])
+        return self._quantize(np.asarray(vectors, dtype=np.float32))
+    
+    @staticmethod
+    def _quantize(vectors: "np.ndarray") -> "np.ndarray":
+        """Normalize float vectors and scale them into int8"""
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        scaled = np.rint(vectors / norms * EMBEDDING_INT8_SCALE)
+        return scaled.astype(np.int8)
+    
+    @staticmethod
+    def _decode_embedding(blob: bytes) -> "np.ndarray":
+        """Read a stored vector, quantizing float32 blobs from older databases"""
+        if len(blob) == EMBEDDING_DIM * 4:
+            vector = np.frombuffer(blob, dtype=np.float32).reshape(1, -1)
+            return SnippetManager._quantize(vector)[0]
+        return np.frombuffer(blob, dtype=np.int8)
+    
+    @staticmethod
+    def _embedding_text(row: sqlite3.Row) -> str:
+        """Text used to embed a snippet"""
+        return "\n".join([
+            row["title"],
+            row["description"] or "",
+            row["tags"] or "",
+            row["code"][:EMBEDDING_CODE_CHARS]
+        ])
+    
+    @staticmethod
+    def _new_semantic_index():
+        """Exact inner-product index over int8 codes, addressable by snippet id
+
+        The 8-bit "direct" scalar quantizer stores each component as one byte
+        and needs no training, so memory is a quarter of float32 vectors.
+        """
+        quantizer = faiss.IndexScalarQuantizer(
+            EMBEDDING_DIM,
+            faiss.ScalarQuantizer.QT_8bit_direct_signed,
+            faiss.METRIC_INNER_PRODUCT
+        )
+        return faiss.IndexIDMap2(quantizer)
+    
+    def _index_missing(self, sql: str, params) -> int:
+        """Embed the snippets selected by sql, store their vectors and index them"""
+        with self.get_conn() as conn:
+            missing = conn.execute(sql, params).fetchall()
+        if not missing:
+            return 0
+        
+        new_ids = np.array([row["id"] for row in missing], dtype=np.int64)
+        new_vectors = self._embed(
+            [self._embedding_text(row) for row in missing],
+            "retrieval_document"
+        )
+        with self.transaction() as conn:
+            conn.executemany(
+                _SQL_SAVE_EMBEDDING,
+                [(int(i), v.tobytes()) for i, v in zip(new_ids, new_vectors)]
+            )
+        
+        with self._index_lock:
+            # An unloaded index picks the vectors up from the table later
+            if self._semantic_index is not None:
+                # Re-embedded snippets replace their previous vector
+                self._semantic_index.remove_ids(new_ids)
+                self._semantic_index.add_with_ids(new_vectors.astype(np.float32), new_ids)
+        
+        return len(missing)
+    
+    def _embed_snippets(self, snippet_ids: List[int]):
+        """Embed just-saved snippets that have no vector yet"""
+        if not self._semantic_index_available():
+            return
+        try:
+            sql = _SQL_MISSING_EMBEDDINGS + f" AND s.id IN ({','.join('?' * len(snippet_ids))})"
+            self._index_missing(sql, snippet_ids)
+        except Exception as e:
+            # The snippet is saved; the next backfill retries its vector
+            logger.warning(f"Error embedding snippets {snippet_ids}: {e}")
+    
+    def _backfill_embeddings(self):
+        """Embed every snippet that has no vector, one batch at a time"""
+        try:
+            while self._index_missing(_SQL_MISSING_EMBEDDINGS_BATCH, (EMBEDDING_BATCH_SIZE,)):
+                pass
+        except Exception as e:
+            logger.warning(f"Embedding backfill stopped: {e}")
+    
+    def start_embedding_backfill(self) -> Optional[threading.Thread]:
+        """Embed snippets lacking vectors in a background thread"""
+        if not self._semantic_index_available():
+            return None
+        with self._index_lock:
+            if self._backfill_thread is None or not self._backfill_thread.is_alive():
+                self._backfill_thread = threading.Thread(
+                    target=self._backfill_embeddings, name="snippet-embeddings", daemon=True
+                )
+                self._backfill_thread.start()
+            return self._backfill_thread
+    
+    def _load_semantic_index(self):
+        """Build the ANN index from stored vectors on first use"""
+        with self._index_lock:
+            if self._semantic_index is not None:
+                return
+            with self.get_conn() as conn:
+                rows = conn.execute(_SQL_ALL_EMBEDDINGS).fetchall()
+            index = self._new_semantic_index()
+            if rows:
+                index.add_with_ids(
+                    np.stack([self._decode_embedding(r["embedding"]) for r in rows])
+                    .astype(np.float32),
+                    np.array([r["snippet_id"] for r in rows], dtype=np.int64)
+                )
+            self._semantic_index = index
+    
+    def _query_semantic_index(self, query: str, k: int) -> List[tuple]:
+        """Return (snippet_id, similarity) pairs nearest to the query"""
+        self._load_semantic_index()
+        query_vector = self._embed([query], "retrieval_query").astype(np.float32)
+        
+        with self._index_lock:
+            index = self._semantic_index
+            k = min(k, index.ntotal)
+            if k == 0:
+                return []
+            scores, labels = index.search(query_vector, k)
+        
+        # Inner product of two scaled unit vectors -> cosine similarity
+        norm = EMBEDDING_INT8_SCALE * EMBEDDING_INT8_SCALE
+        return [
+            (int(label), float(score) / norm)
+            for label, score in zip(labels[0], scores[0])
+            if label != -1
+        ]
+    
+    async def _vector_search(
+        self,
+        query: str,
+        language: Optional[str],
+        user_id: Optional[int],
+        limit: int
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Semantic search over stored snippet embeddings
+
+        Returns None if the embedding service fails, so the caller can fall
+        back to LLM ranking.
+        """
+        try:
+            # Over-fetch so filtering by user/language still fills the page
+            neighbours = await asyncio.to_thread(
+                self._query_semantic_index, query, max(limit * 4, 20)
+            )
+        except Exception as e:
+            logger.error(f"Error in vector search: {e}")
+            return None
+        
+        if not neighbours:
+            return []
+        
+        ids = [snippet_id for snippet_id, _ in neighbours]
+        sql = f"SELECT * FROM snippets WHERE id IN ({','.join('?' * len(ids))})"
+        params: List[Any] = list(ids)
+        
+        if user_id is not None:
+            sql += " AND (user_id = ? OR is_public = 1)"
+            params.append(user_id)
+        
+        if language:
+            sql += " AND language = ?"
+            params.append(language)
+        
+        rows = await asyncio.to_thread(self._query_snippets, sql, params)
+        by_id = {snippet["id"]: snippet for snippet in rows}
+        
+        matches = []
+        for snippet_id, similarity in neighbours:
+            snippet = by_id.get(snippet_id)
+            if snippet is None:
+                continue
+            snippet["search_score"] = similarity
+            matches.append(snippet)
+        
+        return matches[:limit]
+    
     async def _semantic_search(
         self, query: str, snippets: List[Dict[str, Any]]
     ) -> List[Dict[str, Any]]:
@@ -338,14 +907,13 @@ Example: 2,5,8,12,15"""
             response = await self.gemini.generate_content(prompt)
             
             # Parse response
-            import re
-            numbers = re.findall(r'\d+', response)
+            numbers = _DIGIT_RE.findall(response)
             indices = [int(n) for n in numbers if int(n) < len(snippets)]
             
             matches = []
-            for idx in indices[:5]:
+            for rank, idx in enumerate(indices[:5]):
                 snippet = snippets[idx].copy()
-                snippet["search_score"] = 10 - indices.index(idx)
+                snippet["search_score"] = 10 - rank
                 matches.append(snippet)
             
             return matches
@@ -357,41 +925,27 @@ Example: 2,5,8,12,15"""
     def increment_usage(self, snippet_id: int):
         """Increment usage count for snippet"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute(
-                "UPDATE snippets SET usage_count = usage_count + 1 WHERE id = ?",
-                (snippet_id,)
-            )
-            conn.commit()
-            conn.close()
+            with self.get_conn() as conn:
+                conn.execute(_SQL_INCREMENT_USAGE, (snippet_id,))
+                conn.commit()
+        except Exception as e:
+            logger.error(f"Error incrementing usage: {e}")
+    
+    def batch_increment_usage(self, snippet_ids: List[int]):
+        """Increment usage counts for many snippets in one transaction"""
+        try:
+            with self.transaction() as conn:
+                conn.executemany(
+                    _SQL_INCREMENT_USAGE,
+                    [(snippet_id,) for snippet_id in snippet_ids]
+                )
         except Exception as e:
             logger.error(f"Error incrementing usage: {e}")
     
     def get_popular_snippets(self, limit: int = 10) -> List[Dict[str, Any]]:
         """Get most used snippets"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                SELECT * FROM snippets 
-                WHERE is_public = 1 
-                ORDER BY usage_count DESC 
-                LIMIT ?
-            """, (limit,))
-            
-            rows = cursor.fetchall()
-            conn.close()
-            
-            snippets = []
-            for row in rows:
-                snippet = dict(row)
-                snippet["tags"] = snippet["tags"].split(",") if snippet["tags"] else []
-                snippets.append(snippet)
-            
-            return snippets
+            return self._query_snippets(_SQL_POPULAR, (limit,))
             
         except Exception as e:
             logger.error(f"Error getting popular snippets: {e}")
@@ -400,19 +954,8 @@ Example: 2,5,8,12,15"""
     def get_stats(self) -> Dict[str, Any]:
         """Get snippet statistics"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute("SELECT COUNT(*) FROM snippets")
-            total = cursor.fetchone()[0]
-            
-            cursor.execute("SELECT COUNT(DISTINCT language) FROM snippets")
-            languages = cursor.fetchone()[0]
-            
-            cursor.execute("SELECT COUNT(DISTINCT category) FROM snippets")
-            categories = cursor.fetchone()[0]
-            
-            conn.close()
+            with self.get_conn() as conn:
+                total, languages, categories = conn.execute(_SQL_STATS).fetchone()
             
             return {
                 "total_snippets": total,
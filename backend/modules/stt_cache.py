@@ -0,0 +1,74 @@
+"""
+Speech-to-Text Cache for Friday Agent
+Remembers transcripts of repeated utterances, keyed by an audio fingerprint
+"""
+import logging
+import os
+import tempfile
+from typing import Optional
+
+import numpy as np
+
+from modules.cache_manager import CacheManager
+from modules.stt_engine import SAMPLE_RATE, log_mel_spectrogram, pcm16_to_float32
+
+logger = logging.getLogger(__name__)
+
+try:
+    import diskcache
+    DISKCACHE_AVAILABLE = True
+except ImportError:
+    DISKCACHE_AVAILABLE = False
+
+CACHE_DIR = os.getenv('STT_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'friday_stt'))
+CACHE_TTL = int(os.getenv('STT_CACHE_TTL', '86400'))
+CACHE_SIZE = int(os.getenv('STT_CACHE_SIZE', str(256 << 20)))
+
+# The spectrogram is averaged into a (time x mel) grid; comparing each time
+# cell with the next gives an 8 x 8 = 64-bit difference hash
+_GRID_TIME = 9
+_GRID_MELS = 8
+# Cells more than ~30 dB below the loudest are treated as silence, and
+# steps under ~2 dB as flat, so background noise doesn't flip bits
+_DYNAMIC_RANGE = 6.9
+_MIN_STEP = 0.5
+# Utterance length is bucketed so only similar-length audio can match
+_DURATION_BUCKET = SAMPLE_RATE // 4
+
+
+def fingerprint(pcm: bytes) -> str:
+    """Perceptual hash of 16 kHz PCM that tolerates small level and noise changes"""
+    samples = pcm16_to_float32(pcm)
+    spectrogram = log_mel_spectrogram(samples)
+    if spectrogram.shape[0] < _GRID_TIME:
+        spectrogram = np.pad(spectrogram, ((0, _GRID_TIME - spectrogram.shape[0]), (0, 0)), mode="edge")
+
+    grid = np.array([
+        [cell.mean() for cell in np.array_split(rows, _GRID_MELS, axis=1)]
+        for rows in np.array_split(spectrogram, _GRID_TIME, axis=0)
+    ])
+    grid = np.maximum(grid, grid.max() - _DYNAMIC_RANGE)
+    bits = np.packbits(grid[1:] - grid[:-1] > _MIN_STEP)
+    return f"{bits.tobytes().hex()}:{samples.size // _DURATION_BUCKET}"
+
+
+class TranscriptCache:
+    """Transcripts by audio fingerprint, on disk when diskcache is installed"""
+
+    def __init__(self, directory: str = CACHE_DIR, size_limit: int = CACHE_SIZE, ttl: int = CACHE_TTL):
+        self.ttl = ttl
+        if DISKCACHE_AVAILABLE:
+            self._store = diskcache.Cache(directory, size_limit=size_limit)
+        else:
+            self._store = CacheManager()
+
+    def get(self, key: str) -> Optional[str]:
+        """Cached transcript for a fingerprint, if any"""
+        return self._store.get(key)
+
+    def set(self, key: str, text: str):
+        """Remember a transcript for a fingerprint"""
+        if DISKCACHE_AVAILABLE:
+            self._store.set(key, text, expire=self.ttl)
+        else:
+            self._store.set(key, text, ttl=self.ttl)
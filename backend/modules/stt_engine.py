@@ -0,0 +1,236 @@
+"""
+Speech-to-Text Engine for Friday Agent
+Runs an on-device ONNX speech model so recognition works offline
+"""
+import json
+import logging
+import os
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+try:
+    import onnxruntime as ort
+    ONNX_AVAILABLE = True
+except ImportError:
+    ONNX_AVAILABLE = False
+    logger.warning("onnxruntime not available - on-device speech recognition disabled")
+
+# The model expects 16 kHz mono 16-bit PCM
+SAMPLE_RATE = 16000
+SAMPLE_WIDTH = 2
+
+STT_MODEL_PATH = os.getenv('STT_MODEL_PATH', 'models/stt.onnx')
+STT_VOCAB_PATH = os.getenv('STT_VOCAB_PATH', 'models/stt_vocab.json')
+
+# Preferred execution providers, best first
+PROVIDERS = ["CUDAExecutionProvider", "CPUExecutionProvider"]
+
+BLANK_TOKEN = "<pad>"
+WORD_DELIMITER = "|"
+
+# Spectral features: 25 ms windows every 10 ms
+N_FFT = 400
+HOP_LENGTH = 160
+N_MELS = 40
+N_MFCC = 13
+
+# Wake word detection scores a sliding 1 s window every 250 ms
+WAKEWORD_MODEL_PATH = os.getenv('WAKEWORD_MODEL_PATH', 'models/friday_wakeword.onnx')
+WAKEWORD_THRESHOLD = 0.9
+WAKEWORD_WINDOW = SAMPLE_RATE
+WAKEWORD_HOP = SAMPLE_RATE // 4
+
+
+def pcm16_to_float32(pcm: bytes) -> np.ndarray:
+    """Convert 16-bit PCM bytes to float32 samples in [-1, 1)"""
+    return np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32768.0
+
+
+@lru_cache(maxsize=None)
+def _mel_filterbank(n_mels: int) -> np.ndarray:
+    """Triangular mel filters over the FFT bins"""
+    def hz_to_mel(hz):
+        return 2595.0 * np.log10(1.0 + hz / 700.0)
+
+    def mel_to_hz(mel):
+        return 700.0 * (10.0 ** (mel / 2595.0) - 1.0)
+
+    mel_points = np.linspace(hz_to_mel(0.0), hz_to_mel(SAMPLE_RATE / 2), n_mels + 2)
+    bins = np.floor((N_FFT + 1) * mel_to_hz(mel_points) / SAMPLE_RATE).astype(int)
+
+    filters = np.zeros((n_mels, N_FFT // 2 + 1), dtype=np.float32)
+    for i in range(n_mels):
+        left, center, right = bins[i], bins[i + 1], bins[i + 2]
+        if center > left:
+            filters[i, left:center] = (np.arange(left, center) - left) / (center - left)
+        if right > center:
+            filters[i, center:right] = (right - np.arange(center, right)) / (right - center)
+    return filters
+
+
+@lru_cache(maxsize=None)
+def _dct_matrix(n_mfcc: int, n_mels: int) -> np.ndarray:
+    """Orthonormal DCT-II basis"""
+    n = np.arange(n_mels)
+    basis = np.cos(np.pi / n_mels * (n + 0.5) * np.arange(n_mfcc)[:, np.newaxis])
+    basis *= np.sqrt(2.0 / n_mels)
+    basis[0] /= np.sqrt(2.0)
+    return basis.astype(np.float32)
+
+
+def log_mel_spectrogram(samples: np.ndarray, n_mels: int = N_MELS) -> np.ndarray:
+    """Log mel energies, shaped (frames, n_mels)"""
+    if samples.size < N_FFT:
+        samples = np.pad(samples, (0, N_FFT - samples.size))
+    frames = np.lib.stride_tricks.sliding_window_view(samples, N_FFT)[::HOP_LENGTH]
+    power = np.abs(np.fft.rfft(frames * np.hanning(N_FFT).astype(np.float32))) ** 2
+    return np.log(power @ _mel_filterbank(n_mels).T + 1e-10).astype(np.float32)
+
+
+def mfcc(samples: np.ndarray, n_mfcc: int = N_MFCC) -> np.ndarray:
+    """Mel-frequency cepstral coefficients, shaped (frames, n_mfcc)"""
+    return log_mel_spectrogram(samples) @ _dct_matrix(n_mfcc, N_MELS).T
+
+
+def ctc_greedy_decode(ids: Sequence[int], vocab: List[str], blank_id: int) -> str:
+    """Collapse repeated CTC labels, drop blanks and join the tokens"""
+    tokens = []
+    previous = None
+    for token_id in ids:
+        if token_id != previous and token_id != blank_id:
+            tokens.append(vocab[token_id])
+        previous = token_id
+    return " ".join("".join(tokens).replace(WORD_DELIMITER, " ").split()).lower()
+
+
+def quantized_path(model_path: str) -> str:
+    """Where the INT8 copy of a model is stored"""
+    root, ext = os.path.splitext(model_path)
+    return f"{root}.int8{ext}"
+
+
+def quantize_model(model_path: str, output_path: Optional[str] = None) -> str:
+    """Write a copy of a model with dynamically quantized INT8 MatMul/Gemm weights"""
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    output_path = output_path or quantized_path(model_path)
+    quantize_dynamic(
+        model_path,
+        output_path,
+        weight_type=QuantType.QInt8,
+        op_types_to_quantize=["MatMul", "Gemm"]
+    )
+    logger.info("Quantized %s to %s", model_path, output_path)
+    return output_path
+
+
+# Sessions are shared by every recognizer; InferenceSession.run is thread-safe
+@lru_cache(maxsize=None)
+def _create_session(model_path: str) -> "ort.InferenceSession":
+    """Load a model once per process, preferring its INT8 copy when one has been made"""
+    options = ort.SessionOptions()
+    int8_path = quantized_path(model_path)
+    if os.path.exists(int8_path):
+        # Quantized kernels run on the CPU provider; keep its workers spinning between ops
+        options.add_session_config_entry("session.intra_op.allow_spinning", "1")
+        return ort.InferenceSession(int8_path, sess_options=options, providers=["CPUExecutionProvider"])
+
+    available = set(ort.get_available_providers())
+    return ort.InferenceSession(
+        model_path,
+        sess_options=options,
+        providers=[p for p in PROVIDERS if p in available]
+    )
+
+
+@lru_cache(maxsize=None)
+def _load_vocab(path: str) -> List[str]:
+    """Load a token -> id vocabulary (as exported with CTC models) as an id-indexed list"""
+    with open(path, encoding="utf-8") as f:
+        token_ids: Dict[str, int] = json.load(f)
+    vocab = [""] * (max(token_ids.values()) + 1)
+    for token, token_id in token_ids.items():
+        vocab[token_id] = token
+    return vocab
+
+
+@lru_cache(maxsize=None)
+def _create_wakeword_session(model_path: str) -> "ort.InferenceSession":
+    """Load the keyword model once per process"""
+    return ort.InferenceSession(model_path, providers=["CPUExecutionProvider"])
+
+
+class OnnxTranscriber:
+    """Transcribes audio with a CTC speech model through ONNX Runtime"""
+
+    def __init__(self, model_path: str = STT_MODEL_PATH, vocab_path: str = STT_VOCAB_PATH):
+        if not ONNX_AVAILABLE:
+            raise RuntimeError("onnxruntime is not installed")
+
+        self.session = _create_session(model_path)
+        self.input_name = self.session.get_inputs()[0].name
+        self.vocab = _load_vocab(vocab_path)
+        self.blank_id = self.vocab.index(BLANK_TOKEN) if BLANK_TOKEN in self.vocab else 0
+        logger.info("Loaded speech model %s", model_path)
+
+    def transcribe(self, pcm: bytes) -> str:
+        """Transcribe 16 kHz mono 16-bit PCM"""
+        samples = pcm16_to_float32(pcm)
+        if samples.size == 0:
+            return ""
+
+        # CTC models are trained on zero-mean, unit-variance waveforms
+        samples = (samples - samples.mean()) / (samples.std() + 1e-7)
+        logits = self.session.run(None, {self.input_name: samples[np.newaxis, :]})[0]
+        return ctc_greedy_decode(logits[0].argmax(axis=-1).tolist(), self.vocab, self.blank_id)
+
+
+class WakeWordDetector:
+    """Listens for the wake word with a small ONNX keyword model on MFCC windows"""
+
+    def __init__(self, model_path: str = WAKEWORD_MODEL_PATH, threshold: float = WAKEWORD_THRESHOLD):
+        if not ONNX_AVAILABLE:
+            raise RuntimeError("onnxruntime is not installed")
+
+        self.session = _create_wakeword_session(model_path)
+        self.input_name = self.session.get_inputs()[0].name
+        self.threshold = threshold
+        self.reset()
+
+    def reset(self):
+        """Forget buffered audio"""
+        self._window = np.zeros(WAKEWORD_WINDOW, dtype=np.float32)
+        self._since_scored = 0
+
+    def score(self, samples: np.ndarray) -> float:
+        """Probability that the window contains the wake word"""
+        features = mfcc(samples)[np.newaxis, :, :]
+        logit = float(self.session.run(None, {self.input_name: features})[0].ravel()[0])
+        return float(1.0 / (1.0 + np.exp(-logit)))
+
+    def process(self, pcm: bytes) -> bool:
+        """Feed 16 kHz PCM; returns True when the wake word is heard"""
+        samples = pcm16_to_float32(pcm)
+        self._window = np.concatenate((self._window, samples))[-WAKEWORD_WINDOW:]
+        self._since_scored += samples.size
+        if self._since_scored < WAKEWORD_HOP:
+            return False
+
+        self._since_scored = 0
+        if self.score(self._window) > self.threshold:
+            self.reset()
+            return True
+        return False
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) not in (2, 3):
+        print("Usage: python -m modules.stt_engine MODEL.onnx [OUTPUT.onnx]")
+        sys.exit(1)
+    print(quantize_model(*sys.argv[1:]))
@@ -3,13 +3,39 @@ System Monitor Module
 Provides comprehensive system information and monitoring
 """
 
+import heapq
 import psutil
 import platform
 import os
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Dict, List
 import subprocess
 
+# Minimum window (seconds) between CPU usage samples
+CPU_SAMPLE_INTERVAL = 0.1
+
+# Multiplier converting bytes to gigabytes
+_INV_GB = 1 / 1073741824
+
+# Readable names for interface address families
+_FAMILY_NAMES = {int(family): family.name for family in socket.AddressFamily}
+
+# How long (seconds) the mounted partition list is reused
+PARTITION_CACHE_TTL = 30.0
+
+# Number of busiest processes reported per snapshot
+TOP_PROCESS_COUNT = 10
+
+# Threads used to run the sub-collectors of a full snapshot in parallel
+COLLECTOR_WORKERS = 8
+
+# How long (seconds) a full snapshot is reused for concurrent pollers
+SNAPSHOT_TTL = 0.5
+
 
 class SystemMonitor:
     """Monitor system resources and information"""
@@ -17,10 +43,52 @@ class SystemMonitor:
     def __init__(self):
         self.start_time = datetime.now()
 
+        # Host details do not change while the process runs
+        self._boot_time = datetime.fromtimestamp(psutil.boot_time())
+        self._static_sys = {
+            "os": platform.system(),
+            "os_version": platform.release(),
+            "os_architecture": platform.machine(),
+            "hostname": platform.node(),
+            "python_version": platform.python_version(),
+            "boot_time": self._boot_time.strftime("%Y-%m-%d %H:%M:%S")
+        }
+
+        # Prime psutil's CPU counters so later non-blocking reads have a baseline
+        psutil.cpu_percent(interval=None, percpu=True)
+        psutil.cpu_percent(interval=None)
+        self._cpu_sampled_at = time.monotonic()
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=COLLECTOR_WORKERS, thread_name_prefix="system-monitor"
+        )
+
+        self._uptime_seconds = None
+        self._uptime_formatted = ""
+
+        self._partitions = None
+        self._partitions_at = 0.0
+
+        self._snapshot = None
+        self._snapshot_at = 0.0
+        self._snapshot_lock = threading.Lock()
+
+    def _sample_cpu_percent(self):
+        """Read total and per-core CPU usage since the previous sample"""
+        elapsed = time.monotonic() - self._cpu_sampled_at
+        if elapsed < CPU_SAMPLE_INTERVAL:
+            # Too short a window gives noisy readings; wait out the remainder once
+            time.sleep(CPU_SAMPLE_INTERVAL - elapsed)
+
+        per_core = psutil.cpu_percent(interval=None, percpu=True)
+        total = psutil.cpu_percent(interval=None)
+        self._cpu_sampled_at = time.monotonic()
+        return total, per_core
+
     def get_cpu_info(self) -> Dict:
         """Get CPU information and usage"""
         cpu_freq = psutil.cpu_freq()
-        cpu_percent_per_core = psutil.cpu_percent(interval=0.1, percpu=True)
+        cpu_percent, cpu_percent_per_core = self._sample_cpu_percent()
 
         return {
             "physical_cores": psutil.cpu_count(logical=False),
@@ -28,7 +96,7 @@ class SystemMonitor:
             "max_frequency": round(cpu_freq.max, 2) if cpu_freq else 0,
             "min_frequency": round(cpu_freq.min, 2) if cpu_freq else 0,
             "current_frequency": round(cpu_freq.current, 2) if cpu_freq else 0,
-            "usage_percent": round(psutil.cpu_percent(interval=0.1), 2),
+            "usage_percent": round(cpu_percent, 2),
             "per_core_usage": [round(x, 2) for x in cpu_percent_per_core],
             "load_average": [round(x, 2) for x in psutil.getloadavg()] if hasattr(psutil, 'getloadavg') else []
         }
@@ -39,12 +107,12 @@ class SystemMonitor:
         swap_mem = psutil.swap_memory()
 
         return {
-            "total": self._bytes_to_gb(virtual_mem.total),
-            "available": self._bytes_to_gb(virtual_mem.available),
-            "used": self._bytes_to_gb(virtual_mem.used),
+            "total": round(virtual_mem.total * _INV_GB, 2),
+            "available": round(virtual_mem.available * _INV_GB, 2),
+            "used": round(virtual_mem.used * _INV_GB, 2),
             "percent": round(virtual_mem.percent, 2),
-            "swap_total": self._bytes_to_gb(swap_mem.total),
-            "swap_used": self._bytes_to_gb(swap_mem.used),
+            "swap_total": round(swap_mem.total * _INV_GB, 2),
+            "swap_used": round(swap_mem.used * _INV_GB, 2),
             "swap_percent": round(swap_mem.percent, 2)
         }
 
@@ -52,19 +120,24 @@ class SystemMonitor:
         """Get disk information for all partitions"""
         disks = []
 
-        for partition in psutil.disk_partitions():
+        # Mounts rarely change; only usage needs reading on every poll
+        if self._partitions is None or time.monotonic() - self._partitions_at >= PARTITION_CACHE_TTL:
+            self._partitions = psutil.disk_partitions()
+            self._partitions_at = time.monotonic()
+
+        for partition in self._partitions:
             try:
                 usage = psutil.disk_usage(partition.mountpoint)
                 disks.append({
                     "device": partition.device,
                     "mountpoint": partition.mountpoint,
                     "filesystem": partition.fstype,
-                    "total": self._bytes_to_gb(usage.total),
-                    "used": self._bytes_to_gb(usage.used),
-                    "free": self._bytes_to_gb(usage.free),
+                    "total": round(usage.total * _INV_GB, 2),
+                    "used": round(usage.used * _INV_GB, 2),
+                    "free": round(usage.free * _INV_GB, 2),
                     "percent": round(usage.percent, 2)
                 })
-            except PermissionError:
+            except (PermissionError, FileNotFoundError):
                 continue
 
         return disks
@@ -79,15 +152,15 @@ class SystemMonitor:
             interface_info = {"name": interface_name, "addresses": []}
             for addr in addresses:
                 interface_info["addresses"].append({
-                    "family": str(addr.family),
+                    "family": _FAMILY_NAMES.get(int(addr.family), str(addr.family)),
                     "address": addr.address,
                     "netmask": addr.netmask if addr.netmask else "N/A"
                 })
             interfaces.append(interface_info)
 
         return {
-            "bytes_sent": self._bytes_to_gb(net_io.bytes_sent),
-            "bytes_received": self._bytes_to_gb(net_io.bytes_recv),
+            "bytes_sent": round(net_io.bytes_sent * _INV_GB, 2),
+            "bytes_received": round(net_io.bytes_recv * _INV_GB, 2),
             "packets_sent": net_io.packets_sent,
             "packets_received": net_io.packets_recv,
             "errors_in": net_io.errin,
@@ -97,41 +170,49 @@ class SystemMonitor:
 
     def get_process_info(self) -> Dict:
         """Get information about running processes"""
-        process_list = []
+        total_processes = 0
+
+        def counted(processes):
+            nonlocal total_processes
+            for proc in processes:
+                total_processes += 1
+                yield proc
+
+        # Keep only the busiest processes in a small heap instead of sorting all
+        busiest = heapq.nlargest(
+            TOP_PROCESS_COUNT,
+            counted(psutil.process_iter(['pid', 'name', 'cpu_percent'])),
+            key=lambda proc: proc.info['cpu_percent'] or 0
+        )
 
-        for proc in psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_percent']):
+        top_processes = []
+        for proc in busiest:
+            # Memory is only read for the processes actually reported
             try:
-                process_list.append({
-                    "pid": proc.info['pid'],
-                    "name": proc.info['name'],
-                    "cpu_percent": round(proc.info['cpu_percent'], 2),
-                    "memory_percent": round(proc.info['memory_percent'], 2)
-                })
+                memory_percent = proc.memory_percent()
             except (psutil.NoSuchProcess, psutil.AccessDenied):
-                continue
+                memory_percent = 0
 
-        # Sort by CPU usage and get top 10
-        top_processes = sorted(process_list, key=lambda x: x['cpu_percent'], reverse=True)[:10]
+            top_processes.append({
+                "pid": proc.info['pid'],
+                "name": proc.info['name'],
+                "cpu_percent": round(proc.info['cpu_percent'] or 0, 2),
+                "memory_percent": round(memory_percent, 2)
+            })
 
         return {
-            "total_processes": len(process_list),
+            "total_processes": total_processes,
             "top_processes": top_processes
         }
 
     def get_system_info(self) -> Dict:
         """Get general system information"""
-        boot_time = datetime.fromtimestamp(psutil.boot_time())
-        uptime = datetime.now() - boot_time
+        uptime_seconds = int((datetime.now() - self._boot_time).total_seconds())
 
         return {
-            "os": platform.system(),
-            "os_version": platform.release(),
-            "os_architecture": platform.machine(),
-            "hostname": platform.node(),
-            "python_version": platform.python_version(),
-            "boot_time": boot_time.strftime("%Y-%m-%d %H:%M:%S"),
-            "uptime_seconds": int(uptime.total_seconds()),
-            "uptime_formatted": self._format_uptime(uptime)
+            **self._static_sys,
+            "uptime_seconds": uptime_seconds,
+            "uptime_formatted": self._format_uptime(uptime_seconds)
         }
 
     def get_temperature_info(self) -> Dict:
@@ -172,29 +253,52 @@ class SystemMonitor:
         return None
 
     def get_complete_system_stats(self) -> Dict:
-        """Get complete system statistics"""
-        return {
-            "timestamp": datetime.now().isoformat(),
-            "system": self.get_system_info(),
-            "cpu": self.get_cpu_info(),
-            "memory": self.get_memory_info(),
-            "disks": self.get_disk_info(),
-            "network": self.get_network_info(),
-            "processes": self.get_process_info(),
-            "temperature": self.get_temperature_info(),
-            "battery": self.get_battery_info()
+        """Get complete system statistics, reusing a snapshot younger than SNAPSHOT_TTL"""
+        if self._snapshot is not None and time.monotonic() - self._snapshot_at < SNAPSHOT_TTL:
+            return self._snapshot
+
+        # Only one caller refreshes; the rest wait and reuse its snapshot
+        with self._snapshot_lock:
+            if self._snapshot is None or time.monotonic() - self._snapshot_at >= SNAPSHOT_TTL:
+                self._snapshot = self._collect_system_stats()
+                self._snapshot_at = time.monotonic()
+            return self._snapshot
+
+    def _collect_system_stats(self) -> Dict:
+        """Run every collector and assemble a snapshot"""
+        collectors = {
+            "system": self.get_system_info,
+            "cpu": self.get_cpu_info,
+            "memory": self.get_memory_info,
+            "disks": self.get_disk_info,
+            "network": self.get_network_info,
+            "processes": self.get_process_info,
+            "temperature": self.get_temperature_info,
+            "battery": self.get_battery_info
         }
 
-    @staticmethod
-    def _bytes_to_gb(bytes_value: int) -> float:
-        """Convert bytes to gigabytes"""
-        return round(bytes_value / (1024 ** 3), 2)
+        # Collectors are independent and mostly wait on /proc and sysfs reads
+        futures = {
+            key: self._executor.submit(collector)
+            for key, collector in collectors.items()
+        }
+
+        stats = {"timestamp": datetime.now().isoformat()}
+        for key, future in futures.items():
+            stats[key] = future.result()
+        return stats
+
+    def close(self):
+        """Shut down the collector thread pool"""
+        self._executor.shutdown(wait=False)
+
+    def _format_uptime(self, uptime_seconds: int) -> str:
+        """Format uptime as human-readable string, reusing the last result for the same second"""
+        if uptime_seconds == self._uptime_seconds:
+            return self._uptime_formatted
 
-    @staticmethod
-    def _format_uptime(uptime) -> str:
-        """Format uptime as human-readable string"""
-        days = uptime.days
-        hours, remainder = divmod(uptime.seconds, 3600)
+        days, remainder = divmod(uptime_seconds, 86400)
+        hours, remainder = divmod(remainder, 3600)
         minutes, seconds = divmod(remainder, 60)
 
         parts = []
@@ -207,4 +311,6 @@ class SystemMonitor:
         if seconds > 0 or not parts:
             parts.append(f"{seconds}s")
 
-        return " ".join(parts)
+        self._uptime_seconds = uptime_seconds
+        self._uptime_formatted = " ".join(parts)
+        return self._uptime_formatted
@@ -3,20 +3,122 @@ AI-powered task management with natural language parsing
 """
 import sqlite3
 import json
+import threading
+import time
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Any
+from functools import lru_cache
+from typing import Iterator, List, Dict, Optional, Tuple, Any
 import uuid
 import re
 
+# Columns update_task may change, in statement order
+_UPDATABLE_FIELDS = ('title', 'description', 'priority', 'status', 'due_date', 'category')
+
+# Natural language parsing tables, compiled once
+_HIGH_PRIORITY_WORDS = ('urgent', 'asap', 'critical', 'important')
+_LOW_PRIORITY_WORDS = ('low priority', 'whenever', 'someday')
+
+# Due date keywords and their offset in days, most specific first
+_DUE_KEYWORDS = (('today', 0), ('tomorrow', 1), ('next week', 7), ('next month', 30))
+
+_CATEGORY_KEYWORDS = {
+    'work': ('work', 'meeting', 'project', 'deadline'),
+    'personal': ('personal', 'buy', 'call', 'email'),
+    'coding': ('code', 'bug', 'feature', 'deploy', 'fix'),
+    'learning': ('learn', 'study', 'read', 'course')
+}
+
+# keyword -> (field, rank, value); the lowest rank found wins for each field
+_KEYWORD_ACTIONS = {}
+for _word in _HIGH_PRIORITY_WORDS:
+    _KEYWORD_ACTIONS[_word] = ('priority', 0, 'high')
+for _word in _LOW_PRIORITY_WORDS:
+    _KEYWORD_ACTIONS[_word] = ('priority', 1, 'low')
+for _rank, (_word, _days) in enumerate(_DUE_KEYWORDS):
+    _KEYWORD_ACTIONS[_word] = ('due', _rank, _days)
+for _rank, (_category, _words) in enumerate(_CATEGORY_KEYWORDS.items()):
+    for _word in _words:
+        _KEYWORD_ACTIONS.setdefault(_word, ('category', _rank, _category))
+
+# All keywords in one alternation so the text is scanned once; words inside
+# a phrase may be separated by any run of whitespace
+_KEYWORD_RE = re.compile(
+    r'\b(' + '|'.join(
+        r'\s+'.join(map(re.escape, keyword.split()))
+        for keyword in sorted(_KEYWORD_ACTIONS, key=len, reverse=True)
+    ) + r')\b',
+    re.IGNORECASE
+)
+
+# Simple date phrases (e.g., "on Friday", "by Monday", "before Dec 25")
+_DATE_RE = re.compile(r'(on|by|before)\s+(\w+\s+\d{1,2}|\w+)', re.IGNORECASE)
+
+# Date/priority keywords stripped from the title
+_CLEAN_RE = re.compile(r'\b(urgent|asap|today|tomorrow|next\s+week|next\s+month)\b', re.IGNORECASE)
+
+
+
+@lru_cache(maxsize=512)
+def _parse_task_text(text: str) -> Tuple[str, str, Optional[int], str]:
+    """Extract (title, priority, due date offset in days, category) from task text"""
+    # Find priority, due date and category keywords in a single pass
+    found = {}
+    for match in _KEYWORD_RE.finditer(text):
+        keyword = ' '.join(match.group(1).lower().split())
+        field, rank, value = _KEYWORD_ACTIONS[keyword]
+        if field not in found or rank < found[field][0]:
+            found[field] = (rank, value)
+    
+    # Extract priority
+    priority = found['priority'][1] if 'priority' in found else 'medium'
+    
+    # Extract due date keywords
+    due_in_days = found['due'][1] if 'due' in found else None
+    
+    # Extract date patterns (e.g., "on Friday", "by Monday", "Dec 25")
+    if due_in_days is None and _DATE_RE.search(text):
+        # For now, default to 7 days from now if we can't parse precisely
+        due_in_days = 7
+    
+    # Extract category
+    category = found['category'][1] if 'category' in found else 'general'
+    
+    # Clean up title (remove date/priority keywords)
+    title = ' '.join(_CLEAN_RE.sub('', text).split())
+    
+    return title, priority, due_in_days, category
+
+
 class TaskManager:
     def __init__(self, db_path: str = 'tasks.db'):
         self.db_path = db_path
+        self._local = threading.local()
+        self._update_sql_cache: Dict[tuple, str] = {}
         self._init_database()
     
+    def _conn(self) -> sqlite3.Connection:
+        """Get this thread's connection, opening it on first use"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            conn.execute("PRAGMA temp_store = MEMORY")
+            conn.execute("PRAGMA foreign_keys = ON")
+            self._local.conn = conn
+        return conn
+    
+    def close(self):
+        """Close this thread's connection"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+    
     def _init_database(self):
         """Initialize tasks database"""
-        conn = sqlite3.connect(self.db_path)
-        conn.execute("PRAGMA foreign_keys = ON")
+        conn = self._conn()
         
         conn.execute("""
             CREATE TABLE IF NOT EXISTS tasks (
@@ -29,101 +131,107 @@ class TaskManager:
                 category TEXT,
                 created_at TEXT NOT NULL,
                 updated_at TEXT NOT NULL,
-                completed_at TEXT
+                completed_at TEXT,
+                due_ts INTEGER
             )
         """)
         
-        conn.commit()
-        conn.close()
+        # Migrate databases created before due_ts (due date as a unix timestamp).
+        # The column and its backfill commit together, and any rows a previous
+        # run left without a timestamp are filled in on the next start
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(tasks)")}
+            if 'due_ts' not in columns:
+                conn.execute("ALTER TABLE tasks ADD COLUMN due_ts INTEGER")
+            rows = conn.execute(
+                "SELECT id, due_date FROM tasks WHERE due_ts IS NULL AND due_date IS NOT NULL"
+            ).fetchall()
+            conn.executemany(
+                "UPDATE tasks SET due_ts = ? WHERE id = ?",
+                [(self._due_timestamp(due_date), task_id) for task_id, due_date in rows]
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks(status)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_category ON tasks(category)")
+        conn.execute("DROP INDEX IF EXISTS idx_tasks_due_status")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_due_ts_status ON tasks(due_ts, status)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_created ON tasks(created_at DESC)")
+    
+    @staticmethod
+    def _due_timestamp(due_date: Optional[str]) -> Optional[int]:
+        """Convert an ISO due date to a unix timestamp (None if missing or unparseable)"""
+        if not due_date:
+            return None
+        try:
+            return int(datetime.fromisoformat(due_date).timestamp())
+        except (TypeError, ValueError):
+            return None
     
     def parse_natural_language(self, text: str, gemini_processor=None) -> Dict[str, Any]:
         """Parse natural language task input"""
-        task_data = {
-            'title': text,
-            'description': '',
-            'priority': 'medium',
-            'due_date': None,
-            'category': 'general'
-        }
-        
-        # Extract priority
-        if any(word in text.lower() for word in ['urgent', 'asap', 'critical', 'important']):
-            task_data['priority'] = 'high'
-        elif any(word in text.lower() for word in ['low priority', 'whenever', 'someday']):
-            task_data['priority'] = 'low'
-        
-        # Extract due date keywords
-        today = datetime.now()
-        if 'today' in text.lower():
-            task_data['due_date'] = today.isoformat()
-        elif 'tomorrow' in text.lower():
-            task_data['due_date'] = (today + timedelta(days=1)).isoformat()
-        elif 'next week' in text.lower():
-            task_data['due_date'] = (today + timedelta(days=7)).isoformat()
-        elif 'next month' in text.lower():
-            task_data['due_date'] = (today + timedelta(days=30)).isoformat()
-        
-        # Extract date patterns (e.g., "on Friday", "by Monday", "Dec 25")
-        # Simple regex for dates
-        date_pattern = r'(on|by|before)\s+(\w+\s+\d{1,2}|\w+)'
-        date_match = re.search(date_pattern, text, re.IGNORECASE)
-        if date_match and not task_data['due_date']:
-            # For now, default to 7 days from now if we can't parse precisely
-            task_data['due_date'] = (today + timedelta(days=7)).isoformat()
-        
-        # Extract category
-        categories = {
-            'work': ['work', 'meeting', 'project', 'deadline'],
-            'personal': ['personal', 'buy', 'call', 'email'],
-            'coding': ['code', 'bug', 'feature', 'deploy', 'fix'],
-            'learning': ['learn', 'study', 'read', 'course']
-        }
+        title, priority, due_in_days, category = _parse_task_text(text)
         
-        for category, keywords in categories.items():
-            if any(keyword in text.lower() for keyword in keywords):
-                task_data['category'] = category
-                break
+        # Resolve the relative due date now so cached parses never go stale
+        due_date = None
+        if due_in_days is not None:
+            due_date = (datetime.now() + timedelta(days=due_in_days)).isoformat()
         
-        # Clean up title (remove date/priority keywords)
-        title = text
-        for word in ['urgent', 'asap', 'today', 'tomorrow', 'next week', 'next month']:
-            title = re.sub(rf'\b{word}\b', '', title, flags=re.IGNORECASE)
-        task_data['title'] = ' '.join(title.split()).strip()
-        
-        return task_data
+        return {
+            'title': title,
+            'description': '',
+            'priority': priority,
+            'due_date': due_date,
+            'category': category
+        }
     
     def create_task(self, task_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new task"""
-        task_id = str(uuid.uuid4())
+        task_id = self.create_tasks([task_data])[0]
+        return self.get_task(task_id)
+    
+    def create_tasks(self, items: List[Dict[str, Any]]) -> List[str]:
+        """Create several tasks in one transaction and return their IDs"""
         now = datetime.now().isoformat()
+        task_ids = [str(uuid.uuid4()) for _ in items]
+        rows = [
+            (
+                task_id,
+                task_data.get('title', ''),
+                task_data.get('description', ''),
+                task_data.get('priority', 'medium'),
+                'pending',
+                task_data.get('due_date'),
+                task_data.get('category', 'general'),
+                now,
+                now,
+                self._due_timestamp(task_data.get('due_date'))
+            )
+            for task_id, task_data in zip(task_ids, items)
+        ]
         
-        conn = sqlite3.connect(self.db_path)
-        conn.execute("""
-            INSERT INTO tasks (id, title, description, priority, status, due_date, category, created_at, updated_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            task_id,
-            task_data.get('title', ''),
-            task_data.get('description', ''),
-            task_data.get('priority', 'medium'),
-            'pending',
-            task_data.get('due_date'),
-            task_data.get('category', 'general'),
-            now,
-            now
-        ))
-        conn.commit()
-        conn.close()
+        conn = self._conn()
+        conn.execute("BEGIN")
+        try:
+            conn.executemany("""
+                INSERT INTO tasks (id, title, description, priority, status, due_date, category, created_at, updated_at, due_ts)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, rows)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
         
-        return self.get_task(task_id)
+        return task_ids
     
     def get_task(self, task_id: str) -> Optional[Dict[str, Any]]:
         """Get a single task by ID"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.execute("SELECT * FROM tasks WHERE id = ?", (task_id,))
+        cursor = self._conn().execute("SELECT * FROM tasks WHERE id = ?", (task_id,))
         row = cursor.fetchone()
-        conn.close()
         
         if row:
             return dict(row)
@@ -131,9 +239,10 @@ class TaskManager:
     
     def get_all_tasks(self, status: Optional[str] = None, category: Optional[str] = None) -> List[Dict[str, Any]]:
         """Get all tasks with optional filtering"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        
+        return list(self.iter_tasks(status=status, category=category))
+    
+    def iter_tasks(self, status: Optional[str] = None, category: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Yield tasks with optional filtering, newest first, without loading them all"""
         query = "SELECT * FROM tasks WHERE 1=1"
         params = []
         
@@ -147,62 +256,62 @@ class TaskManager:
         
         query += " ORDER BY created_at DESC"
         
-        cursor = conn.execute(query, params)
-        tasks = [dict(row) for row in cursor.fetchall()]
-        conn.close()
-        
-        return tasks
+        # Plain tuples skip building a Row object per task before the dict
+        cursor = self._conn().cursor()
+        cursor.row_factory = None
+        cursor.execute(query, params)
+        columns = [col[0] for col in cursor.description]
+        for row in cursor:
+            yield dict(zip(columns, row))
     
     def update_task(self, task_id: str, updates: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Update a task"""
-        conn = sqlite3.connect(self.db_path)
-        
-        # Build update query
-        allowed_fields = ['title', 'description', 'priority', 'status', 'due_date', 'category']
-        update_fields = []
-        values = []
+        fields = tuple(field for field in _UPDATABLE_FIELDS if field in updates)
+        if not fields:
+            return self.get_task(task_id)
         
-        for field in allowed_fields:
-            if field in updates:
-                update_fields.append(f"{field} = ?")
-                values.append(updates[field])
+        completes = updates.get('status') == 'done'
+        now = datetime.now().isoformat()
         
-        if not update_fields:
-            conn.close()
-            return self.get_task(task_id)
+        values = [updates[field] for field in fields]
         
-        # Add updated_at
-        update_fields.append("updated_at = ?")
-        values.append(datetime.now().isoformat())
+        # Keep the numeric due date in step with the ISO one
+        if 'due_date' in updates:
+            values.append(self._due_timestamp(updates['due_date']))
         
-        # Add completed_at if status changed to done
-        if updates.get('status') == 'done':
-            update_fields.append("completed_at = ?")
-            values.append(datetime.now().isoformat())
+        # Add updated_at, and completed_at if status changed to done
+        values.append(now)
+        if completes:
+            values.append(now)
         
         values.append(task_id)
         
-        query = f"UPDATE tasks SET {', '.join(update_fields)} WHERE id = ?"
-        conn.execute(query, values)
-        conn.commit()
-        conn.close()
+        self._conn().execute(self._update_sql(fields, completes), values)
         
         return self.get_task(task_id)
     
+    def _update_sql(self, fields: tuple, completes: bool) -> str:
+        """Get the UPDATE statement for a set of fields, building it once per shape"""
+        key = (fields, completes)
+        query = self._update_sql_cache.get(key)
+        if query is None:
+            update_fields = [f"{field} = ?" for field in fields]
+            if 'due_date' in fields:
+                update_fields.append("due_ts = ?")
+            update_fields.append("updated_at = ?")
+            if completes:
+                update_fields.append("completed_at = ?")
+            query = f"UPDATE tasks SET {', '.join(update_fields)} WHERE id = ?"
+            self._update_sql_cache[key] = query
+        return query
+    
     def delete_task(self, task_id: str) -> bool:
         """Delete a task"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
-        conn.commit()
-        deleted = cursor.rowcount > 0
-        conn.close()
-        return deleted
+        cursor = self._conn().execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+        return cursor.rowcount > 0
     
     def get_statistics(self) -> Dict[str, Any]:
         """Get task statistics"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        
         stats = {
             'total': 0,
             'pending': 0,
@@ -213,32 +322,29 @@ class TaskManager:
             'by_priority': {}
         }
         
-        # Get all tasks
-        cursor = conn.execute("SELECT * FROM tasks")
-        tasks = [dict(row) for row in cursor.fetchall()]
-        conn.close()
+        conn = self._conn()
         
-        stats['total'] = len(tasks)
-        now = datetime.now()
-        
-        for task in tasks:
-            # Count by status
-            status = task['status']
+        # Count by status, with overdue tasks counted in the same scan
+        for status, count, overdue in conn.execute(
+            "SELECT status, COUNT(*), SUM(due_ts < ? AND status != 'done') "
+            "FROM tasks GROUP BY status",
+            (int(time.time()),)
+        ):
+            stats['total'] += count
+            stats['overdue'] += overdue or 0
             if status in stats:
-                stats[status] += 1
-            
-            # Count overdue
-            if task['due_date'] and task['status'] != 'done':
-                due_date = datetime.fromisoformat(task['due_date'])
-                if due_date < now:
-                    stats['overdue'] += 1
-            
-            # Count by category
-            category = task['category'] or 'general'
-            stats['by_category'][category] = stats['by_category'].get(category, 0) + 1
-            
-            # Count by priority
-            priority = task['priority']
-            stats['by_priority'][priority] = stats['by_priority'].get(priority, 0) + 1
+                stats[status] += count
+        
+        # Count by category
+        for category, count in conn.execute(
+            "SELECT COALESCE(NULLIF(category, ''), 'general'), COUNT(*) FROM tasks GROUP BY 1"
+        ):
+            stats['by_category'][category] = count
+        
+        # Count by priority
+        for priority, count in conn.execute(
+            "SELECT priority, COUNT(*) FROM tasks GROUP BY priority"
+        ):
+            stats['by_priority'][priority] = count
         
         return stats
@@ -3,21 +3,79 @@ Integrated Terminal Manager
 Execute terminal commands with real-time output streaming
 """
 import asyncio
+import codecs
+import heapq
 import os
+import re
+import stat
 import subprocess
 from typing import Dict, List, Optional, Callable
 import uuid
 from datetime import datetime
 
+
+class CommandTrie:
+    """Prefix trie mapping each prefix to the commands that start with it"""
+    
+    # Key holding the commands below a node; real children are single characters
+    _COMMANDS = ''
+    
+    def __init__(self):
+        self.root: Dict = {}
+    
+    def insert(self, command: str, rank: int):
+        """Add a command (or update its rank) under every one of its prefixes"""
+        node = self.root
+        node.setdefault(self._COMMANDS, {})[command] = rank
+        for char in command:
+            node = node.setdefault(char, {})
+            node.setdefault(self._COMMANDS, {})[command] = rank
+    
+    def find(self, prefix: str) -> Dict[str, int]:
+        """Get the commands starting with prefix, mapped to their rank"""
+        node = self.root
+        for char in prefix:
+            node = node.get(char)
+            if node is None:
+                return {}
+        return node.get(self._COMMANDS, {})
+
+
+# Most command output (bytes) kept for the result and history
+MAX_OUTPUT_BYTES = 1 << 20
+
+# Size of each read from a command's stdout/stderr pipe
+READ_CHUNK_SIZE = 65536
+
+# Shell operators (redirection, pipes, chaining) and destructive words next to them
+_OPERATOR_RE = re.compile(r'\|\||&&|>>?|[|;]')
+_DANGER_RE = re.compile(r'\b(rm|del|format)\b')
+
+# Common commands offered after history matches, in suggestion order
+COMMON_COMMANDS = [
+    'ls -la', 'git status', 'git log', 'npm install',
+    'npm run dev', 'python -m', 'pip install',
+    'docker ps', 'docker logs', 'kubectl get pods'
+]
+
+_COMMON_COMMAND_TRIE = CommandTrie()
+for _rank, _command in enumerate(COMMON_COMMANDS):
+    _COMMON_COMMAND_TRIE.insert(_command, _rank)
+
+
 class TerminalSession:
     def __init__(self, session_id: str, cwd: str = None):
         self.session_id = session_id
         self.cwd = cwd or os.getcwd()
         self.history: List[Dict] = []
         self.created_at = datetime.now()
+        
+        # History commands ranked by when they were last run
+        self.suggestion_trie = CommandTrie()
     
     def add_to_history(self, command: str, output: str, exit_code: int):
         """Add command to history"""
+        self.suggestion_trie.insert(command, len(self.history))
         self.history.append({
             'command': command,
             'output': output,
@@ -57,17 +115,17 @@ class TerminalManager:
     def is_command_safe(self, command: str) -> tuple[bool, str]:
         """Check if command is safe to execute"""
         # Get the base command
-        base_command = command.strip().split()[0] if command.strip() else ''
+        stripped = command.strip()
+        base_command = stripped.split(maxsplit=1)[0] if stripped else ''
         
         # Check for dangerous commands
         if base_command in self.dangerous_commands:
             return False, f"Dangerous command '{base_command}' requires user confirmation"
         
         # Check for shell operators that could be dangerous
-        dangerous_operators = ['>', '>>', '|', '&&', '||', ';']
-        if any(op in command for op in dangerous_operators):
+        if _OPERATOR_RE.search(stripped):
             # Allow some safe uses
-            if not any(danger in command for danger in ['rm ', 'del ', 'format']):
+            if not _DANGER_RE.search(stripped):
                 return True, "Command contains operators but appears safe"
         
         return True, "Command is safe"
@@ -105,27 +163,42 @@ class TerminalManager:
                 command,
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE,
-                cwd=session.cwd,
-                env=os.environ.copy()
+                cwd=session.cwd
             )
             
-            output_lines = []
+            output_buf = bytearray()
             
             # Read output in real-time
             async def read_stream(stream, is_stderr=False):
+                # Chunks may split multi-byte characters; the decoder carries them over
+                decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+                
                 while True:
-                    line = await stream.readline()
-                    if not line:
+                    chunk = await stream.read(READ_CHUNK_SIZE)
+                    if not chunk:
                         break
                     
-                    decoded_line = line.decode('utf-8', errors='replace')
-                    output_lines.append(decoded_line)
+                    # Keep only the tail of runaway output
+                    output_buf.extend(chunk)
+                    if len(output_buf) > MAX_OUTPUT_BYTES:
+                        del output_buf[:len(output_buf) - MAX_OUTPUT_BYTES]
                     
                     # Call callback for real-time streaming
                     if output_callback:
+                        data = decoder.decode(chunk)
+                        if data:
+                            await output_callback({
+                                'type': 'stderr' if is_stderr else 'stdout',
+                                'data': data
+                            })
+                
+                # Flush a character cut off at EOF, as U+FFFD like full_output
+                if output_callback:
+                    tail = decoder.decode(b'', final=True)
+                    if tail:
                         await output_callback({
                             'type': 'stderr' if is_stderr else 'stdout',
-                            'data': decoded_line
+                            'data': tail
                         })
             
             # Read both stdout and stderr concurrently
@@ -138,7 +211,7 @@ class TerminalManager:
             exit_code = await process.wait()
             
             # Combine output
-            full_output = ''.join(output_lines)
+            full_output = output_buf.decode('utf-8', errors='replace')
             
             # Add to history
             session.add_to_history(command, full_output, exit_code)
@@ -147,12 +220,7 @@ class TerminalManager:
             if command.strip().startswith('cd '):
                 new_dir = command.strip()[3:].strip()
                 if new_dir:
-                    try:
-                        new_path = os.path.join(session.cwd, new_dir)
-                        if os.path.isdir(new_path):
-                            session.cwd = os.path.abspath(new_path)
-                    except Exception:
-                        pass
+                    self._set_cwd(session, new_dir)
             
             return {
                 'success': exit_code == 0,
@@ -184,12 +252,18 @@ class TerminalManager:
         if not session:
             return False
         
+        return self._set_cwd(session, path)
+    
+    @staticmethod
+    def _set_cwd(session: TerminalSession, path: str) -> bool:
+        """Move a session into path (relative to its cwd) if it is a directory"""
+        # abspath only normalizes the string; the single stat is the one syscall
+        new_path = os.path.abspath(os.path.join(session.cwd, path))
         try:
-            new_path = os.path.join(session.cwd, path)
-            if os.path.isdir(new_path):
-                session.cwd = os.path.abspath(new_path)
+            if stat.S_ISDIR(os.stat(new_path).st_mode):
+                session.cwd = new_path
                 return True
-        except Exception:
+        except (OSError, ValueError):
             pass
         
         return False
@@ -221,25 +295,14 @@ class TerminalManager:
         if not session:
             return []
         
-        suggestions = []
-        
-        # Suggest from history
-        for entry in reversed(session.history):
-            cmd = entry['command']
-            if cmd.startswith(partial_command) and cmd not in suggestions:
-                suggestions.append(cmd)
-                if len(suggestions) >= 5:
-                    break
+        # Suggest from history, most recently run first
+        history_matches = session.suggestion_trie.find(partial_command)
+        suggestions = heapq.nlargest(5, history_matches, key=history_matches.get)
         
         # Suggest common commands
-        common_commands = [
-            'ls -la', 'git status', 'git log', 'npm install',
-            'npm run dev', 'python -m', 'pip install',
-            'docker ps', 'docker logs', 'kubectl get pods'
-        ]
-        
-        for cmd in common_commands:
-            if cmd.startswith(partial_command) and cmd not in suggestions:
+        common_matches = _COMMON_COMMAND_TRIE.find(partial_command)
+        for cmd in sorted(common_matches, key=common_matches.get):
+            if cmd not in suggestions:
                 suggestions.append(cmd)
                 if len(suggestions) >= 10:
                     break
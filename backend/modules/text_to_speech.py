@@ -2,9 +2,10 @@
 Text-to-Speech Module for Friday Agent
 Handles voice synthesis for responses (optional - gracefully degrades if dependencies missing)
 """
+import atexit
 import threading
-import queue
 import logging
+from collections import deque
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -19,12 +20,21 @@ except (ImportError, RuntimeError) as e:
     logger.warning(f"⚠️  Text-to-speech not available: {e}")
     logger.info("💡 To enable TTS, install: sudo apt-get install espeak espeak-ng")
 
+# Most utterances waiting to be spoken; older ones are dropped beyond this
+MAX_PENDING_SPEECH = 16
+
+# Queue marker telling the speech thread to exit
+_STOP = object()
+
 
 class TextToSpeech:
     def __init__(self):
         self.enabled = TTS_AVAILABLE
         self.engine = None
-        self.speech_queue = queue.Queue()
+        # Pending speech; priority items go to the front
+        self._deque = deque(maxlen=MAX_PENDING_SPEECH)
+        self._shutting_down = False
+        self._cond = threading.Condition()
         self.speaking = False
 
         if self.enabled:
@@ -34,6 +44,7 @@ class TextToSpeech:
                 self._configure_voice()
                 # Start speech thread
                 threading.Thread(target=self._speech_loop, daemon=True).start()
+                atexit.register(self.shutdown)
                 logger.info("✅ Text-to-speech initialized successfully")
             except Exception as e:
                 logger.warning(f"⚠️  Failed to initialize TTS engine: {e}")
@@ -69,15 +80,21 @@ class TextToSpeech:
             logger.debug(f"📢 [Silent mode] Would speak: {text}")
             return
 
-        if priority:
-            # Insert at front of queue
-            temp_queue = queue.Queue()
-            temp_queue.put(text)
-            while not self.speech_queue.empty():
-                temp_queue.put(self.speech_queue.get())
-            self.speech_queue = temp_queue
-        else:
-            self.speech_queue.put(text)
+        with self._cond:
+            if self._shutting_down:
+                return
+
+            if len(self._deque) == MAX_PENDING_SPEECH:
+                # The bounded deque evicts from the opposite end
+                dropped = self._deque[-1] if priority else self._deque[0]
+                logger.debug(f"Speech queue full, dropping: {dropped}")
+
+            if priority:
+                # Insert at front of queue
+                self._deque.appendleft(text)
+            else:
+                self._deque.append(text)
+            self._cond.notify()
 
         logger.info(f"Queued speech: {text}")
 
@@ -100,14 +117,19 @@ class TextToSpeech:
             return
 
         while True:
+            with self._cond:
+                while not self._deque:
+                    self._cond.wait()
+                text = self._deque.popleft()
+
+            if text is _STOP:
+                return
+
+            # speak_now logs engine errors itself
+            self.speaking = True
             try:
-                text = self.speech_queue.get()
-                self.speaking = True
                 self.speak_now(text)
-                self.speaking = False
-                self.speech_queue.task_done()
-            except Exception as e:
-                logger.error(f"Speech error: {e}")
+            finally:
                 self.speaking = False
 
     def is_speaking(self) -> bool:
@@ -116,13 +138,18 @@ class TextToSpeech:
 
     def clear_queue(self):
         """Clear all pending speech"""
-        while not self.speech_queue.empty():
-            try:
-                self.speech_queue.get_nowait()
-            except queue.Empty:
-                break
+        with self._cond:
+            self._deque.clear()
         logger.info("Speech queue cleared")
 
+    def shutdown(self):
+        """Stop the speech thread once the current utterance finishes"""
+        with self._cond:
+            # Nothing is queued after the marker, so the bounded deque never evicts it
+            self._shutting_down = True
+            self._deque.appendleft(_STOP)
+            self._cond.notify()
+
     def stop(self):
         """Stop current speech"""
         if self.enabled and self.engine:
@@ -4,16 +4,163 @@ Drag-and-drop workflow builder, flowchart to code, visual API designer
 """
 
 import asyncio
+import io
 import logging
-import json
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, asdict, field
-from datetime import datetime
+import string
+import sys
+from collections import deque
+from typing import Dict, List, Optional, Tuple, Any
+from dataclasses import dataclass, field, fields
 from enum import Enum
+import time
 import uuid
 
 logger = logging.getLogger(__name__)
 
+# Optional fast JSON for workflow import/export
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _dumps(obj: Any) -> str:
+    """Serialize to indented JSON, using orjson when installed"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+    import json
+    return json.dumps(obj, indent=2)
+
+
+def _loads(data: str) -> Any:
+    """Parse JSON, using orjson when installed"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    import json
+    return json.loads(data)
+
+
+# Fixed scaffolding for generated code; only the per-node body is built per call
+_PY_HEADER = string.Template('''\
+# Generated by FRIDAY Visual Programming
+# Workflow: ${name}
+
+import asyncio
+import logging
+from typing import Dict, Any
+
+''')
+
+_PY_FASTAPI_IMPORTS = '''\
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel
+
+router = APIRouter()
+
+'''
+
+_PY_FUNCTION_START = string.Template('''\
+async def ${function_name}(data: Dict[str, Any]) -> Dict[str, Any]:
+    \"\"\"
+    ${description}
+    \"\"\"
+    try:
+''')
+
+_PY_FUNCTION_END = '''\
+        return {'success': True, 'result': result}
+    except Exception as e:
+        logging.error(f'Error in workflow: {e}')
+        return {'success': False, 'error': str(e)}
+
+'''
+
+_PY_FASTAPI_ENDPOINT = string.Template('''\
+class WorkflowRequest(BaseModel):
+    data: Dict[str, Any]
+
+@router.post('/${function_name}')
+async def ${function_name}_endpoint(request: WorkflowRequest):
+    result = await ${function_name}(request.data)
+    if not result['success']:
+        raise HTTPException(status_code=500, detail=result['error'])
+    return result
+''')
+
+_JS_HEADER = string.Template('''\
+// Generated by FRIDAY Visual Programming
+// Workflow: ${name}
+
+''')
+
+_JS_EXPRESS_IMPORTS = '''\
+const express = require('express');
+const router = express.Router();
+
+'''
+
+_JS_FUNCTION_START = string.Template('''\
+async function ${function_name}(data) {
+  // ${description}
+  try {
+''')
+
+_JS_FUNCTION_END = '''\
+    return { success: true, result };
+  } catch (error) {
+    console.error('Error in workflow:', error);
+    return { success: false, error: error.message };
+  }
+}
+
+'''
+
+_JS_EXPRESS_ROUTE = string.Template('''\
+router.post('/${function_name}', async (req, res) => {
+  const result = await ${function_name}(req.body);
+  if (!result.success) {
+    return res.status(500).json(result);
+  }
+  res.json(result);
+});
+
+module.exports = router;
+''')
+
+_TS_HEADER = string.Template('''\
+// Generated by FRIDAY Visual Programming
+// Workflow: ${name}
+
+interface WorkflowData {
+  [key: string]: any;
+}
+
+interface WorkflowResult {
+  success: boolean;
+  result?: any;
+  error?: string;
+}
+
+''')
+
+_TS_FUNCTION_START = string.Template('''\
+async function ${function_name}(data: WorkflowData): Promise<WorkflowResult> {
+  // ${description}
+  try {
+''')
+
+_TS_FUNCTION_END = string.Template('''\
+    return { success: true, result };
+  } catch (error) {
+    console.error('Error in workflow:', error);
+    return { success: false, error: (error as Error).message };
+  }
+}
+
+export { ${function_name} };
+''')
+
 
 class NodeType(Enum):
     """Types of visual programming nodes"""
@@ -39,7 +186,23 @@ class ConnectionType(Enum):
     ERROR_HANDLER = "error_handler"
 
 
-@dataclass
+# Slotted dataclasses (Python 3.10+) drop the per-instance __dict__
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+# Enum values used in hot comparisons, looked up once
+_NT_START = NodeType.START.value
+_NT_END = NodeType.END.value
+_NT_FUNCTION = NodeType.FUNCTION.value
+_NT_CONDITION = NodeType.CONDITION.value
+_NT_LOOP = NodeType.LOOP.value
+_NT_API_CALL = NodeType.API_CALL.value
+_NT_DATABASE = NodeType.DATABASE.value
+_NT_VARIABLE = NodeType.VARIABLE.value
+_NT_OUTPUT = NodeType.OUTPUT.value
+_CT_SEQUENTIAL = ConnectionType.SEQUENTIAL.value
+
+
+@dataclass(**_SLOTS)
 class FlowNode:
     """Represents a node in visual workflow"""
     id: str
@@ -50,8 +213,20 @@ class FlowNode:
     inputs: List[str] = field(default_factory=list)
     outputs: List[str] = field(default_factory=list)
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a plain dict without the recursive copy done by asdict"""
+        return {
+            "id": self.id,
+            "type": self.type,
+            "label": self.label,
+            "position": self.position,
+            "config": self.config,
+            "inputs": self.inputs,
+            "outputs": self.outputs
+        }
+
 
-@dataclass
+@dataclass(**_SLOTS)
 class FlowConnection:
     """Represents a connection between nodes"""
     id: str
@@ -61,8 +236,19 @@ class FlowConnection:
     target_port: str
     connection_type: str
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a plain dict"""
+        return {
+            "id": self.id,
+            "source_node": self.source_node,
+            "target_node": self.target_node,
+            "source_port": self.source_port,
+            "target_port": self.target_port,
+            "connection_type": self.connection_type
+        }
 
-@dataclass
+
+@dataclass(**_SLOTS)
 class VisualWorkflow:
     """Represents a complete visual workflow"""
     workflow_id: str
@@ -73,6 +259,169 @@ class VisualWorkflow:
     created_at: float
     updated_at: float
     metadata: Dict[str, Any]
+    # (version key, execution order) from the last topological sort
+    _execution_order_cache: Optional[Tuple[Tuple, List[FlowNode]]] = field(
+        default=None, repr=False, compare=False
+    )
+    # Next free numeric suffix for node_N / conn_N ids; never reused
+    _next_node_id: int = field(default=0, repr=False)
+    _next_conn_id: int = field(default=0, repr=False)
+    # Connections indexed by source and target node id
+    outgoing: Dict[str, List[FlowConnection]] = field(default_factory=dict, repr=False, compare=False)
+    incoming: Dict[str, List[FlowConnection]] = field(default_factory=dict, repr=False, compare=False)
+
+    def __post_init__(self):
+        for conn in self.connections:
+            self._index_connection(conn)
+
+    def _index_connection(self, conn: FlowConnection):
+        self.outgoing.setdefault(conn.source_node, []).append(conn)
+        self.incoming.setdefault(conn.target_node, []).append(conn)
+
+    def add_connection(self, conn: FlowConnection):
+        """Append a connection and index it"""
+        self.connections.append(conn)
+        self._index_connection(conn)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a plain dict, including nodes and connections"""
+        return {
+            "workflow_id": self.workflow_id,
+            "name": self.name,
+            "description": self.description,
+            "nodes": [node.to_dict() for node in self.nodes],
+            "connections": [conn.to_dict() for conn in self.connections],
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+            "metadata": self.metadata
+        }
+
+
+_FLOW_NODE_FIELDS = frozenset(f.name for f in fields(FlowNode))
+_FLOW_CONNECTION_FIELDS = frozenset(f.name for f in fields(FlowConnection))
+
+
+def _restore(cls, field_names: frozenset, data: Dict[str, Any]):
+    """Rebuild a dataclass from its to_dict() output"""
+    if data.keys() == field_names:
+        # Complete exports skip __init__ argument binding and default factories
+        obj = cls.__new__(cls)
+        for name, value in data.items():
+            setattr(obj, name, value)
+        return obj
+    # Partial or unexpected data goes through __init__ for defaults and errors
+    return cls(**data)
+
+
+def _next_id_number(ids) -> int:
+    """First free N after the highest prefix_N id (e.g. node_3 -> 4)"""
+    highest = -1
+    for item_id in ids:
+        suffix = item_id.rpartition("_")[2]
+        if suffix.isdigit():
+            highest = max(highest, int(suffix))
+    return highest + 1
+
+
+# ==================== Node Code Generators ====================
+# Each takes (node, language) and returns the node's code lines
+
+def _py_function_code(node: FlowNode, language: str) -> str:
+    func_name = node.config.get("function", "process_data")
+    return f"result = await {func_name}(data)"
+
+
+def _py_condition_code(node: FlowNode, language: str) -> str:
+    condition = node.config.get("condition", "True")
+    return f"if {condition}:\n    # True branch\n    pass\nelse:\n    # False branch\n    pass"
+
+
+def _py_loop_code(node: FlowNode, language: str) -> str:
+    iterator = node.config.get("iterator", "items")
+    return f"for item in {iterator}:\n    # Process item\n    pass"
+
+
+def _py_api_call_code(node: FlowNode, language: str) -> str:
+    url = node.config.get("url", "https://api.example.com")
+    method = node.config.get("method", "GET")
+    return f"import aiohttp\nasync with aiohttp.ClientSession() as session:\n    async with session.{method.lower()}('{url}') as response:\n        result = await response.json()"
+
+
+def _py_database_code(node: FlowNode, language: str) -> str:
+    query = node.config.get("query", "SELECT * FROM table")
+    return f"# Database query\nresult = await db.execute('{query}')"
+
+
+def _py_variable_code(node: FlowNode, language: str) -> str:
+    var_name = node.config.get("name", "variable")
+    var_value = node.config.get("value", "None")
+    return f"{var_name} = {var_value}"
+
+
+def _py_output_code(node: FlowNode, language: str) -> str:
+    return "# Return result\nreturn result"
+
+
+def _py_default_code(node: FlowNode, language: str) -> str:
+    return f"# {node.label}\npass"
+
+
+def _js_function_code(node: FlowNode, language: str) -> str:
+    func_name = node.config.get("function", "processData")
+    return f"const result = await {func_name}(data);"
+
+
+def _js_condition_code(node: FlowNode, language: str) -> str:
+    condition = node.config.get("condition", "true")
+    return f"if ({condition}) {{\n  // True branch\n}} else {{\n  // False branch\n}}"
+
+
+def _js_api_call_code(node: FlowNode, language: str) -> str:
+    url = node.config.get("url", "https://api.example.com")
+    return f"const response = await fetch('{url}');\nconst result = await response.json();"
+
+
+def _js_variable_code(node: FlowNode, language: str) -> str:
+    var_name = node.config.get("name", "variable")
+    var_value = node.config.get("value", "null")
+    const_or_let = "const" if language == "typescript" else "let"
+    return f"{const_or_let} {var_name} = {var_value};"
+
+
+def _js_default_code(node: FlowNode, language: str) -> str:
+    return f"// {node.label}"
+
+
+_PY_NODE_GENERATORS = {
+    _NT_FUNCTION: _py_function_code,
+    _NT_CONDITION: _py_condition_code,
+    _NT_LOOP: _py_loop_code,
+    _NT_API_CALL: _py_api_call_code,
+    _NT_DATABASE: _py_database_code,
+    _NT_VARIABLE: _py_variable_code,
+    _NT_OUTPUT: _py_output_code
+}
+
+_JS_NODE_GENERATORS = {
+    _NT_FUNCTION: _js_function_code,
+    _NT_CONDITION: _js_condition_code,
+    _NT_API_CALL: _js_api_call_code,
+    _NT_VARIABLE: _js_variable_code
+}
+
+# Fallback generator per language for node types without a specific one
+_DEFAULT_NODE_GENERATORS = {
+    "python": _py_default_code,
+    "javascript": _js_default_code,
+    "typescript": _js_default_code
+}
+
+# (language, node type) -> generator, covering every built-in node type
+_NODE_GENERATORS = {}
+for _language, _default in _DEFAULT_NODE_GENERATORS.items():
+    _generators = _PY_NODE_GENERATORS if _language == "python" else _JS_NODE_GENERATORS
+    for _node_type in NodeType:
+        _NODE_GENERATORS[(_language, _node_type.value)] = _generators.get(_node_type.value, _default)
 
 
 class VisualProgramming:
@@ -87,7 +436,18 @@ class VisualProgramming:
     def __init__(self, llm_processor=None):
         self.llm = llm_processor
         self.workflows: Dict[str, VisualWorkflow] = {}
+        # list_workflows summaries, rebuilt only after a workflow changes
+        self._summary_cache: Optional[List[Dict]] = None
+        self._summary_dirty = True
         self.templates: Dict[str, Dict] = self._load_templates()
+        # Template topology is fixed, so its nodes and connections are laid out once
+        self._template_skeletons: Dict[str, Tuple[List[FlowNode], List[FlowConnection]]] = {}
+        for template_name, template_data in self.templates.items():
+            skeleton_nodes = self._create_nodes_from_template(template_data["nodes"])
+            self._template_skeletons[template_name] = (
+                skeleton_nodes,
+                self._create_connections_from_template(skeleton_nodes)
+            )
         logger.info("Visual Programming module initialized")
 
     def _load_templates(self) -> Dict[str, Dict]:
@@ -139,16 +499,15 @@ class VisualProgramming:
     ) -> Dict:
         """Create a new visual workflow"""
         try:
-            workflow_id = str(uuid.uuid4())
+            workflow_id = uuid.uuid4().hex
+            now = time.time()
             
             # Load from template if specified
             nodes = []
             connections = []
             
-            if template and template in self.templates:
-                template_data = self.templates[template]
-                nodes = self._create_nodes_from_template(template_data["nodes"])
-                connections = self._create_connections_from_template(nodes)
+            if template and template in self._template_skeletons:
+                nodes, connections = self._instantiate_template(template)
 
             workflow = VisualWorkflow(
                 workflow_id=workflow_id,
@@ -156,27 +515,59 @@ class VisualProgramming:
                 description=description,
                 nodes=nodes,
                 connections=connections,
-                created_at=datetime.now().timestamp(),
-                updated_at=datetime.now().timestamp(),
+                created_at=now,
+                updated_at=now,
                 metadata={
                     "template": template,
                     "version": "1.0.0",
                     "language": "python"
-                }
+                },
+                _next_node_id=len(nodes),
+                _next_conn_id=len(connections)
             )
 
             self.workflows[workflow_id] = workflow
+            self._summary_dirty = True
 
             return {
                 "success": True,
                 "workflow_id": workflow_id,
-                "workflow": asdict(workflow)
+                "workflow": workflow.to_dict()
             }
 
         except Exception as e:
             logger.error(f"Error creating workflow: {e}")
             return {"success": False, "error": str(e)}
 
+    def _instantiate_template(self, template: str) -> Tuple[List[FlowNode], List[FlowConnection]]:
+        """Copy a template's precomputed nodes and connections for a new workflow"""
+        skeleton_nodes, skeleton_connections = self._template_skeletons[template]
+        # Copy the mutable node fields so workflows never share them
+        nodes = [
+            FlowNode(
+                id=node.id,
+                type=node.type,
+                label=node.label,
+                position=dict(node.position),
+                config=dict(node.config) if node.config else {},
+                inputs=list(node.inputs),
+                outputs=list(node.outputs)
+            )
+            for node in skeleton_nodes
+        ]
+        connections = [
+            FlowConnection(
+                id=conn.id,
+                source_node=conn.source_node,
+                target_node=conn.target_node,
+                source_port=conn.source_port,
+                target_port=conn.target_port,
+                connection_type=conn.connection_type
+            )
+            for conn in skeleton_connections
+        ]
+        return nodes, connections
+
     def _create_nodes_from_template(self, template_nodes: List[Dict]) -> List[FlowNode]:
         """Create flow nodes from template"""
         nodes = []
@@ -188,7 +579,7 @@ class VisualProgramming:
                 type=node_def["type"],
                 label=node_def["label"],
                 position={"x": 300, "y": y_position},
-                config=node_def.get("config", {}),
+                config=dict(node_def["config"]) if node_def.get("config") else {},
                 inputs=["input"] if i > 0 else [],
                 outputs=["output"] if i < len(template_nodes) - 1 else []
             )
@@ -201,14 +592,14 @@ class VisualProgramming:
         """Create connections between template nodes"""
         connections = []
         
-        for i in range(len(nodes) - 1):
+        for i, (source, target) in enumerate(zip(nodes, nodes[1:])):
             connection = FlowConnection(
                 id=f"conn_{i}",
-                source_node=nodes[i].id,
-                target_node=nodes[i + 1].id,
+                source_node=source.id,
+                target_node=target.id,
                 source_port="output",
                 target_port="input",
-                connection_type=ConnectionType.SEQUENTIAL.value
+                connection_type=_CT_SEQUENTIAL
             )
             connections.append(connection)
 
@@ -224,29 +615,31 @@ class VisualProgramming:
     ) -> Dict:
         """Add a node to workflow"""
         try:
-            if workflow_id not in self.workflows:
+            workflow = self.workflows.get(workflow_id)
+            if workflow is None:
                 return {"success": False, "error": "Workflow not found"}
-
-            workflow = self.workflows[workflow_id]
             
-            node_id = f"node_{len(workflow.nodes)}"
+            node_number = workflow._next_node_id
+            workflow._next_node_id = node_number + 1
+            node_id = f"node_{node_number}"
             node = FlowNode(
                 id=node_id,
                 type=node_type,
                 label=label,
                 position=position,
-                config=config or {},
-                inputs=["input"] if node_type != NodeType.START.value else [],
-                outputs=["output"] if node_type != NodeType.END.value else []
+                config=config if config is not None else {},
+                inputs=["input"] if node_type != _NT_START else [],
+                outputs=["output"] if node_type != _NT_END else []
             )
 
             workflow.nodes.append(node)
-            workflow.updated_at = datetime.now().timestamp()
+            workflow.updated_at = time.time()
+            self._summary_dirty = True
 
             return {
                 "success": True,
                 "node_id": node_id,
-                "node": asdict(node)
+                "node": node.to_dict()
             }
 
         except Exception as e:
@@ -262,12 +655,13 @@ class VisualProgramming:
     ) -> Dict:
         """Connect two nodes in workflow"""
         try:
-            if workflow_id not in self.workflows:
+            workflow = self.workflows.get(workflow_id)
+            if workflow is None:
                 return {"success": False, "error": "Workflow not found"}
-
-            workflow = self.workflows[workflow_id]
             
-            connection_id = f"conn_{len(workflow.connections)}"
+            conn_number = workflow._next_conn_id
+            workflow._next_conn_id = conn_number + 1
+            connection_id = f"conn_{conn_number}"
             connection = FlowConnection(
                 id=connection_id,
                 source_node=source_node,
@@ -277,13 +671,14 @@ class VisualProgramming:
                 connection_type=connection_type
             )
 
-            workflow.connections.append(connection)
-            workflow.updated_at = datetime.now().timestamp()
+            workflow.add_connection(connection)
+            workflow.updated_at = time.time()
+            self._summary_dirty = True
 
             return {
                 "success": True,
                 "connection_id": connection_id,
-                "connection": asdict(connection)
+                "connection": connection.to_dict()
             }
 
         except Exception as e:
@@ -300,17 +695,16 @@ class VisualProgramming:
     ) -> Dict:
         """Generate code from visual workflow"""
         try:
-            if workflow_id not in self.workflows:
+            workflow = self.workflows.get(workflow_id)
+            if workflow is None:
                 return {"success": False, "error": "Workflow not found"}
 
-            workflow = self.workflows[workflow_id]
-
             if language == "python":
-                code = await self._generate_python_code(workflow, framework)
+                code = self._generate_python_code(workflow, framework)
             elif language == "javascript":
-                code = await self._generate_javascript_code(workflow, framework)
+                code = self._generate_javascript_code(workflow, framework)
             elif language == "typescript":
-                code = await self._generate_typescript_code(workflow, framework)
+                code = self._generate_typescript_code(workflow, framework)
             else:
                 return {"success": False, "error": f"Unsupported language: {language}"}
 
@@ -325,244 +719,159 @@ class VisualProgramming:
             logger.error(f"Error generating code: {e}")
             return {"success": False, "error": str(e)}
 
-    async def _generate_python_code(
+    def _generate_python_code(
         self,
         workflow: VisualWorkflow,
         framework: Optional[str]
     ) -> str:
         """Generate Python code from workflow"""
-        code_parts = []
-        
-        # Add imports
-        code_parts.append("# Generated by FRIDAY Visual Programming")
-        code_parts.append("# Workflow: " + workflow.name)
-        code_parts.append("")
-        code_parts.append("import asyncio")
-        code_parts.append("import logging")
-        code_parts.append("from typing import Dict, Any")
-        code_parts.append("")
+        function_name = workflow.name.lower().replace(" ", "_")
+        names = {
+            "name": workflow.name,
+            "function_name": function_name,
+            "description": workflow.description
+        }
         
+        buf = io.StringIO()
+        buf.write(_PY_HEADER.substitute(names))
         if framework == "fastapi":
-            code_parts.append("from fastapi import APIRouter, HTTPException")
-            code_parts.append("from pydantic import BaseModel")
-            code_parts.append("")
-            code_parts.append("router = APIRouter()")
-            code_parts.append("")
-
-        # Generate main function
-        function_name = workflow.name.lower().replace(" ", "_")
-        code_parts.append(f"async def {function_name}(data: Dict[str, Any]) -> Dict[str, Any]:")
-        code_parts.append('    """')
-        code_parts.append(f"    {workflow.description}")
-        code_parts.append('    """')
-        code_parts.append("    try:")
+            buf.write(_PY_FASTAPI_IMPORTS)
+        buf.write(_PY_FUNCTION_START.substitute(names))
         
         # Process nodes in execution order
-        execution_order = self._get_execution_order(workflow)
+        self._write_node_code(buf, workflow, "python", "        ", "\n\n")
         
-        for node in execution_order:
-            node_code = self._generate_node_code(node, "python")
-            code_parts.extend([f"        {line}" for line in node_code.split("\n")])
-            code_parts.append("")
-
-        code_parts.append("        return {'success': True, 'result': result}")
-        code_parts.append("    except Exception as e:")
-        code_parts.append("        logging.error(f'Error in workflow: {e}')")
-        code_parts.append("        return {'success': False, 'error': str(e)}")
-        code_parts.append("")
-
-        # Add FastAPI endpoint if using framework
+        # Every fragment ends in a newline; the output has no trailing one
         if framework == "fastapi":
-            code_parts.append("class WorkflowRequest(BaseModel):")
-            code_parts.append("    data: Dict[str, Any]")
-            code_parts.append("")
-            code_parts.append(f"@router.post('/{function_name}')")
-            code_parts.append(f"async def {function_name}_endpoint(request: WorkflowRequest):")
-            code_parts.append(f"    result = await {function_name}(request.data)")
-            code_parts.append("    if not result['success']:")
-            code_parts.append("        raise HTTPException(status_code=500, detail=result['error'])")
-            code_parts.append("    return result")
-
-        return "\n".join(code_parts)
-
-    async def _generate_javascript_code(
+            buf.write(_PY_FUNCTION_END)
+            buf.write(_PY_FASTAPI_ENDPOINT.substitute(names)[:-1])
+        else:
+            buf.write(_PY_FUNCTION_END[:-1])
+        
+        return buf.getvalue()
+
+    def _generate_javascript_code(
         self,
         workflow: VisualWorkflow,
         framework: Optional[str]
     ) -> str:
         """Generate JavaScript code from workflow"""
-        code_parts = []
-        
-        code_parts.append("// Generated by FRIDAY Visual Programming")
-        code_parts.append(f"// Workflow: {workflow.name}")
-        code_parts.append("")
+        function_name = workflow.name.replace(" ", "_").lower()
+        names = {
+            "name": workflow.name,
+            "function_name": function_name,
+            "description": workflow.description
+        }
         
+        buf = io.StringIO()
+        buf.write(_JS_HEADER.substitute(names))
         if framework == "express":
-            code_parts.append("const express = require('express');")
-            code_parts.append("const router = express.Router();")
-            code_parts.append("")
-
-        function_name = workflow.name.replace(" ", "_").lower()
-        code_parts.append(f"async function {function_name}(data) {{")
-        code_parts.append(f"  // {workflow.description}")
-        code_parts.append("  try {")
+            buf.write(_JS_EXPRESS_IMPORTS)
+        buf.write(_JS_FUNCTION_START.substitute(names))
         
-        execution_order = self._get_execution_order(workflow)
-        for node in execution_order:
-            node_code = self._generate_node_code(node, "javascript")
-            code_parts.extend([f"    {line}" for line in node_code.split("\n")])
+        self._write_node_code(buf, workflow, "javascript", "    ", "\n")
         
-        code_parts.append("    return { success: true, result };")
-        code_parts.append("  } catch (error) {")
-        code_parts.append("    console.error('Error in workflow:', error);")
-        code_parts.append("    return { success: false, error: error.message };")
-        code_parts.append("  }")
-        code_parts.append("}")
-        code_parts.append("")
-
         if framework == "express":
-            code_parts.append(f"router.post('/{function_name}', async (req, res) => {{")
-            code_parts.append(f"  const result = await {function_name}(req.body);")
-            code_parts.append("  if (!result.success) {")
-            code_parts.append("    return res.status(500).json(result);")
-            code_parts.append("  }")
-            code_parts.append("  res.json(result);")
-            code_parts.append("});")
-            code_parts.append("")
-            code_parts.append("module.exports = router;")
-
-        return "\n".join(code_parts)
-
-    async def _generate_typescript_code(
+            buf.write(_JS_FUNCTION_END)
+            buf.write(_JS_EXPRESS_ROUTE.substitute(names)[:-1])
+        else:
+            buf.write(_JS_FUNCTION_END[:-1])
+        
+        return buf.getvalue()
+
+    def _generate_typescript_code(
         self,
         workflow: VisualWorkflow,
         framework: Optional[str]
     ) -> str:
         """Generate TypeScript code from workflow"""
-        code_parts = []
-        
-        code_parts.append("// Generated by FRIDAY Visual Programming")
-        code_parts.append(f"// Workflow: {workflow.name}")
-        code_parts.append("")
-        code_parts.append("interface WorkflowData {")
-        code_parts.append("  [key: string]: any;")
-        code_parts.append("}")
-        code_parts.append("")
-        code_parts.append("interface WorkflowResult {")
-        code_parts.append("  success: boolean;")
-        code_parts.append("  result?: any;")
-        code_parts.append("  error?: string;")
-        code_parts.append("}")
-        code_parts.append("")
-
         function_name = workflow.name.replace(" ", "_").lower()
-        code_parts.append(f"async function {function_name}(data: WorkflowData): Promise<WorkflowResult> {{")
-        code_parts.append(f"  // {workflow.description}")
-        code_parts.append("  try {")
+        names = {
+            "name": workflow.name,
+            "function_name": function_name,
+            "description": workflow.description
+        }
+        
+        buf = io.StringIO()
+        buf.write(_TS_HEADER.substitute(names))
+        buf.write(_TS_FUNCTION_START.substitute(names))
         
-        execution_order = self._get_execution_order(workflow)
-        for node in execution_order:
-            node_code = self._generate_node_code(node, "typescript")
-            code_parts.extend([f"    {line}" for line in node_code.split("\n")])
+        self._write_node_code(buf, workflow, "typescript", "    ", "\n")
         
-        code_parts.append("    return { success: true, result };")
-        code_parts.append("  } catch (error) {")
-        code_parts.append("    console.error('Error in workflow:', error);")
-        code_parts.append("    return { success: false, error: (error as Error).message };")
-        code_parts.append("  }")
-        code_parts.append("}")
-        code_parts.append("")
-        code_parts.append(f"export {{ {function_name} }};")
+        buf.write(_TS_FUNCTION_END.substitute(names)[:-1])
+        
+        return buf.getvalue()
 
-        return "\n".join(code_parts)
+    def _write_node_code(
+        self,
+        buf: io.StringIO,
+        workflow: VisualWorkflow,
+        language: str,
+        indent: str,
+        terminator: str
+    ):
+        """Write each node's code, indented, in execution order"""
+        newline_indent = "\n" + indent
+        # Bound once; these are called for every node
+        write = buf.write
+        generate = self._generate_node_code
+        for node in self._get_execution_order(workflow):
+            write(indent)
+            write(generate(node, language).replace("\n", newline_indent))
+            write(terminator)
 
     def _generate_node_code(self, node: FlowNode, language: str) -> str:
         """Generate code for a single node"""
-        if language == "python":
-            return self._generate_python_node_code(node)
-        elif language in ["javascript", "typescript"]:
-            return self._generate_js_node_code(node, language)
-        return ""
-
-    def _generate_python_node_code(self, node: FlowNode) -> str:
-        """Generate Python code for a node"""
-        if node.type == NodeType.FUNCTION.value:
-            func_name = node.config.get("function", "process_data")
-            return f"result = await {func_name}(data)"
-        
-        elif node.type == NodeType.CONDITION.value:
-            condition = node.config.get("condition", "True")
-            return f"if {condition}:\n    # True branch\n    pass\nelse:\n    # False branch\n    pass"
-        
-        elif node.type == NodeType.LOOP.value:
-            iterator = node.config.get("iterator", "items")
-            return f"for item in {iterator}:\n    # Process item\n    pass"
-        
-        elif node.type == NodeType.API_CALL.value:
-            url = node.config.get("url", "https://api.example.com")
-            method = node.config.get("method", "GET")
-            return f"import aiohttp\nasync with aiohttp.ClientSession() as session:\n    async with session.{method.lower()}('{url}') as response:\n        result = await response.json()"
-        
-        elif node.type == NodeType.DATABASE.value:
-            query = node.config.get("query", "SELECT * FROM table")
-            return f"# Database query\nresult = await db.execute('{query}')"
-        
-        elif node.type == NodeType.VARIABLE.value:
-            var_name = node.config.get("name", "variable")
-            var_value = node.config.get("value", "None")
-            return f"{var_name} = {var_value}"
-        
-        elif node.type == NodeType.OUTPUT.value:
-            return "# Return result\nreturn result"
-        
-        return f"# {node.label}\npass"
-
-    def _generate_js_node_code(self, node: FlowNode, language: str) -> str:
-        """Generate JavaScript/TypeScript code for a node"""
-        if node.type == NodeType.FUNCTION.value:
-            func_name = node.config.get("function", "processData")
-            return f"const result = await {func_name}(data);"
-        
-        elif node.type == NodeType.CONDITION.value:
-            condition = node.config.get("condition", "true")
-            return f"if ({condition}) {{\n  // True branch\n}} else {{\n  // False branch\n}}"
-        
-        elif node.type == NodeType.API_CALL.value:
-            url = node.config.get("url", "https://api.example.com")
-            return f"const response = await fetch('{url}');\nconst result = await response.json();"
-        
-        elif node.type == NodeType.VARIABLE.value:
-            var_name = node.config.get("name", "variable")
-            var_value = node.config.get("value", "null")
-            const_or_let = "const" if language == "typescript" else "let"
-            return f"{const_or_let} {var_name} = {var_value};"
-        
-        return f"// {node.label}"
+        generator = (
+            _NODE_GENERATORS.get((language, node.type))
+            or _DEFAULT_NODE_GENERATORS.get(language)
+        )
+        return generator(node, language) if generator else ""
 
     def _get_execution_order(self, workflow: VisualWorkflow) -> List[FlowNode]:
         """Determine execution order of nodes using topological sort"""
-        # Build adjacency list
-        graph = {node.id: [] for node in workflow.nodes}
-        in_degree = {node.id: 0 for node in workflow.nodes}
+        # Edits bump updated_at; the sizes also catch edits within one clock tick
+        version = (workflow.updated_at, len(workflow.nodes), len(workflow.connections))
+        cached = workflow._execution_order_cache
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        
         node_map = {node.id: node for node in workflow.nodes}
         
-        for conn in workflow.connections:
-            graph[conn.source_node].append(conn.target_node)
-            in_degree[conn.target_node] += 1
+        # In-degrees from the incoming index, skipping connections left
+        # pointing at nodes that no longer exist
+        in_degree = {
+            node_id: sum(
+                1 for conn in workflow.incoming.get(node_id, ())
+                if conn.source_node in node_map
+            )
+            for node_id in node_map
+        }
         
         # Find start nodes (in_degree == 0)
-        queue = [node_id for node_id, degree in in_degree.items() if degree == 0]
+        queue = deque(node_id for node_id, degree in in_degree.items() if degree == 0)
         execution_order = []
         
+        # Bound once; these run for every node and edge
+        popleft = queue.popleft
+        enqueue = queue.append
+        add_to_order = execution_order.append
+        outgoing = workflow.outgoing.get
+        
         while queue:
-            current = queue.pop(0)
-            execution_order.append(node_map[current])
+            current = popleft()
+            add_to_order(node_map[current])
             
-            for neighbor in graph[current]:
-                in_degree[neighbor] -= 1
-                if in_degree[neighbor] == 0:
-                    queue.append(neighbor)
+            for conn in outgoing(current, ()):
+                neighbor = conn.target_node
+                degree = in_degree.get(neighbor)
+                if degree is None:
+                    continue
+                in_degree[neighbor] = degree - 1
+                if degree == 1:
+                    enqueue(neighbor)
         
+        workflow._execution_order_cache = (version, execution_order)
         return execution_order
 
     # ==================== Visual API Designer ====================
@@ -658,14 +967,14 @@ class VisualProgramming:
             
             columns = []
             for col in table["columns"]:
-                col_def = f"  {col['name']} {col['type']}"
+                parts = [f"  {col['name']}", col["type"]]
                 if col.get("not_null"):
-                    col_def += " NOT NULL"
+                    parts.append("NOT NULL")
                 if col.get("unique"):
-                    col_def += " UNIQUE"
-                if col.get("default"):
-                    col_def += f" DEFAULT {col['default']}"
-                columns.append(col_def)
+                    parts.append("UNIQUE")
+                if default := col.get("default"):
+                    parts.append(f"DEFAULT {default}")
+                columns.append(" ".join(parts))
             
             if table.get("primary_key"):
                 columns.append(f"  PRIMARY KEY ({table['primary_key']})")
@@ -681,13 +990,12 @@ class VisualProgramming:
     async def export_workflow(self, workflow_id: str, format: str = "json") -> Dict:
         """Export workflow to various formats"""
         try:
-            if workflow_id not in self.workflows:
+            workflow = self.workflows.get(workflow_id)
+            if workflow is None:
                 return {"success": False, "error": "Workflow not found"}
 
-            workflow = self.workflows[workflow_id]
-
             if format == "json":
-                exported = json.dumps(asdict(workflow), indent=2)
+                exported = _dumps(workflow.to_dict())
             elif format == "yaml":
                 # Would require PyYAML
                 exported = "# YAML export not implemented"
@@ -708,12 +1016,15 @@ class VisualProgramming:
         """Import workflow from file"""
         try:
             if format == "json":
-                data = json.loads(workflow_data)
+                data = _loads(workflow_data)
                 workflow_id = data["workflow_id"]
                 
                 # Reconstruct workflow objects
-                nodes = [FlowNode(**node) for node in data["nodes"]]
-                connections = [FlowConnection(**conn) for conn in data["connections"]]
+                nodes = [_restore(FlowNode, _FLOW_NODE_FIELDS, node) for node in data["nodes"]]
+                connections = [
+                    _restore(FlowConnection, _FLOW_CONNECTION_FIELDS, conn)
+                    for conn in data["connections"]
+                ]
                 
                 workflow = VisualWorkflow(
                     workflow_id=workflow_id,
@@ -722,11 +1033,14 @@ class VisualProgramming:
                     nodes=nodes,
                     connections=connections,
                     created_at=data["created_at"],
-                    updated_at=datetime.now().timestamp(),
-                    metadata=data.get("metadata", {})
+                    updated_at=time.time(),
+                    metadata=data.get("metadata", {}),
+                    _next_node_id=_next_id_number(node.id for node in nodes),
+                    _next_conn_id=_next_id_number(conn.id for conn in connections)
                 )
                 
                 self.workflows[workflow_id] = workflow
+                self._summary_dirty = True
 
                 return {
                     "success": True,
@@ -742,12 +1056,13 @@ class VisualProgramming:
     async def get_workflow(self, workflow_id: str) -> Dict:
         """Get workflow by ID"""
         try:
-            if workflow_id not in self.workflows:
+            workflow = self.workflows.get(workflow_id)
+            if workflow is None:
                 return {"success": False, "error": "Workflow not found"}
 
             return {
                 "success": True,
-                "workflow": asdict(self.workflows[workflow_id])
+                "workflow": workflow.to_dict()
             }
 
         except Exception as e:
@@ -757,16 +1072,19 @@ class VisualProgramming:
     async def list_workflows(self) -> Dict:
         """List all workflows"""
         try:
-            workflows = [
-                {
-                    "workflow_id": wf.workflow_id,
-                    "name": wf.name,
-                    "description": wf.description,
-                    "nodes_count": len(wf.nodes),
-                    "updated_at": wf.updated_at
-                }
-                for wf in self.workflows.values()
-            ]
+            if self._summary_dirty:
+                self._summary_cache = [
+                    {
+                        "workflow_id": wf.workflow_id,
+                        "name": wf.name,
+                        "description": wf.description,
+                        "nodes_count": len(wf.nodes),
+                        "updated_at": wf.updated_at
+                    }
+                    for wf in self.workflows.values()
+                ]
+                self._summary_dirty = False
+            workflows = self._summary_cache
 
             return {
                 "success": True,
@@ -3,34 +3,136 @@ Voice Recognition Module for Friday Agent
 Handles speech-to-text conversion using multiple engines
 """
 import speech_recognition as sr
+import json
+import os
 import threading
+import time
 import queue
+from collections import deque
 from typing import Callable, Optional
 import logging
 
+from modules.stt_cache import TranscriptCache, fingerprint
+from modules.stt_engine import (
+    SAMPLE_RATE, SAMPLE_WIDTH, WAKEWORD_MODEL_PATH, OnnxTranscriber, WakeWordDetector
+)
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+try:
+    import webrtcvad
+    VAD_AVAILABLE = True
+except ImportError:
+    VAD_AVAILABLE = False
+
+# "google" uses the cloud recognizer, "onnx" the on-device model
+STT_ENGINE = os.getenv('STT_ENGINE', 'google')
+
+# Voice activity detection works on short fixed-size frames
+VAD_FRAME_MS = 20
+VAD_FRAME_SAMPLES = SAMPLE_RATE * VAD_FRAME_MS // 1000
+VAD_AGGRESSIVENESS = 3
+ENDPOINT_FRAMES = 500 // VAD_FRAME_MS  # trailing silence that ends an utterance
+PRE_ROLL_FRAMES = 300 // VAD_FRAME_MS  # audio kept from just before speech starts
+PARTIAL_FRAMES = 300 // VAD_FRAME_MS  # interval between partial transcripts
+
+# Ambient noise calibration is saved and reused on warm starts for a day
+ENERGY_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "friday", "energy.json")
+ENERGY_CACHE_TTL = 24 * 60 * 60
+
 
 class VoiceRecognizer:
-    def __init__(self, callback: Optional[Callable] = None):
+    # Calibrated energy threshold shared by every instance in the process
+    _energy_threshold: Optional[float] = None
+
+    def __init__(
+        self,
+        callback: Optional[Callable] = None,
+        engine: str = STT_ENGINE,
+        partial_callback: Optional[Callable] = None
+    ):
         self.recognizer = sr.Recognizer()
-        self.microphone = sr.Microphone()
         self.listening = False
         self.callback = callback
-        self.command_queue = queue.Queue()
+        self.partial_callback = partial_callback
+        self.command_queue = queue.SimpleQueue()
+        # Callbacks run on their own thread so slow handlers never stall listening
+        self._dispatch_queue = queue.SimpleQueue()
+
+        # Repeated commands skip the round trip to Google
+        self.transcript_cache = TranscriptCache()
+
+        # Keyword model for passive mode; without it every passive phrase
+        # is transcribed and searched for "friday"
+        self.wake_word = None
+        if os.path.exists(WAKEWORD_MODEL_PATH):
+            try:
+                self.wake_word = WakeWordDetector()
+            except Exception as e:
+                logger.warning("Wake word model unavailable: %s", e)
+
+        # Stream 16 kHz frames through the VAD when available; otherwise
+        # fall back to speech_recognition's phrase buffering
+        self.vad = webrtcvad.Vad(VAD_AGGRESSIVENESS) if VAD_AVAILABLE else None
+        if self.vad or self.wake_word:
+            self.microphone = sr.Microphone(sample_rate=SAMPLE_RATE, chunk_size=VAD_FRAME_SAMPLES)
+        else:
+            self.microphone = sr.Microphone()
+
+        # On-device recognition, falling back to Google if the model can't load
+        self.engine = "google"
+        self.transcriber = None
+        if engine == "onnx":
+            try:
+                self.transcriber = OnnxTranscriber()
+                self.engine = "onnx"
+            except Exception as e:
+                logger.warning("On-device speech model unavailable, using Google: %s", e)
         
-        # Adjust for ambient noise
+        self._calibrate()
+
+    def _calibrate(self):
+        """Adjust for ambient noise, reusing an earlier calibration when there is one"""
+        threshold = VoiceRecognizer._energy_threshold or self._load_energy_threshold()
+        if threshold:
+            self.recognizer.energy_threshold = threshold
+            VoiceRecognizer._energy_threshold = threshold
+            return
+
         with self.microphone as source:
             logger.info("Calibrating for ambient noise...")
             self.recognizer.adjust_for_ambient_noise(source, duration=1)
             logger.info("Calibration complete")
+
+        VoiceRecognizer._energy_threshold = self.recognizer.energy_threshold
+        try:
+            os.makedirs(os.path.dirname(ENERGY_CACHE_PATH), exist_ok=True)
+            with open(ENERGY_CACHE_PATH, "w") as f:
+                json.dump({"energy_threshold": self.recognizer.energy_threshold,
+                           "measured_at": time.time()}, f)
+        except OSError as e:
+            logger.debug("Could not save noise calibration: %s", e)
+
+    @staticmethod
+    def _load_energy_threshold() -> Optional[float]:
+        """Energy threshold saved by a recent calibration, if any"""
+        try:
+            with open(ENERGY_CACHE_PATH) as f:
+                saved = json.load(f)
+            if time.time() - saved["measured_at"] < ENERGY_CACHE_TTL:
+                return float(saved["energy_threshold"])
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        return None
     
     def start_listening(self):
         """Start continuous listening in a separate thread"""
         if not self.listening:
             self.listening = True
             threading.Thread(target=self._listen_loop, daemon=True).start()
+            if self.callback:
+                threading.Thread(target=self._dispatch_loop, daemon=True).start()
             logger.info("Voice recognition started")
     
     def stop_listening(self):
@@ -38,10 +140,100 @@ class VoiceRecognizer:
         self.listening = False
         logger.info("Voice recognition stopped")
     
+    def _notify(self, message: str):
+        """Queue a message for the callback thread"""
+        if self.callback:
+            self._dispatch_queue.put(message)
+
+    def _emit_command(self, command: str):
+        """Publish a recognized command to the queue and the callback"""
+        self.command_queue.put(command)
+        self._notify(command)
+
+    def _dispatch_loop(self):
+        """Deliver queued messages to the callback until listening stops and the queue drains"""
+        while self.listening or not self._dispatch_queue.empty():
+            try:
+                message = self._dispatch_queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            try:
+                self.callback(message)
+            except Exception as e:
+                logger.error("Voice callback failed: %s", e)
+
+    def _transcribe(self, audio: sr.AudioData) -> str:
+        """Convert captured audio to text with the configured engine"""
+        pcm = audio.get_raw_data(convert_rate=SAMPLE_RATE, convert_width=SAMPLE_WIDTH)
+
+        if self.transcriber is None:
+            key = fingerprint(pcm)
+            text = self.transcript_cache.get(key)
+            if text is None:
+                text = self.recognizer.recognize_google(audio)
+                self.transcript_cache.set(key, text)
+            return text
+
+        text = self.transcriber.transcribe(pcm)
+        if not text:
+            raise sr.UnknownValueError()
+        return text
+
+    def _listen(self, source, timeout: float, phrase_time_limit: float, partial: bool = False) -> sr.AudioData:
+        """Capture one utterance from the microphone"""
+        if self.vad is None:
+            return self.recognizer.listen(source, timeout=timeout, phrase_time_limit=phrase_time_limit)
+        return self._listen_vad(source, timeout, phrase_time_limit, partial)
+
+    def _listen_vad(self, source, timeout: float, phrase_time_limit: float, partial: bool) -> sr.AudioData:
+        """Stream frames through the VAD, ending the utterance after trailing silence"""
+        max_wait_frames = int(timeout * 1000) // VAD_FRAME_MS
+        max_phrase_frames = int(phrase_time_limit * 1000) // VAD_FRAME_MS
+        emit_partials = partial and self.partial_callback and self.transcriber
+
+        pre_roll = deque(maxlen=PRE_ROLL_FRAMES)
+        frames = []
+        waited = 0
+        silent = 0
+        last_partial = 0
+
+        # Bounded by the wait timeout and phrase limit, like recognizer.listen
+        while True:
+            frame = source.stream.read(source.CHUNK)
+            is_speech = self.vad.is_speech(frame, source.SAMPLE_RATE)
+
+            if not frames:
+                # Waiting for speech to start
+                if not is_speech:
+                    pre_roll.append(frame)
+                    waited += 1
+                    if waited >= max_wait_frames:
+                        raise sr.WaitTimeoutError("listening timed out while waiting for phrase to start")
+                    continue
+                frames.extend(pre_roll)
+
+            frames.append(frame)
+            silent = 0 if is_speech else silent + 1
+            if silent >= ENDPOINT_FRAMES or len(frames) >= max_phrase_frames:
+                break
+
+            if emit_partials and len(frames) - last_partial >= PARTIAL_FRAMES:
+                last_partial = len(frames)
+                text = self.transcriber.transcribe(b"".join(frames))
+                if text:
+                    self.partial_callback(text)
+
+        return sr.AudioData(b"".join(frames), source.SAMPLE_RATE, source.SAMPLE_WIDTH)
+
+    def _wait_for_wake_word(self, source, timeout: float) -> bool:
+        """Run the keyword model over incoming frames for up to timeout seconds"""
+        for _ in range(int(timeout * 1000) // VAD_FRAME_MS):
+            if self.wake_word.process(source.stream.read(source.CHUNK)):
+                return True
+        return False
+
     def _listen_loop(self):
         """Main listening loop with Wake Word detection"""
-        import time
-        
         self.active_mode = False
         self.last_active_time = 0
         self.active_duration = 5  # seconds
@@ -57,23 +249,32 @@ class VoiceRecognizer:
                         else:
                             self.active_mode = False
                             logger.info("Wake word timeout: Entering passive mode")
-                            if self.callback:
-                                self.callback("system_notification:exiting_active_mode")
+                            self._notify("system_notification:exiting_active_mode")
 
-                    logger.info(f"Listening ({'ACTIVE' if is_active else 'PASSIVE'})...")
+                    # Logged every pass, so only at debug level
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("Listening (%s)...", "ACTIVE" if is_active else "PASSIVE")
                     
                     # Adjust timeout based on mode
                     listen_timeout = 5 if is_active else 2  # Short listen for wake word checks
                     
+                    if not is_active and self.wake_word:
+                        # Passive mode only transcribes once the keyword model fires
+                        if self._wait_for_wake_word(source, listen_timeout):
+                            logger.info("Wake word detected!")
+                            self.active_mode = True
+                            self.last_active_time = time.time()
+                            self._notify("system_notification:wake_word_detected")
+                        continue
+
                     try:
-                        audio = self.recognizer.listen(source, timeout=listen_timeout, phrase_time_limit=10)
+                        audio = self._listen(source, listen_timeout, 10, partial=is_active)
                     except sr.WaitTimeoutError:
                         continue
 
                     try:
-                        # Use Google Speech Recognition
-                        text = self.recognizer.recognize_google(audio).lower()
-                        logger.info(f"Recognized: {text}")
+                        text = self._transcribe(audio).lower()
+                        logger.info("Recognized: %s", text)
                         
                         # Check for Wake Word "Friday"
                         if "friday" in text:
@@ -85,35 +286,29 @@ class VoiceRecognizer:
                             command = text.replace("friday", "").strip()
                             
                             if command:
-                                logger.info(f"Command with wake word: {command}")
-                                if self.callback:
-                                    self.callback(command)
-                                self.command_queue.put(command)
+                                logger.info("Command with wake word: %s", command)
+                                self._emit_command(command)
                             else:
                                 logger.info("Wake word only - waiting for command")
-                                if self.callback:
-                                    self.callback("system_notification:wake_word_detected")
+                                self._notify("system_notification:wake_word_detected")
                                     
                         elif self.active_mode:
                             # Already in active mode, process as command
-                            logger.info(f"Active mode command: {text}")
+                            logger.info("Active mode command: %s", text)
                             # Refresh timer? Optionally yes. Let's reset it to allow conversation flow.
                             self.last_active_time = time.time() 
                             
-                            if self.callback:
-                                self.callback(text)
-                            self.command_queue.put(text)
+                            self._emit_command(text)
                         
                     except sr.UnknownValueError:
                         # Only log warning if in active mode to avoid spamming "Could not understand" in passive
                         if self.active_mode:
                             logger.warning("Could not understand audio in active mode")
                     except sr.RequestError as e:
-                        logger.error(f"Could not request results; {e}")
+                        logger.error("Could not request results; %s", e)
                         
                 except Exception as e:
-                    logger.error(f"Error in listen loop: {e}")
-                    import time
+                    logger.error("Error in listen loop: %s", e)
                     time.sleep(1)  # Prevent tight loop on error
     
     def get_command(self, timeout: Optional[float] = None) -> Optional[str]:
@@ -128,10 +323,10 @@ class VoiceRecognizer:
         with self.microphone as source:
             try:
                 logger.info("Listening for single command...")
-                audio = self.recognizer.listen(source, timeout=5, phrase_time_limit=10)
-                text = self.recognizer.recognize_google(audio)
-                logger.info(f"Recognized: {text}")
+                audio = self._listen(source, 5, 10)
+                text = self._transcribe(audio)
+                logger.info("Recognized: %s", text)
                 return text
             except Exception as e:
-                logger.error(f"Recognition error: {e}")
+                logger.error("Recognition error: %s", e)
                 return None
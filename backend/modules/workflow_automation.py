@@ -5,9 +5,37 @@ Create custom automation rules with natural language
 from typing import Dict, List, Optional, Any, Callable
 from datetime import datetime, timedelta
 from enum import Enum
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, field
+from collections import defaultdict, deque
+from functools import partial
+import asyncio
+import heapq
+import itertools
+import logging
 import re
 import json
+import time
+
+
+logger = logging.getLogger(__name__)
+
+_HOURS_RE = re.compile(r'(\d+)\s*hour')
+
+# Longest the scheduler sleeps before checking for new tasks
+SCHEDULER_IDLE_SLEEP = 60
+
+# Ids are a per-process prefix plus a counter, so concurrent calls never collide
+_ID_PREFIX = f"{time.time_ns():x}"
+_id_counter = itertools.count()
+
+
+def _next_id(kind: str) -> str:
+    """Allocate a unique id such as workflow_<prefix>_<n>"""
+    return f"{kind}_{_ID_PREFIX}_{next(_id_counter)}"
+
+# Execution records kept overall and per workflow
+EXECUTION_HISTORY_LIMIT = 10000
+WORKFLOW_HISTORY_LIMIT = 1000
 
 
 class TriggerType(Enum):
@@ -32,6 +60,11 @@ class ActionType(Enum):
     CALL_API = "call_api"
 
 
+# The parser emits enum values, so members are looked up by value
+_TRIGGER_BY_NAME = {trigger.value: trigger for trigger in TriggerType}
+_ACTION_BY_NAME = {action.value: action for action in ActionType}
+
+
 @dataclass
 class WorkflowTrigger:
     """Workflow trigger"""
@@ -62,28 +95,61 @@ class Workflow:
     created_at: str = ""
     last_run: Optional[str] = None
     run_count: int = 0
+    # Serialized form, cleared whenever the engine changes the workflow
+    _cached_dict: Optional[Dict] = field(default=None, init=False, repr=False, compare=False)
     
     def __post_init__(self):
         if not self.created_at:
             self.created_at = datetime.now().isoformat()
+    
+    def to_dict(self) -> Dict:
+        """JSON-ready dict of the workflow, built once until it changes"""
+        if self._cached_dict is None:
+            self._cached_dict = {
+                'id': self.id,
+                'name': self.name,
+                'description': self.description,
+                'triggers': [
+                    {'id': t.id, 'type': t.type.value, 'condition': t.condition,
+                     'parameters': dict(t.parameters)}
+                    for t in self.triggers
+                ],
+                'actions': [
+                    {'id': a.id, 'type': a.type.value, 'description': a.description,
+                     'parameters': dict(a.parameters)}
+                    for a in self.actions
+                ],
+                'enabled': self.enabled,
+                'created_at': self.created_at,
+                'last_run': self.last_run,
+                'run_count': self.run_count
+            }
+        return self._cached_dict
 
 
 class NaturalLanguageParser:
     """Parse natural language into workflow rules"""
     
     def __init__(self):
+        # Compiled once; every parse runs all of them
         self.trigger_patterns = {
-            'time': r'(?:every|at)\s+(\d+)\s*(minute|hour|day|week)',
-            'file_change': r'when\s+(?:file|files?)\s+(?:in\s+)?(.+?)\s+(?:change|update)',
-            'git': r'when\s+(?:commit|push|pull request|merge)',
-            'condition': r'if\s+(.+?)\s+then',
+            name: re.compile(pattern, re.IGNORECASE)
+            for name, pattern in {
+                'time': r'(?:every|at)\s+(\d+)\s*(minute|hour|day|week)',
+                'file_change': r'when\s+(?:file|files?)\s+(?:in\s+)?(.+?)\s+(?:change|update)',
+                'git': r'when\s+(?:commit|push|pull request|merge)',
+                'condition': r'if\s+(.+?)\s+then',
+            }.items()
         }
         
         self.action_patterns = {
-            'run_command': r'run\s+(?:command\s+)?["\'](.+?)["\']',
-            'notify': r'send\s+(?:notification|alert|email)',
-            'test': r'run\s+tests?',
-            'deploy': r'deploy\s+(?:to\s+)?(.+)',
+            name: re.compile(pattern, re.IGNORECASE)
+            for name, pattern in {
+                'run_command': r'run\s+(?:command\s+)?["\'](.+?)["\']',
+                'notify': r'send\s+(?:notification|alert|email)',
+                'test': r'run\s+tests?',
+                'deploy': r'deploy\s+(?:to\s+)?(.+)',
+            }.items()
         }
     
     def parse(self, natural_language: str) -> Dict:
@@ -102,7 +168,7 @@ class NaturalLanguageParser:
         triggers = []
         
         # Time-based triggers
-        time_match = re.search(self.trigger_patterns['time'], text, re.IGNORECASE)
+        time_match = self.trigger_patterns['time'].search(text)
         if time_match:
             interval, unit = time_match.groups()
             triggers.append({
@@ -113,7 +179,7 @@ class NaturalLanguageParser:
             })
         
         # File change triggers
-        file_match = re.search(self.trigger_patterns['file_change'], text, re.IGNORECASE)
+        file_match = self.trigger_patterns['file_change'].search(text)
         if file_match:
             path = file_match.group(1).strip()
             triggers.append({
@@ -123,7 +189,7 @@ class NaturalLanguageParser:
             })
         
         # Git triggers
-        if re.search(self.trigger_patterns['git'], text, re.IGNORECASE):
+        if self.trigger_patterns['git'].search(text):
             triggers.append({
                 'type': 'git_event',
                 'event': 'commit',
@@ -131,7 +197,7 @@ class NaturalLanguageParser:
             })
         
         # Conditional triggers
-        cond_match = re.search(self.trigger_patterns['condition'], text, re.IGNORECASE)
+        cond_match = self.trigger_patterns['condition'].search(text)
         if cond_match:
             condition = cond_match.group(1).strip()
             triggers.append({
@@ -146,7 +212,7 @@ class NaturalLanguageParser:
         actions = []
         
         # Run command actions
-        cmd_match = re.search(self.action_patterns['run_command'], text, re.IGNORECASE)
+        cmd_match = self.action_patterns['run_command'].search(text)
         if cmd_match:
             command = cmd_match.group(1)
             actions.append({
@@ -156,27 +222,29 @@ class NaturalLanguageParser:
             })
         
         # Notification actions
-        if re.search(self.action_patterns['notify'], text, re.IGNORECASE):
+        if self.action_patterns['notify'].search(text):
             actions.append({
                 'type': 'send_notification',
                 'description': "Send notification"
             })
         
         # Test actions
-        if re.search(self.action_patterns['test'], text, re.IGNORECASE):
+        if self.action_patterns['test'].search(text):
             actions.append({
                 'type': 'run_tests',
                 'description': "Run tests"
             })
         
         # Deploy actions
-        deploy_match = re.search(self.action_patterns['deploy'], text, re.IGNORECASE)
+        deploy_match = self.action_patterns['deploy'].search(text)
         if deploy_match:
             environment = deploy_match.group(1) if deploy_match.lastindex >= 1 else 'production'
             actions.append({
                 'type': 'deploy',
                 'environment': environment,
-                'description': f"Deploy to {environment}"
+                'description': f"Deploy to {environment}",
+                # Deploy only once everything before it has finished
+                'depends_on': [f"action_{i}" for i in range(len(actions))]
             })
         
         return actions
@@ -186,7 +254,8 @@ class WorkflowExecutor:
     """Execute workflow actions"""
     
     def __init__(self):
-        self.execution_history = []
+        self.execution_history = deque(maxlen=EXECUTION_HISTORY_LIMIT)
+        self._by_workflow = defaultdict(partial(deque, maxlen=WORKFLOW_HISTORY_LIMIT))
         self.action_handlers = {
             ActionType.RUN_COMMAND: self._run_command,
             ActionType.SEND_NOTIFICATION: self._send_notification,
@@ -199,26 +268,18 @@ class WorkflowExecutor:
         if context is None:
             context = {}
         
-        execution_id = f"exec_{datetime.now().timestamp()}"
-        results = []
-        
-        for action in workflow.actions:
-            handler = self.action_handlers.get(action.type)
-            
-            if handler:
-                try:
-                    result = await handler(action, context)
-                    results.append({
-                        'action': action.description,
-                        'status': 'success',
-                        'result': result
-                    })
-                except Exception as e:
-                    results.append({
-                        'action': action.description,
-                        'status': 'failed',
-                        'error': str(e)
-                    })
+        execution_id = _next_id("exec")
+        runnable = [action for action in workflow.actions if action.type in self.action_handlers]
+        outcomes = {}
+        
+        # Independent actions run together; depends_on orders the rest
+        for layer in self._action_layers(runnable):
+            layer_results = await asyncio.gather(
+                *(self._run_action(action, context) for action in layer)
+            )
+            outcomes.update(zip((action.id for action in layer), layer_results))
+        
+        results = [outcomes[action.id] for action in runnable]
         
         execution_record = {
             'execution_id': execution_id,
@@ -229,9 +290,51 @@ class WorkflowExecutor:
         }
         
         self.execution_history.append(execution_record)
+        self._by_workflow[workflow.id].append(execution_record)
         
         return execution_record
     
+    async def _run_action(self, action: WorkflowAction, context: Dict) -> Dict:
+        """Run one action, capturing its result or error"""
+        try:
+            result = await self.action_handlers[action.type](action, context)
+            return {
+                'action': action.description,
+                'status': 'success',
+                'result': result
+            }
+        except Exception as e:
+            return {
+                'action': action.description,
+                'status': 'failed',
+                'error': str(e)
+            }
+    
+    @staticmethod
+    def _action_layers(actions: List[WorkflowAction]) -> List[List[WorkflowAction]]:
+        """Group actions so each layer only depends on earlier layers"""
+        action_ids = {action.id for action in actions}
+        finished = set()
+        pending = actions
+        layers = []
+        
+        while pending:
+            layer = [
+                action for action in pending
+                if all(
+                    dep in finished or dep not in action_ids
+                    for dep in action.parameters.get('depends_on', ())
+                )
+            ]
+            if not layer:
+                # Circular dependencies: run what's left together
+                layer = pending
+            layers.append(layer)
+            finished.update(action.id for action in layer)
+            pending = [action for action in pending if action.id not in finished]
+        
+        return layers
+    
     async def _run_command(self, action: WorkflowAction, context: Dict) -> Dict:
         """Run a command"""
         command = action.parameters.get('command', '')
@@ -280,11 +383,14 @@ class ScheduledTaskManager:
     """Manage scheduled tasks"""
     
     def __init__(self):
+        # Min-heap of (next_run timestamp, task id, task), plus tasks by id
         self.scheduled_tasks = []
+        self.tasks: Dict[str, Dict] = {}
+        self._running = set()
     
     def schedule_task(self, name: str, schedule: str, action: Callable) -> str:
         """Schedule a recurring task"""
-        task_id = f"task_{datetime.now().timestamp()}"
+        task_id = _next_id("task")
         
         task = {
             'id': task_id,
@@ -295,17 +401,63 @@ class ScheduledTaskManager:
             'enabled': True
         }
         
-        self.scheduled_tasks.append(task)
+        self.tasks[task_id] = task
+        heapq.heappush(self.scheduled_tasks, (task['next_run'].timestamp(), task_id, task))
         
         return task_id
     
+    def enable_task(self, task_id: str):
+        """Enable a scheduled task"""
+        if task_id in self.tasks:
+            self.tasks[task_id]['enabled'] = True
+    
+    def disable_task(self, task_id: str):
+        """Disable a scheduled task"""
+        if task_id in self.tasks:
+            self.tasks[task_id]['enabled'] = False
+    
+    def run_pending(self, now: Optional[float] = None) -> float:
+        """Start every due task and return seconds until the next one"""
+        now = time.time() if now is None else now
+        heap = self.scheduled_tasks
+        
+        # Pop everything due before rescheduling, so each task runs once per call
+        due = []
+        while heap and heap[0][0] <= now:
+            due.append(heapq.heappop(heap))
+        
+        for _, task_id, task in due:
+            if task['enabled']:
+                self._start(task)
+            task['next_run'] = self._calculate_next_run(task['schedule'])
+            heapq.heappush(heap, (task['next_run'].timestamp(), task_id, task))
+        
+        return heap[0][0] - now if heap else SCHEDULER_IDLE_SLEEP
+    
+    async def run_due(self):
+        """Run scheduled tasks forever, sleeping until the next one is due"""
+        while True:
+            delay = self.run_pending()
+            await asyncio.sleep(min(max(delay, 0), SCHEDULER_IDLE_SLEEP))
+    
+    def _start(self, task: Dict):
+        """Call a task's action, scheduling it if it is a coroutine"""
+        try:
+            result = task['action']()
+            if asyncio.iscoroutine(result):
+                running = asyncio.ensure_future(result)
+                self._running.add(running)
+                running.add_done_callback(self._running.discard)
+        except Exception as e:
+            logger.error(f"Scheduled task {task['name']} failed: {e}")
+    
     def _calculate_next_run(self, schedule: str) -> datetime:
         """Calculate next run time"""
         # Parse schedule (e.g., "every 1 hour", "daily at 9:00")
         now = datetime.now()
         
         if 'hour' in schedule:
-            match = re.search(r'(\d+)\s*hour', schedule)
+            match = _HOURS_RE.search(schedule)
             if match:
                 hours = int(match.group(1))
                 return now + timedelta(hours=hours)
@@ -328,7 +480,7 @@ class ScheduledTaskManager:
                 'next_run': task['next_run'].isoformat(),
                 'enabled': task['enabled']
             }
-            for task in self.scheduled_tasks
+            for task in self.tasks.values()
         ]
 
 
@@ -345,12 +497,12 @@ class WorkflowAutomationEngine:
         """Create workflow from natural language description"""
         parsed = self.parser.parse(description)
         
-        workflow_id = f"workflow_{datetime.now().timestamp()}"
+        workflow_id = _next_id("workflow")
         
         triggers = [
             WorkflowTrigger(
                 id=f"trigger_{i}",
-                type=TriggerType[t['type'].upper()],
+                type=_TRIGGER_BY_NAME[t['type']],
                 condition=t.get('condition', ''),
                 parameters=t
             )
@@ -360,7 +512,7 @@ class WorkflowAutomationEngine:
         actions = [
             WorkflowAction(
                 id=f"action_{i}",
-                type=ActionType[a['type'].upper()],
+                type=_ACTION_BY_NAME[a['type']],
                 description=a.get('description', ''),
                 parameters=a
             )
@@ -381,7 +533,7 @@ class WorkflowAutomationEngine:
     
     def create_workflow(self, workflow_config: Dict) -> Workflow:
         """Create workflow from configuration"""
-        workflow_id = f"workflow_{datetime.now().timestamp()}"
+        workflow_id = _next_id("workflow")
         
         workflow = Workflow(
             id=workflow_id,
@@ -408,8 +560,9 @@ class WorkflowAutomationEngine:
         result = await self.executor.execute_workflow(workflow, context)
         
         # Update workflow stats
-        workflow.last_run = datetime.now().isoformat()
+        workflow.last_run = result['executed_at']
         workflow.run_count += 1
+        workflow._cached_dict = None
         
         return result
     
@@ -419,17 +572,19 @@ class WorkflowAutomationEngine:
     
     def list_workflows(self) -> List[Dict]:
         """List all workflows"""
-        return [asdict(w) for w in self.workflows.values()]
+        return [w.to_dict() for w in self.workflows.values()]
     
     def enable_workflow(self, workflow_id: str):
         """Enable a workflow"""
         if workflow_id in self.workflows:
             self.workflows[workflow_id].enabled = True
+            self.workflows[workflow_id]._cached_dict = None
     
     def disable_workflow(self, workflow_id: str):
         """Disable a workflow"""
         if workflow_id in self.workflows:
             self.workflows[workflow_id].enabled = False
+            self.workflows[workflow_id]._cached_dict = None
     
     def delete_workflow(self, workflow_id: str) -> bool:
         """Delete a workflow"""
@@ -441,6 +596,5 @@ class WorkflowAutomationEngine:
     def get_execution_history(self, workflow_id: Optional[str] = None) -> List[Dict]:
         """Get execution history"""
         if workflow_id:
-            return [h for h in self.executor.execution_history 
-                   if h['workflow_id'] == workflow_id]
-        return self.executor.execution_history
+            return list(self.executor._by_workflow.get(workflow_id, ()))
+        return list(self.executor.execution_history)
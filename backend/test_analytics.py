@@ -1,13 +1,19 @@
 """
 Test script to generate sample analytics data
 """
-import requests
-import random
-import time
-from datetime import datetime
+import asyncio
+
+import httpx
+import numpy as np
 
 BASE_URL = "http://localhost:8000"
 
+# Requests in flight at once
+MAX_CONCURRENCY = 20
+
+# Fixed seed so repeated runs send the same data
+SEED = 42
+
 # Sample endpoints to test
 endpoints = [
     "/api/status",
@@ -20,62 +26,96 @@ endpoints = [
 methods = ["GET", "POST", "PUT", "DELETE"]
 actions = ["login", "logout", "create_project", "delete_project", "update_settings", "view_dashboard"]
 
-print("Generating sample analytics data...")
-
-# Generate API call logs
-for i in range(50):
-    endpoint = random.choice(endpoints)
-    method = random.choice(methods)
-    status_code = random.choice([200, 200, 200, 201, 400, 404, 500])
-    response_time = random.uniform(10, 500)
-
-    data = {
-        "endpoint": endpoint,
-        "method": method,
-        "status_code": status_code,
-        "response_time": response_time,
-        "user_id": random.randint(1, 10),
-        "request_size": random.randint(100, 5000),
-        "response_size": random.randint(500, 10000)
-    }
-
-    try:
-        response = requests.post(f"{BASE_URL}/api/analytics/log-api-call", json=data)
-        print(f"Logged API call: {endpoint} - Status: {status_code}")
-    except Exception as e:
-        print(f"Error logging API call: {e}")
-
-    time.sleep(0.1)
-
-# Generate user activity logs
-for i in range(30):
-    action = random.choice(actions)
-    user_id = random.randint(1, 10)
-
-    data = {
-        "user_id": user_id,
-        "action": action,
-        "details": f"User {user_id} performed {action}"
-    }
-
-    try:
-        response = requests.post(f"{BASE_URL}/api/analytics/log-activity", json=data)
-        print(f"Logged activity: {action} by user {user_id}")
-    except Exception as e:
-        print(f"Error logging activity: {e}")
-
-    time.sleep(0.1)
-
-print("\nSample data generation complete!")
-print("Now fetching analytics...")
-
-# Fetch and display analytics
-try:
-    response = requests.get(f"{BASE_URL}/api/analytics/complete?hours=24")
-    analytics = response.json()
-    print("\nAnalytics Summary:")
-    print(f"Total API Calls: {analytics['api_calls']['total_calls']}")
-    print(f"Total Activities: {analytics['user_activity']['total_activities']}")
-    print(f"Total Errors: {analytics['errors']['total_errors']}")
-except Exception as e:
-    print(f"Error fetching analytics: {e}")
+
+def build_api_calls(count: int, rng: np.random.Generator) -> list:
+    """Sample API call logs"""
+    columns = zip(
+        rng.choice(endpoints, size=count).tolist(),
+        rng.choice(methods, size=count).tolist(),
+        rng.choice([200, 200, 200, 201, 400, 404, 500], size=count).tolist(),
+        rng.uniform(10, 500, size=count).tolist(),
+        rng.integers(1, 11, size=count).tolist(),
+        rng.integers(100, 5001, size=count).tolist(),
+        rng.integers(500, 10001, size=count).tolist(),
+    )
+    return [
+        {
+            "endpoint": endpoint,
+            "method": method,
+            "status_code": status_code,
+            "response_time": response_time,
+            "user_id": user_id,
+            "request_size": request_size,
+            "response_size": response_size
+        }
+        for endpoint, method, status_code, response_time, user_id, request_size, response_size in columns
+    ]
+
+
+def build_activities(count: int, rng: np.random.Generator) -> list:
+    """Sample user activity logs"""
+    return [
+        {
+            "user_id": user_id,
+            "action": action,
+            "details": f"User {user_id} performed {action}"
+        }
+        for action, user_id in zip(
+            rng.choice(actions, size=count).tolist(),
+            rng.integers(1, 11, size=count).tolist()
+        )
+    ]
+
+
+async def post_all(client: httpx.AsyncClient, path: str, payloads: list, describe) -> None:
+    """POST every payload concurrently, at most MAX_CONCURRENCY at a time"""
+    semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
+
+    async def post(data):
+        async with semaphore:
+            try:
+                await client.post(path, json=data)
+                print(describe(data))
+            except Exception as e:
+                print(f"Error posting to {path}: {e}")
+
+    await asyncio.gather(*(post(data) for data in payloads))
+
+
+async def main():
+    print("Generating sample analytics data...")
+    rng = np.random.default_rng(SEED)
+    api_calls = build_api_calls(50, rng)
+    activities = build_activities(30, rng)
+
+    # One pooled client keeps connections alive across all requests
+    async with httpx.AsyncClient(base_url=BASE_URL) as client:
+        # Generate API call logs
+        await post_all(
+            client, "/api/analytics/log-api-call", api_calls,
+            lambda d: f"Logged API call: {d['endpoint']} - Status: {d['status_code']}"
+        )
+
+        # Generate user activity logs
+        await post_all(
+            client, "/api/analytics/log-activity", activities,
+            lambda d: f"Logged activity: {d['action']} by user {d['user_id']}"
+        )
+
+        print("\nSample data generation complete!")
+        print("Now fetching analytics...")
+
+        # Fetch and display analytics
+        try:
+            response = await client.get("/api/analytics/complete", params={"hours": 24})
+            analytics = response.json()
+            print("\nAnalytics Summary:")
+            print(f"Total API Calls: {analytics['api_calls']['total_calls']}")
+            print(f"Total Activities: {analytics['user_activity']['total_activities']}")
+            print(f"Total Errors: {analytics['errors']['total_errors']}")
+        except Exception as e:
+            print(f"Error fetching analytics: {e}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -6,251 +6,137 @@ import asyncio
 import sys
 sys.path.insert(0, '.')
 
+import httpx
+import orjson
+import pytest
 from app.main import app
-from fastapi.testclient import TestClient
 
-client = TestClient(app)
+# One keep-alive pool is shared by every check
+LIMITS = httpx.Limits(max_keepalive_connections=32, max_connections=64)
+
+
+# (section, method, path, expected status, JSON body)
+CASES = [
+    ("SYSTEM ENDPOINTS", "GET", "/api/system/stats", 200, None),
+
+    ("SESSION ENDPOINTS", "POST", "/api/sessions", 200, {"name": "Test Session"}),
+    ("SESSION ENDPOINTS", "GET", "/api/sessions", 200, None),
+
+    ("TASK MANAGEMENT ENDPOINTS", "POST", "/api/tasks/parse", 200, {"text": "Deploy app tomorrow urgent"}),
+    ("TASK MANAGEMENT ENDPOINTS", "GET", "/api/tasks", 200, None),
+
+    ("EXTERNAL API ENDPOINTS", "GET", "/api/stocks/AAPL", 200, None),
+    ("EXTERNAL API ENDPOINTS", "GET", "/api/crypto/bitcoin", 200, None),
+
+    ("RAG DOCUMENT INTELLIGENCE ENDPOINTS", "GET", "/api/rag/stats", 200, None),
+    ("RAG DOCUMENT INTELLIGENCE ENDPOINTS", "GET", "/api/rag/documents", 200, None),
+    ("RAG DOCUMENT INTELLIGENCE ENDPOINTS", "POST", "/api/rag/query", 200, {"query": "test", "n_results": 5}),
+
+    ("INTEGRATED TERMINAL ENDPOINTS", "GET", "/api/terminal/sessions", 200, None),
+
+    ("GIT INTEGRATION ENDPOINTS", "GET", "/api/git/status", 200, None),
+    ("GIT INTEGRATION ENDPOINTS", "GET", "/api/git/branches", 200, None),
+    ("GIT INTEGRATION ENDPOINTS", "GET", "/api/git/log?max_count=5", 200, None),
+
+    # SQLite needs no connection for the schema check
+    ("DATABASE QUERY BUILDER ENDPOINTS", "GET", "/api/db/schema", 200, None),
+
+    ("LEARNING PATH ENDPOINTS", "POST", "/api/learning/path", 200,
+     {"topic": "React", "current_level": "beginner", "goal": "advanced"}),
+    ("LEARNING PATH ENDPOINTS", "POST", "/api/learning/quiz", 200,
+     {"topic": "React", "level": "beginner", "count": 3}),
+    ("LEARNING PATH ENDPOINTS", "GET", "/api/learning/recommendations?user_id=test", 200, None),
+
+    ("LOCAL LLM ENDPOINTS", "GET", "/api/local-llm/status", 200, None),
+]
+
+SECTIONS = list(dict.fromkeys(section for section, *_ in CASES))
+
+
+async def _check(client: httpx.AsyncClient, method: str, path: str, expected: int, body):
+    """Send one case and check its status code without reading the body"""
+    async with client.stream(method, path, json=body) as response:
+        assert response.status_code == expected, f"status {response.status_code}"
+
+
+async def _terminal_chain(client: httpx.AsyncClient):
+    """Create a terminal session, then run a command in it"""
+    response = await client.post("/api/terminal/create", json={})
+    assert response.status_code == 200, f"status {response.status_code}"
+    session_id = orjson.loads(response.content).get("session_id")
+
+    if session_id:
+        response = await client.post("/api/terminal/execute", json={
+            "session_id": session_id,
+            "command": "echo 'test'"
+        })
+        assert response.status_code == 200, f"status {response.status_code}"
+        return f"(session: {session_id[:8]}...)"
+
+
+@pytest.mark.parametrize(
+    "section, method, path, expected, body", CASES,
+    ids=[f"{method} {path}" for _, method, path, *_ in CASES]
+)
+def test_endpoint(client, section, method, path, expected, body):
+    """Test an endpoint answers with its expected status"""
+    with client.stream(method, path, json=body) as response:
+        assert response.status_code == expected
+
+
+def test_terminal_execute(client):
+    """Test a command runs in a newly created terminal session"""
+    response = client.post("/api/terminal/create", json={})
+    assert response.status_code == 200
+    session_id = orjson.loads(response.content).get("session_id")
+    assert session_id
+
+    response = client.post("/api/terminal/execute", json={
+        "session_id": session_id,
+        "command": "echo 'test'"
+    })
+    assert response.status_code == 200
+
+
+async def main():
+    """Check all endpoints concurrently and print a report"""
 
-def test_endpoints():
-    """Test all endpoints"""
-    
     print("=" * 60)
     print("TESTING ALL API ENDPOINTS")
     print("=" * 60)
-    
+
     results = {"passed": 0, "failed": 0, "skipped": 0}
-    
-    # ============= SYSTEM ENDPOINTS =============
-    print("\n[SYSTEM ENDPOINTS]")
-    
-    try:
-        response = client.get("/api/system/stats")
-        assert response.status_code == 200
-        print("✓ GET /api/system/stats")
-        results["passed"] += 1
-    except Exception as e:
-        print(f"✗ GET /api/system/stats: {e}")
-        results["failed"] += 1
-    
-    # ============= SESSION ENDPOINTS =============
-    print("\n[SESSION ENDPOINTS]")
-    
-    try:
-        response = client.post("/api/sessions", json={"name": "Test Session"})
-        assert response.status_code == 200
-        print("✓ POST /api/sessions")
-        results["passed"] += 1
-    except Exception as e:
-        print(f"✗ POST /api/sessions: {e}")
-        results["failed"] += 1
-    
-    try:
-        response = client.get("/api/sessions")
-        assert response.status_code == 200
-        print("✓ GET /api/sessions")
-        results["passed"] += 1
-    except Exception as e:
-        print(f"✗ GET /api/sessions: {e}")
-        results["failed"] += 1
-    
-    # ============= TASK ENDPOINTS =============
-    print("\n[TASK MANAGEMENT ENDPOINTS]")
-    
-    try:
-        response = client.post("/api/tasks/parse", json={"text": "Deploy app tomorrow urgent"})
-        assert response.status_code == 200
-        print("✓ POST /api/tasks/parse")
-        results["passed"] += 1
-    except Exception as e:
-        print(f"✗ POST /api/tasks/parse: {e}")
-        results["failed"] += 1
-    
-    try:
-        response = client.get("/api/tasks")
-        assert response.status_code == 200
-        print("✓ GET /api/tasks")
-        results["passed"] += 1
-    except Exception as e:
-        print(f"✗ GET /api/tasks: {e}")
-        results["failed"] += 1
-    
-    # ============= EXTERNAL API ENDPOINTS =============
-    print("\n[EXTERNAL API ENDPOINTS]")
-    
-    try:
-        response = client.get("/api/stocks/AAPL")
-        assert response.status_code == 200
-        print("✓ GET /api/stocks/{symbol}")
-        results["passed"] += 1
-    except Exception as e:
-        print(f"✗ GET /api/stocks/{{symbol}}: {e}")
-        results["failed"] += 1
-    
-    try:
-        response = client.get("/api/crypto/bitcoin")
-        assert response.status_code == 200
-        print("✓ GET /api/crypto/{symbol}")
-        results["passed"] += 1
-    except Exception as e:
-        print(f"✗ GET /api/crypto/{{symbol}}: {e}")
-        results["failed"] += 1
-    
-    # ============= RAG ENDPOINTS =============
-    print("\n[RAG DOCUMENT INTELLIGENCE ENDPOINTS]")
-    
-    try:
-        response = client.get("/api/rag/stats")
-        assert response.status_code == 200
-        print("✓ GET /api/rag/stats")
-        results["passed"] += 1
-    except Exception as e:
-        print(f"✗ GET /api/rag/stats: {e}")
-        results["failed"] += 1
-    
-    try:
-        response = client.get("/api/rag/documents")
-        assert response.status_code == 200
-        print("✓ GET /api/rag/documents")
-        results["passed"] += 1
-    except Exception as e:
-        print(f"✗ GET /api/rag/documents: {e}")
-        results["failed"] += 1
-    
-    try:
-        response = client.post("/api/rag/query", json={"query": "test", "n_results": 5})
-        assert response.status_code == 200
-        print("✓ POST /api/rag/query")
-        results["passed"] += 1
-    except Exception as e:
-        print(f"✗ POST /api/rag/query: {e}")
-        results["failed"] += 1
-    
-    # ============= TERMINAL ENDPOINTS =============
-    print("\n[INTEGRATED TERMINAL ENDPOINTS]")
-    
-    try:
-        response = client.post("/api/terminal/create", json={})
-        assert response.status_code == 200
-        data = response.json()
-        session_id = data.get("session_id")
-        print(f"✓ POST /api/terminal/create (session: {session_id[:8]}...)")
-        results["passed"] += 1
-        
-        # Test execute
-        if session_id:
-            response = client.post("/api/terminal/execute", json={
-                "session_id": session_id,
-                "command": "echo 'test'"
-            })
-            assert response.status_code == 200
-            print("✓ POST /api/terminal/execute")
-            results["passed"] += 1
-    except Exception as e:
-        print(f"✗ Terminal endpoints: {e}")
-        results["failed"] += 2
-    
-    try:
-        response = client.get("/api/terminal/sessions")
-        assert response.status_code == 200
-        print("✓ GET /api/terminal/sessions")
-        results["passed"] += 1
-    except Exception as e:
-        print(f"✗ GET /api/terminal/sessions: {e}")
-        results["failed"] += 1
-    
-    # ============= GIT ENDPOINTS =============
-    print("\n[GIT INTEGRATION ENDPOINTS]")
-    
-    try:
-        response = client.get("/api/git/status")
-        assert response.status_code == 200
-        print("✓ GET /api/git/status")
-        results["passed"] += 1
-    except Exception as e:
-        print(f"✗ GET /api/git/status: {e}")
-        results["failed"] += 1
-    
-    try:
-        response = client.get("/api/git/branches")
-        assert response.status_code == 200
-        print("✓ GET /api/git/branches")
-        results["passed"] += 1
-    except Exception as e:
-        print(f"✗ GET /api/git/branches: {e}")
-        results["failed"] += 1
-    
-    try:
-        response = client.get("/api/git/log?max_count=5")
-        assert response.status_code == 200
-        print("✓ GET /api/git/log")
-        results["passed"] += 1
-    except Exception as e:
-        print(f"✗ GET /api/git/log: {e}")
-        results["failed"] += 1
-    
-    # ============= DATABASE ENDPOINTS =============
-    print("\n[DATABASE QUERY BUILDER ENDPOINTS]")
-    
-    try:
-        # Test with SQLite (no connection needed for schema check)
-        response = client.get("/api/db/schema")
-        assert response.status_code == 200
-        print("✓ GET /api/db/schema")
-        results["passed"] += 1
-    except Exception as e:
-        print(f"✗ GET /api/db/schema: {e}")
-        results["failed"] += 1
-    
-    # ============= LEARNING ENDPOINTS =============
-    print("\n[LEARNING PATH ENDPOINTS]")
-    
-    try:
-        response = client.post("/api/learning/path", json={
-            "topic": "React",
-            "current_level": "beginner",
-            "goal": "advanced"
-        })
-        assert response.status_code == 200
-        print("✓ POST /api/learning/path")
-        results["passed"] += 1
-    except Exception as e:
-        print(f"✗ POST /api/learning/path: {e}")
-        results["failed"] += 1
-    
-    try:
-        response = client.post("/api/learning/quiz", json={
-            "topic": "React",
-            "level": "beginner",
-            "count": 3
-        })
-        assert response.status_code == 200
-        print("✓ POST /api/learning/quiz")
-        results["passed"] += 1
-    except Exception as e:
-        print(f"✗ POST /api/learning/quiz: {e}")
-        results["failed"] += 1
-    
-    try:
-        response = client.get("/api/learning/recommendations?user_id=test")
-        assert response.status_code == 200
-        print("✓ GET /api/learning/recommendations")
-        results["passed"] += 1
-    except Exception as e:
-        print(f"✗ GET /api/learning/recommendations: {e}")
-        results["failed"] += 1
-    
-    # ============= LOCAL LLM ENDPOINTS =============
-    print("\n[LOCAL LLM ENDPOINTS]")
-    
-    try:
-        response = client.get("/api/local-llm/status")
-        assert response.status_code == 200
-        print("✓ GET /api/local-llm/status")
-        results["passed"] += 1
-    except Exception as e:
-        print(f"✗ GET /api/local-llm/status: {e}")
-        results["failed"] += 1
-    
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test", limits=LIMITS
+    ) as client:
+        # Every case is independent so they all run at once. Terminal
+        # execute needs the session from create, so that pair runs in order
+        checks = [
+            (section, f"{method} {path}", 1, _check(client, method, path, expected, body))
+            for section, method, path, expected, body in CASES
+        ]
+        checks.append((
+            "INTEGRATED TERMINAL ENDPOINTS", "POST /api/terminal/create + /api/terminal/execute", 2,
+            _terminal_chain(client)
+        ))
+        checks.sort(key=lambda check: SECTIONS.index(check[0]))
+
+        outcomes = await asyncio.gather(*(check for *_, check in checks), return_exceptions=True)
+
+    # Report in the original section order
+    section = None
+    for (name, label, count, _), outcome in zip(checks, outcomes):
+        if name != section:
+            print(f"\n[{name}]")
+            section = name
+        if isinstance(outcome, BaseException):
+            print(f"✗ {label}: {outcome}")
+            results["failed"] += count
+        else:
+            print(f"✓ {label}" + (f" {outcome}" if outcome else ""))
+            results["passed"] += count
+
     # ============= RESULTS =============
     print("\n" + "=" * 60)
     print("TEST RESULTS")
@@ -260,16 +146,16 @@ def test_endpoints():
     print(f"⊘ Skipped: {results['skipped']}")
     print(f"Total:     {sum(results.values())}")
     print("=" * 60)
-    
+
     success_rate = (results['passed'] / sum(results.values())) * 100 if sum(results.values()) > 0 else 0
     print(f"\nSuccess Rate: {success_rate:.1f}%")
-    
+
     if results['failed'] == 0:
         print("\n🎉 ALL TESTS PASSED!")
     else:
         print(f"\n⚠️  {results['failed']} tests failed")
-    
+
     return results
 
 if __name__ == "__main__":
-    test_endpoints()
+    asyncio.run(main())
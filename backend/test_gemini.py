@@ -1,6 +1,7 @@
 """
 Test script for Gemini integration
 """
+import asyncio
 import sys
 import os
 
@@ -9,7 +10,7 @@ sys.path.insert(0, '/home/tushar/Developer/python/Agent/friday-agent/backend')
 
 from modules.gemini_processor import GeminiProcessor
 
-def test_gemini():
+async def test_gemini():
     """Test Gemini AI processor"""
     print("=" * 50)
     print("Testing Gemini AI Integration")
@@ -31,9 +32,12 @@ def test_gemini():
         ]
         
         print("\n2. Testing AI command analysis...\n")
-        for cmd in test_commands:
+        # analyze_command blocks on the API, so each call gets a worker thread
+        results = await asyncio.gather(
+            *(asyncio.to_thread(gemini.analyze_command, cmd) for cmd in test_commands)
+        )
+        for cmd, result in zip(test_commands, results):
             print(f"Command: '{cmd}'")
-            result = gemini.analyze_command(cmd)
             
             if result['success']:
                 print(f"  Intent: {result.get('intent')}")
@@ -53,4 +57,4 @@ def test_gemini():
         traceback.print_exc()
 
 if __name__ == "__main__":
-    test_gemini()
+    asyncio.run(test_gemini())
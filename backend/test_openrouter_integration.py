@@ -34,12 +34,20 @@ try:
 except Exception as e:
     print(f"❌ Gemini Processor: FAILED - {e}")
 
+# Tests 3 and 4 share one copilot so its setup runs once
+copilot, copilot_error = None, None
+try:
+    from modules.ai_copilot import AICopilot
+    copilot = AICopilot()
+except Exception as e:
+    copilot_error = e
+
 # Test 3: AI Copilot with OpenRouter
 print("\n✅ TEST 3: AI Copilot (with OpenRouter support)")
 print("-" * 70)
 try:
-    from modules.ai_copilot import AICopilot
-    copilot = AICopilot()
+    if copilot is None:
+        raise RuntimeError(f"initialization failed: {copilot_error}")
     print(f"AI Provider: {copilot.ai_provider}")
     
     test_code = """def calculate_sum(a, b):
@@ -58,8 +66,8 @@ except Exception as e:
 print("\n✅ TEST 4: Code Explanation (with OpenRouter)")
 print("-" * 70)
 try:
-    from modules.ai_copilot import AICopilot
-    copilot = AICopilot()
+    if copilot is None:
+        raise RuntimeError(f"initialization failed: {copilot_error}")
     
     test_code = """
 def factorial(n):
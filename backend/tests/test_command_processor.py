@@ -0,0 +1,47 @@
+"""
+Tests for Command Processor
+"""
+
+import pytest
+
+pytest.importorskip("google.generativeai")
+from modules.command_processor import CommandProcessor
+
+
+class FakeTTS:
+    """Records spoken text instead of speaking"""
+
+    def __init__(self):
+        self.spoken = []
+
+    def speak(self, text):
+        self.spoken.append(text)
+
+
+@pytest.fixture
+def processor():
+    """Regex-only processor that never contacts an AI provider"""
+    return CommandProcessor(app_launcher=None, tts=FakeTTS(), use_gemini=False)
+
+
+class TestRegexOnly:
+
+    def test_no_ai_configured(self, processor):
+        """Test the regex-only mode sets up no AI providers"""
+        assert processor.use_ai is False
+        assert processor.gemini is None
+        assert processor.openrouter is None
+        assert processor.enable_multi_model is False
+
+    def test_usage_stats(self, processor):
+        """Test usage stats are available without Gemini"""
+        assert processor.get_usage_stats() == {'cloud_queries': 0, 'fallback_count': 0}
+
+    @pytest.mark.asyncio
+    async def test_regex_command(self, processor):
+        """Test commands are answered by the regex patterns"""
+        result = await processor.process_command("are you online")
+
+        assert result['success'] is True
+        assert result['message'] == 'Status check'
+        assert processor.tts.spoken == ["Friday is online and ready"]
@@ -0,0 +1,216 @@
+"""
+Tests for the local Ollama LLM client
+"""
+
+import time
+from types import SimpleNamespace
+
+import orjson
+import pytest
+import pytest_asyncio
+
+aiohttp = pytest.importorskip("aiohttp")
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from modules import local_llm
+from modules.local_llm import LocalLLM
+
+
+class FakeOllama:
+    """Minimal Ollama API; a prompt's tokens are its '|'-separated parts"""
+
+    def __init__(self):
+        self.models = ["llama3.2:3b"]
+        self.missing = set()
+        self.status = 200
+        self.requests = []
+        self.tags_calls = 0
+        self.url = None
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/api/tags", self.tags)
+        app.router.add_post("/api/generate", self.generate)
+        app.router.add_post("/api/pull", self.pull)
+        return app
+
+    async def tags(self, request):
+        self.tags_calls += 1
+        return web.json_response({"models": [{"name": name} for name in self.models]})
+
+    async def pull(self, request):
+        body = await request.json()
+        self.models.append(body["name"])
+        return web.json_response({"status": "success"})
+
+    async def generate(self, request):
+        body = await request.json()
+        self.requests.append(body)
+        if body["model"] in self.missing:
+            return web.Response(status=404, text="model not found")
+        if self.status != 200:
+            return web.Response(status=self.status, text="server error")
+        if "prompt" not in body:
+            return web.json_response({"done": True})
+
+        response = web.StreamResponse(headers={"Content-Type": "application/x-ndjson"})
+        await response.prepare(request)
+        for token in body["prompt"].split("|"):
+            await response.write(orjson.dumps({"response": token, "done": False}) + b"\n")
+        await response.write(b"\n")
+        await response.write(orjson.dumps({"response": "", "done": True}) + b"\n")
+        # Anything after done must be ignored
+        await response.write(orjson.dumps({"response": "late", "done": False}) + b"\n")
+        await response.write_eof()
+        return response
+
+
+@pytest_asyncio.fixture
+async def ollama():
+    """Fake Ollama server on a free local port"""
+    fake = FakeOllama()
+    server = TestServer(fake.app())
+    await server.start_server()
+    fake.url = str(server.make_url("")).rstrip("/")
+    yield fake
+    await server.close()
+
+
+@pytest_asyncio.fixture
+async def llm(ollama):
+    """Client pointed at the fake server"""
+    async with LocalLLM(base_url=ollama.url) as client:
+        yield client
+
+
+def _fake_clock(monkeypatch, *ticks):
+    """Make perf_counter return the given ticks in order"""
+    ticks = iter(ticks)
+    monkeypatch.setattr(local_llm, "time", SimpleNamespace(
+        perf_counter=lambda: next(ticks), monotonic=time.monotonic
+    ))
+
+
+class TestStreaming:
+
+    @pytest.mark.asyncio
+    async def test_stream_chunks_until_done(self, llm, ollama):
+        """Test each NDJSON chunk is yielded and reading stops at done"""
+        pieces = [piece async for piece in llm.stream_generate("Hel|lo|!", system="Be brief")]
+
+        assert pieces == ["Hel", "lo", "!"]
+        assert ollama.requests[0]["stream"] is True
+        assert ollama.requests[0]["system"] == "Be brief"
+
+    @pytest.mark.asyncio
+    async def test_stream_error_yields_nothing(self, llm, ollama):
+        """Test a non-200 answer ends the stream without chunks"""
+        ollama.status = 500
+        assert [piece async for piece in llm.stream_generate("Hi")] == []
+
+    @pytest.mark.asyncio
+    async def test_generate_joins_chunks(self, llm, ollama):
+        """Test the non-streaming call concatenates every chunk"""
+        assert await llm.generate("a|b|c", model="other:1b") == "abc"
+        assert ollama.requests[0]["model"] == "other:1b"
+        assert llm.model == "llama3.2:3b"
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("orjson_available", [True, False])
+    async def test_json_backends(self, llm, monkeypatch, orjson_available):
+        """Test requests and NDJSON parse the same with and without orjson"""
+        monkeypatch.setattr(local_llm, "ORJSON_AVAILABLE", orjson_available)
+
+        assert local_llm._loads(b'{"response": "x"}') == {"response": "x"}
+        assert local_llm._dumps({"a": 1}).replace(" ", "") == '{"a":1}'
+        assert await llm.generate("x|y") == "xy"
+
+
+class TestMetrics:
+
+    @pytest.mark.asyncio
+    async def test_metric_math(self, llm, monkeypatch):
+        """Test TTFT, duration and decode rate come from the token timings"""
+        _fake_clock(monkeypatch, 10.0, 10.5, 12.5)
+
+        metrics = await llm.generate_with_metrics("a|b|c")
+
+        assert metrics == {
+            "response": "abc",
+            "ttft": 0.5,
+            "duration": 2.5,
+            "tokens": 3,
+            "tokens_per_second": 1.0
+        }
+
+    @pytest.mark.asyncio
+    async def test_single_token_has_no_rate(self, llm, monkeypatch):
+        """Test a one-token reply reports no decode rate"""
+        _fake_clock(monkeypatch, 1.0, 1.25, 2.0)
+
+        metrics = await llm.generate_with_metrics("only")
+
+        assert metrics["tokens"] == 1
+        assert metrics["tokens_per_second"] is None
+
+    @pytest.mark.asyncio
+    async def test_no_tokens_is_none(self, llm, ollama):
+        """Test a failed generation reports no metrics"""
+        ollama.status = 500
+        assert await llm.generate_with_metrics("Hi") is None
+
+
+class TestBatchAndPreload:
+
+    @pytest.mark.asyncio
+    async def test_generate_batch_keeps_order(self, llm, ollama):
+        """Test batched prompts answer in input order"""
+        ollama.missing.add("gone:1b")
+
+        assert await llm.generate_batch(["a|b", "c", "d|e|f"]) == ["ab", "c", "def"]
+        assert await llm.generate_batch(["a"], model="gone:1b") == [None]
+        assert len(ollama.requests) == 4
+
+    @pytest.mark.asyncio
+    async def test_preload_models(self, llm, ollama):
+        """Test preloading sends keep-alive loads and reports each model"""
+        ollama.missing.add("gone:1b")
+
+        result = await llm.preload_models(["llama3.2:3b", "gone:1b"])
+
+        assert result == {"llama3.2:3b": True, "gone:1b": False}
+        assert all(r["keep_alive"] == -1 and "prompt" not in r for r in ollama.requests)
+
+
+class TestSessionAndTags:
+
+    @pytest.mark.asyncio
+    async def test_shared_session_lifecycle(self, ollama):
+        """Test requests share one session that closes with the client"""
+        async with LocalLLM(base_url=ollama.url) as llm:
+            await llm.generate("a")
+            session = llm._session
+            await llm.generate("b")
+            assert llm._session is session
+            assert session.connector.limit == 32
+
+        assert session.closed
+        assert llm._session is None
+
+        # A closed client opens a fresh session on next use
+        assert await llm.generate("c") == "c"
+        assert llm._session is not session
+        await llm.close()
+
+    @pytest.mark.asyncio
+    async def test_tags_cached_until_pull(self, llm, ollama):
+        """Test the tags listing is reused until a pull invalidates it"""
+        assert await llm.check_availability() is True
+        assert await llm.list_models() == ["llama3.2:3b"]
+        assert ollama.tags_calls == 1
+
+        assert await llm.pull_model("phi3:mini") is True
+        assert await llm.list_models() == ["llama3.2:3b", "phi3:mini"]
+        assert ollama.tags_calls == 2
+        assert "phi3:mini" in llm._installed_set
@@ -0,0 +1,246 @@
+"""
+Tests for the Smart Testing Suite
+"""
+
+import math
+import sys
+
+import pytest
+from modules import smart_testing_suite
+from modules.smart_testing_suite import (
+    BenchmarkHistory, PerformanceBenchmark, SmartTestingSuite
+)
+
+
+CALC_SOURCE = '''def add(a, b):
+    return a + b
+
+
+def is_zero(x):
+    return x == 0
+
+
+def double(x):
+    # "x + x" in a comment is never mutated
+    return x + x
+'''
+
+CALC_TESTS = '''from calc import add, is_zero
+
+
+def test_add():
+    assert add(2, 3) == 5
+
+
+def test_is_zero():
+    assert is_zero(0)
+'''
+
+
+@pytest.fixture
+def suite():
+    """Testing suite with no LLM"""
+    return SmartTestingSuite()
+
+
+@pytest.fixture
+def project(tmp_path):
+    """Tiny project whose tests cover add and is_zero but not double"""
+    (tmp_path / "calc.py").write_text(CALC_SOURCE)
+    (tmp_path / "test_calc.py").write_text(CALC_TESTS)
+    return tmp_path
+
+
+@pytest.fixture
+def fake_numba(monkeypatch):
+    """Stand-in for numba whose njit wrapper fails to compile when told to"""
+
+    class FakeNumbaError(Exception):
+        pass
+
+    class FakeNumba:
+        compile_error = None
+
+        @staticmethod
+        def njit(cache=False):
+            def decorate(func):
+                def jitted():
+                    if FakeNumba.compile_error:
+                        raise FakeNumbaError(FakeNumba.compile_error)
+                    return func()
+                return jitted
+            return decorate
+
+    monkeypatch.setattr(smart_testing_suite, "NUMBA_AVAILABLE", True)
+    monkeypatch.setattr(smart_testing_suite, "numba", FakeNumba, raising=False)
+    monkeypatch.setattr(smart_testing_suite, "NumbaError", FakeNumbaError, raising=False)
+    return FakeNumba
+
+
+def _benchmark(index: int, comparison=None) -> PerformanceBenchmark:
+    """Benchmark record with times derived from its index"""
+    return PerformanceBenchmark(
+        benchmark_id=f"bench_{index}",
+        function_name="f",
+        iterations=index,
+        avg_time=float(index),
+        min_time=float(index),
+        max_time=float(index),
+        memory_usage=0.0,
+        baseline_comparison=comparison
+    )
+
+
+class TestMutationTesting:
+
+    def test_python_mutations_skip_comments(self, suite):
+        """Test only real operators are mutated, one mutation per site"""
+        mutations = suite._generate_mutations(CALC_SOURCE, "calc.py")
+        assert [m["id"] for m in mutations] == [
+            "mut_1_13_add_to_sub", "mut_5_13_eq_to_neq", "mut_10_13_add_to_sub"
+        ]
+        assert mutations[0]["mutated"] == "    return a - b"
+
+    @pytest.mark.asyncio
+    async def test_worker_run_kills_and_restores(self, suite, project):
+        """Test the pytest worker kills covered mutations and the file is restored"""
+        calc = project / "calc.py"
+        result = await suite.perform_mutation_testing(
+            str(calc), f"pytest {project / 'test_calc.py'} -q -p no:cacheprovider"
+        )
+
+        assert result["success"] is True
+        assert result["mutations_tested"] == 3
+        assert result["mutations_killed"] == 2
+        killed = {r["line_number"]: r["killed"] for r in result["results"]}
+        assert killed == {2: True, 6: True, 11: False}
+        assert calc.read_text() == CALC_SOURCE
+
+    @pytest.mark.asyncio
+    async def test_subprocess_fallback(self, suite, project):
+        """Test commands the worker cannot run go through a plain subprocess"""
+        calc = project / "calc.py"
+        command = f"{sys.executable} -m pytest {project / 'test_calc.py'} -q -p no:cacheprovider"
+        assert suite._get_pytest_args(command.split()) is None
+
+        result = await suite.perform_mutation_testing(str(calc), command)
+
+        assert result["mutations_killed"] == 2
+        assert calc.read_text() == CALC_SOURCE
+
+    def test_fail_fast_flags(self, suite):
+        """Test the stop-on-first-failure flag is added once"""
+        assert suite._with_fail_fast(["pytest", "tests"]) == ["pytest", "tests", "-x"]
+        assert suite._with_fail_fast(["pytest", "--maxfail=2"]) == ["pytest", "--maxfail=2"]
+        assert suite._with_fail_fast(["npx", "jest"]) == ["npx", "jest", "--bail"]
+        assert suite._with_fail_fast(["make", "test"]) == ["make", "test"]
+
+
+class TestTestGeneration:
+
+    def test_rendered_tests_share_bounded_cache(self, suite):
+        """Test identical requests reuse one rendering from a bounded cache"""
+        render = smart_testing_suite._render_python_test
+        render.cache_clear()
+
+        first = suite._generate_basic_test("add", ["a", "b"], "pytest")
+        second = SmartTestingSuite()._generate_basic_test("add", ["a", "b"], "pytest")
+
+        assert first is second
+        assert "result = add(a, b)" in first
+        assert render.cache_info().hits == 1
+        assert render.cache_info().maxsize == smart_testing_suite.TEST_CODE_CACHE_SIZE
+
+    def test_edge_case_inputs(self, suite):
+        """Test edge case kinds pick their own inputs"""
+        empty = suite._generate_edge_case_test("f", ["items"], "empty", "pytest")
+        invalid = suite._generate_edge_case_test("f", ["items"], "invalid", "pytest")
+        assert "items = []" in empty
+        assert "items = None  # Invalid input" in invalid
+        assert suite._generate_js_test("f", ["x", "y"], "jest").count("testData") >= 2
+        assert suite._generate_js_test("f", ["x"], "tap") == ""
+
+
+class TestBenchmarkHistory:
+
+    def test_trims_to_maxlen(self):
+        """Test only the newest runs are kept, in every column"""
+        history = BenchmarkHistory(maxlen=3)
+        for i in range(5):
+            history.append(_benchmark(i, comparison=None if i % 2 else 1.5))
+
+        assert len(history) == 3
+        assert history.benchmark_ids == ["bench_2", "bench_3", "bench_4"]
+        assert list(history.iterations) == [2, 3, 4]
+        assert history.mean_avg_time() == 3.0
+        assert history.records() == [_benchmark(2, 1.5), _benchmark(3), _benchmark(4, 1.5)]
+
+    def test_missing_comparison_is_nan(self):
+        """Test absent baselines are stored as NaN and read back as None"""
+        history = BenchmarkHistory()
+        history.append(_benchmark(1))
+        assert math.isnan(history.baseline_comparisons[0])
+        assert history.get(0).baseline_comparison is None
+
+    @pytest.mark.asyncio
+    async def test_baseline_comparison(self, suite, tmp_path):
+        """Test a run is compared with the mean of earlier runs"""
+        source = tmp_path / "bench.py"
+        source.write_text("def f():\n    return sum(range(10))\n")
+
+        first = await suite.benchmark_function(str(source), "f", iterations=10,
+                                               compare_to_baseline=True)
+        assert first["benchmark"]["baseline_comparison"] is None
+
+        suite.benchmarks["f"].append(_benchmark(1))
+        baseline = suite.benchmarks["f"].mean_avg_time()
+        second = await suite.benchmark_function(str(source), "f", iterations=10,
+                                                compare_to_baseline=True)
+
+        avg_time = second["benchmark"]["avg_time"]
+        assert second["benchmark"]["baseline_comparison"] == pytest.approx(
+            (avg_time - baseline) / baseline * 100
+        )
+        assert len(suite.benchmarks["f"]) == 3
+
+
+class TestJitBenchmark:
+
+    @staticmethod
+    def _counting_source(tmp_path):
+        """Benchmark target that appends to a log file on every call"""
+        log = tmp_path / "calls.log"
+        source = tmp_path / "bench.py"
+        source.write_text(
+            "def f():\n"
+            f"    with open({str(log)!r}, 'a') as out:\n"
+            "        out.write('x')\n"
+        )
+        return source, log
+
+    @pytest.mark.asyncio
+    async def test_first_call_compiles_untimed(self, suite, tmp_path, fake_numba):
+        """Test the compiling call is one of the iterations and is not timed"""
+        source, log = self._counting_source(tmp_path)
+
+        result = await suite.benchmark_function(str(source), "f", iterations=5, jit=True)
+
+        assert log.read_text() == "x" * 5
+        assert result["performance_summary"]["iterations"] == 4
+        assert result["performance_summary"]["jit_compiled"] is True
+
+        cached = await suite.benchmark_function(str(source), "f", iterations=5, jit=True)
+        assert cached["performance_summary"]["iterations"] == 5
+
+    @pytest.mark.asyncio
+    async def test_compile_error_falls_back(self, suite, tmp_path, fake_numba):
+        """Test any Numba compile error falls back to the Python function"""
+        source, log = self._counting_source(tmp_path)
+        fake_numba.compile_error = "unsupported bytecode"
+
+        result = await suite.benchmark_function(str(source), "f", iterations=5, jit=True)
+
+        assert result["success"] is True
+        assert result["performance_summary"]["jit_compiled"] is False
+        assert result["performance_summary"]["iterations"] == 4
+        assert suite._jit_cache == {}
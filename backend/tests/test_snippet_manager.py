@@ -0,0 +1,234 @@
+"""
+Tests for Snippet Manager
+"""
+
+import numpy as np
+import pytest
+from modules import snippet_manager
+from modules.snippet_manager import SnippetManager
+
+
+@pytest.fixture
+def manager(tmp_path):
+    """Snippet manager backed by a temporary database"""
+    mgr = SnippetManager(db_path=str(tmp_path / "snippets.db"))
+    yield mgr
+    mgr.close()
+
+
+class TestSnippetManager:
+
+    def test_create_and_get(self, manager):
+        """Test creating and fetching a snippet"""
+        created = manager.create_snippet(
+            title="Quick sort",
+            code="def quick_sort(items): ...",
+            language="python",
+            tags=["sorting", "algorithms"]
+        )
+
+        snippet = manager.get_snippet(created["id"])
+        assert snippet["title"] == "Quick sort"
+        assert snippet["tags"] == ["sorting", "algorithms"]
+
+    def test_get_missing(self, manager):
+        """Test fetching a snippet that does not exist"""
+        assert manager.get_snippet(999) is None
+
+    def test_list_filters(self, manager):
+        """Test listing with language filter"""
+        manager.create_snippet(title="A", code="a", language="python")
+        manager.create_snippet(title="B", code="b", language="javascript")
+
+        snippets = manager.list_snippets(language="python")
+        assert [s["title"] for s in snippets] == ["A"]
+
+    def test_update_and_delete(self, manager):
+        """Test updating then deleting a snippet"""
+        created = manager.create_snippet(title="Old", code="x", language="python")
+
+        assert manager.update_snippet(created["id"], title="New") is True
+        assert manager.get_snippet(created["id"])["title"] == "New"
+
+        assert manager.delete_snippet(created["id"]) is True
+        assert manager.get_snippet(created["id"]) is None
+
+    def test_increment_usage(self, manager):
+        """Test usage counter and popular snippets"""
+        created = manager.create_snippet(
+            title="Popular", code="x", language="python", is_public=True
+        )
+        manager.increment_usage(created["id"])
+        manager.increment_usage(created["id"])
+
+        popular = manager.get_popular_snippets()
+        assert popular[0]["usage_count"] == 2
+
+    def test_stats(self, manager):
+        """Test snippet statistics"""
+        manager.create_snippet(title="A", code="a", language="python", category="util")
+        manager.create_snippet(title="B", code="b", language="go", category="util")
+
+        stats = manager.get_stats()
+        assert stats == {"total_snippets": 2, "languages": 2, "categories": 1}
+
+    def test_connections_returned_to_pool(self, manager):
+        """Test pooled connections are released after use"""
+        manager.create_snippet(title="A", code="a", language="python")
+        manager.list_snippets()
+
+        stats = manager.get_pool_stats()
+        assert stats["in_use"] == 0
+        assert stats["available"] == stats["pool_size"]
+
+    def test_bulk_create_and_batch_usage(self, manager):
+        """Test bulk insert and batched usage increments"""
+        created = manager.create_snippets_bulk([
+            {"title": "A", "code": "a", "language": "python", "is_public": True},
+            {"title": "B", "code": "b", "language": "python", "is_public": True,
+             "tags": ["x"]},
+        ])
+        assert created == 2
+
+        ids = {s["title"]: s["id"] for s in manager.list_snippets()}
+        manager.batch_increment_usage([ids["A"], ids["B"], ids["A"]])
+
+        counts = {s["title"]: s["usage_count"] for s in manager.get_popular_snippets()}
+        assert counts == {"A": 2, "B": 1}
+
+    def test_transaction_rolls_back_on_error(self, manager):
+        """Test a failed transaction leaves no partial writes"""
+        with pytest.raises(RuntimeError):
+            with manager.transaction() as conn:
+                conn.execute(
+                    "INSERT INTO snippets (title, code, language) VALUES ('A', 'a', 'py')"
+                )
+                raise RuntimeError("boom")
+
+        assert manager.list_snippets() == []
+
+    @pytest.mark.asyncio
+    async def test_search_ranks_title_matches_first(self, manager):
+        """Test full-text search weighting and index sync"""
+        manager.create_snippet(title="Binary search", code="def find(): ...", language="python")
+        manager.create_snippet(title="Helpers", code="# binary search helper", language="python")
+        manager.create_snippet(title="Unrelated", code="print('hi')", language="python")
+
+        results = await manager.search_snippets("binary")
+        assert [s["title"] for s in results] == ["Binary search", "Helpers"]
+
+        manager.update_snippet(results[0]["id"], title="Linear scan")
+        results = await manager.search_snippets("linear")
+        assert [s["title"] for s in results] == ["Linear scan"]
+
+    @pytest.mark.asyncio
+    async def test_search_without_terms(self, manager):
+        """Test search with a query that has no searchable terms"""
+        manager.create_snippet(title="A", code="a", language="python")
+        assert await manager.search_snippets("!!!") == []
+
+    @pytest.fixture
+    def fake_embeddings(self, manager, monkeypatch):
+        """One-hot embeddings over a tiny vocabulary, recording each call"""
+        pytest.importorskip("faiss")
+
+        vocabulary = ["sort", "http", "parse"]
+        calls = []
+
+        def fake_embed(texts, task_type):
+            calls.append((task_type, len(texts)))
+            # One-hot over vocabulary words, padded to the embedding size
+            vectors = np.zeros((len(texts), 768), dtype=np.float32)
+            for i, text in enumerate(texts):
+                for j, word in enumerate(vocabulary):
+                    if word in text.lower():
+                        vectors[i, j] = 1.0
+            return manager._quantize(vectors)
+
+        monkeypatch.setattr(snippet_manager, "GEMINI_AVAILABLE", True)
+        manager.gemini = object()
+        monkeypatch.setattr(manager, "_embed", fake_embed)
+        return calls
+
+    @pytest.mark.asyncio
+    async def test_vector_search(self, manager, fake_embeddings):
+        """Test semantic search through the embedding index"""
+        manager.create_snippet(title="Sort numbers", code="a", language="python")
+        manager.create_snippet(title="HTTP client", code="b", language="python")
+
+        results = await manager._vector_search("http", None, None, 5)
+        assert results[0]["title"] == "HTTP client"
+
+        # Newly created snippets are embedded when saved
+        manager.create_snippet(title="Parse JSON", code="c", language="python")
+        results = await manager._vector_search("parse", None, None, 5)
+        assert results[0]["title"] == "Parse JSON"
+
+        # Edited snippets are re-embedded and replace their old vector
+        manager.update_snippet(results[0]["id"], title="Sort JSON keys")
+        results = await manager._vector_search("sort", None, None, 5)
+        assert {s["title"] for s in results[:2]} == {"Sort numbers", "Sort JSON keys"}
+        assert len({s["id"] for s in results}) == len(results)
+
+    @pytest.mark.asyncio
+    async def test_search_embeds_only_the_query(self, manager, fake_embeddings):
+        """Test searching never embeds snippets, even ones still lacking vectors"""
+        manager.create_snippet(title="Sort numbers", code="a", language="python")
+        with manager.get_conn() as conn:
+            conn.execute("DELETE FROM snippet_embeddings")
+            conn.commit()
+        fake_embeddings.clear()
+
+        assert await manager._vector_search("sort", None, None, 5) == []
+        assert fake_embeddings == [("retrieval_query", 1)]
+
+    def test_embedding_backfill(self, manager, fake_embeddings):
+        """Test snippets saved without vectors are embedded in the background"""
+        manager.create_snippets_bulk([
+            {"title": f"Sort {i}", "code": "x", "language": "python"} for i in range(3)
+        ])
+        manager.start_embedding_backfill().join()
+
+        with manager.get_conn() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM snippet_embeddings").fetchone()[0] == 3
+        assert ("retrieval_document", 3) in fake_embeddings
+
+    def test_embedding_failure_keeps_snippet(self, manager, fake_embeddings, monkeypatch):
+        """Test a failed embedding call still saves the snippet"""
+        def failing_embed(texts, task_type):
+            raise RuntimeError("quota exceeded")
+
+        monkeypatch.setattr(manager, "_embed", failing_embed)
+        created = manager.create_snippet(title="Sort numbers", code="a", language="python")
+        assert manager.get_snippet(created["id"])["title"] == "Sort numbers"
+
+    def test_update_touches_updated_at(self, manager):
+        """Test edits refresh updated_at but usage increments do not"""
+        created = manager.create_snippet(title="A", code="a", language="python")
+        with manager.get_conn() as conn:
+            conn.execute(
+                "UPDATE snippets SET updated_at = '2000-01-01 00:00:00' WHERE id = ?",
+                (created["id"],)
+            )
+            conn.commit()
+
+        manager.increment_usage(created["id"])
+        assert manager.get_snippet(created["id"])["updated_at"] == "2000-01-01 00:00:00"
+
+        manager.update_snippet(created["id"], title="B")
+        assert manager.get_snippet(created["id"])["updated_at"] > "2000-01-01 00:00:00"
+
+    @pytest.mark.asyncio
+    async def test_keyword_search_fallback(self, manager):
+        """Test LIKE-based search used when FTS5 is unavailable"""
+        manager._fts_enabled = False
+        manager.create_snippet(title="Binary search", code="x", language="python")
+        manager.create_snippet(title="Helpers", code="# binary search", language="python")
+        manager.create_snippet(title="100% coverage", code="y", language="python")
+
+        results = await manager.search_snippets("binary")
+        assert [s["title"] for s in results] == ["Binary search", "Helpers"]
+        assert results[0]["search_score"] == 10
+
+        results = await manager.search_snippets("0%")
+        assert [s["title"] for s in results] == ["100% coverage"]
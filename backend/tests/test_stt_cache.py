@@ -0,0 +1,56 @@
+"""
+Tests for the Speech-to-Text transcript cache
+"""
+
+import numpy as np
+from modules import stt_cache
+from modules.stt_cache import TranscriptCache, fingerprint
+
+
+def _tone(freqs, seconds=1.0, noise=0.0, seed=0):
+    """Sequence of sine tones as 16 kHz PCM"""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(16000 * seconds / len(freqs))) / 16000
+    samples = np.concatenate([0.3 * np.sin(2 * np.pi * f * t) for f in freqs])
+    samples += noise * rng.standard_normal(samples.size)
+    return (np.clip(samples, -1, 1) * 32767).astype(np.int16).tobytes()
+
+
+class TestFingerprint:
+
+    def test_stable_under_noise_and_gain(self):
+        """Test faint noise and volume changes do not change the fingerprint"""
+        base = fingerprint(_tone([300, 900, 2000]))
+        assert fingerprint(_tone([300, 900, 2000], noise=0.0001)) == base
+
+        quieter = (np.frombuffer(_tone([300, 900, 2000]), dtype=np.int16) * 0.7).astype(np.int16)
+        assert fingerprint(quieter.tobytes()) == base
+
+    def test_differs_for_other_audio(self):
+        """Test different sounds and lengths get different fingerprints"""
+        base = fingerprint(_tone([300, 900, 2000]))
+        assert fingerprint(_tone([2000, 900, 300])) != base
+        assert fingerprint(_tone([300, 900, 2000], seconds=2.0)) != base
+
+    def test_short_audio(self):
+        """Test audio shorter than the hash grid still fingerprints"""
+        assert fingerprint(_tone([440], seconds=0.02)).endswith(":0")
+
+
+class TestTranscriptCache:
+
+    def test_round_trip(self, tmp_path):
+        """Test transcripts are returned for a known fingerprint"""
+        cache = TranscriptCache(directory=str(tmp_path))
+        key = fingerprint(_tone([440]))
+
+        assert cache.get(key) is None
+        cache.set(key, "open terminal")
+        assert cache.get(key) == "open terminal"
+
+    def test_expiry_without_diskcache(self, monkeypatch):
+        """Test the in-memory fallback honours the TTL"""
+        monkeypatch.setattr(stt_cache, "DISKCACHE_AVAILABLE", False)
+        cache = TranscriptCache(ttl=-1)
+        cache.set("key", "open terminal")
+        assert cache.get("key") is None
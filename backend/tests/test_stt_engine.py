@@ -0,0 +1,154 @@
+"""
+Tests for the on-device Speech-to-Text engine
+"""
+
+import json
+
+import numpy as np
+import pytest
+from modules import stt_engine
+from modules.stt_engine import (
+    OnnxTranscriber, WakeWordDetector, ctc_greedy_decode, mfcc, pcm16_to_float32
+)
+
+
+VOCAB = ["<pad>", "|", "h", "i", "o"]
+
+
+class TestDecoding:
+
+    def test_pcm_conversion(self):
+        """Test 16-bit PCM is scaled to float samples"""
+        pcm = np.array([0, 16384, -32768], dtype=np.int16).tobytes()
+        assert pcm16_to_float32(pcm).tolist() == [0.0, 0.5, -1.0]
+
+    def test_ctc_collapses_repeats_and_blanks(self):
+        """Test repeated labels merge unless split by a blank"""
+        ids = [2, 2, 0, 3, 1, 1, 2, 4, 0, 4]
+        assert ctc_greedy_decode(ids, VOCAB, blank_id=0) == "hi hoo"
+
+    def test_ctc_silence(self):
+        """Test an all-blank sequence decodes to nothing"""
+        assert ctc_greedy_decode([0, 0, 1, 0], VOCAB, blank_id=0) == ""
+
+
+@pytest.fixture
+def fake_ort(monkeypatch):
+    """Stand-in for onnxruntime that records sessions and answers with a test-supplied run"""
+
+    class FakeInput:
+        name = "input"
+
+    class FakeOptions:
+        def __init__(self):
+            self.config = {}
+
+        def add_session_config_entry(self, key, value):
+            self.config[key] = value
+
+    class FakeOrt:
+        SessionOptions = FakeOptions
+        sessions = []
+        run = None
+
+        @staticmethod
+        def get_available_providers():
+            return ["CPUExecutionProvider"]
+
+        class InferenceSession:
+            def __init__(self, path, sess_options=None, providers=None):
+                FakeOrt.sessions.append((path, sess_options, providers))
+
+            def get_inputs(self):
+                return [FakeInput()]
+
+            def run(self, outputs, feeds):
+                return FakeOrt.run(feeds["input"])
+
+    monkeypatch.setattr(stt_engine, "ONNX_AVAILABLE", True)
+    monkeypatch.setattr(stt_engine, "ort", FakeOrt, raising=False)
+    for cached in (stt_engine._create_session, stt_engine._create_wakeword_session, stt_engine._load_vocab):
+        cached.cache_clear()
+    yield FakeOrt
+    for cached in (stt_engine._create_session, stt_engine._create_wakeword_session, stt_engine._load_vocab):
+        cached.cache_clear()
+
+
+class TestOnnxTranscriber:
+
+    def test_transcribe(self, tmp_path, fake_ort):
+        """Test audio is normalised, run through the session and decoded"""
+        vocab_path = tmp_path / "vocab.json"
+        vocab_path.write_text(json.dumps({token: i for i, token in enumerate(VOCAB)}))
+        inputs = []
+
+        def run(samples):
+            inputs.append(samples)
+            logits = np.zeros((1, 3, len(VOCAB)), dtype=np.float32)
+            logits[0, [0, 1, 2], [2, 3, 0]] = 1.0
+            return [logits]
+
+        fake_ort.run = run
+        transcriber = OnnxTranscriber(str(tmp_path / "model.onnx"), str(vocab_path))
+        pcm = np.array([1000, -1000, 3000, -3000], dtype=np.int16).tobytes()
+
+        assert transcriber.transcribe(pcm) == "hi"
+        assert fake_ort.sessions[0][2] == ["CPUExecutionProvider"]
+        assert inputs[0].shape == (1, 4)
+        assert abs(float(inputs[0].mean())) < 1e-6
+        assert transcriber.transcribe(b"") == ""
+
+    def test_prefers_quantized_model(self, tmp_path, fake_ort):
+        """Test an INT8 copy next to the model is loaded on the CPU provider"""
+        vocab_path = tmp_path / "vocab.json"
+        vocab_path.write_text(json.dumps({token: i for i, token in enumerate(VOCAB)}))
+        (tmp_path / "model.int8.onnx").write_bytes(b"")
+
+        OnnxTranscriber(str(tmp_path / "model.onnx"), str(vocab_path))
+        path, options, providers = fake_ort.sessions[0]
+        assert path == str(tmp_path / "model.int8.onnx")
+        assert providers == ["CPUExecutionProvider"]
+        assert options.config == {"session.intra_op.allow_spinning": "1"}
+
+    def test_session_shared(self, tmp_path, fake_ort):
+        """Test recognizers using the same model share one session"""
+        vocab_path = tmp_path / "vocab.json"
+        vocab_path.write_text(json.dumps({token: i for i, token in enumerate(VOCAB)}))
+
+        first = OnnxTranscriber(str(tmp_path / "model.onnx"), str(vocab_path))
+        second = OnnxTranscriber(str(tmp_path / "model.onnx"), str(vocab_path))
+        assert first.session is second.session
+        assert len(fake_ort.sessions) == 1
+
+    def test_requires_onnxruntime(self, monkeypatch):
+        """Test a clear error when onnxruntime is missing"""
+        monkeypatch.setattr(stt_engine, "ONNX_AVAILABLE", False)
+        with pytest.raises(RuntimeError):
+            OnnxTranscriber()
+
+
+class TestWakeWord:
+
+    def test_mfcc_shape(self):
+        """Test MFCC frames are 10 ms apart"""
+        samples = np.zeros(16000, dtype=np.float32)
+        features = mfcc(samples)
+        assert features.shape == (98, 13)
+        assert features.dtype == np.float32
+
+    def test_scores_every_hop(self, fake_ort):
+        """Test the window is scored every 250 ms and fires above threshold"""
+        logits = iter([-5.0, 5.0])
+        runs = []
+
+        def run(features):
+            runs.append(features.shape)
+            return [np.array([[next(logits)]], dtype=np.float32)]
+
+        fake_ort.run = run
+        detector = WakeWordDetector("wake.onnx")
+        frame = np.zeros(320, dtype=np.int16).tobytes()
+
+        heard = [detector.process(frame) for _ in range(26)]
+        assert heard.count(True) == 1 and heard[-1] is True
+        assert runs == [(1, 98, 13), (1, 98, 13)]
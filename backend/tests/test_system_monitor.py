@@ -0,0 +1,102 @@
+"""
+Tests for System Monitor
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import psutil
+import pytest
+from modules.system_monitor import SystemMonitor, CPU_SAMPLE_INTERVAL
+
+
+@pytest.fixture
+def monitor():
+    """Fresh system monitor"""
+    mon = SystemMonitor()
+    yield mon
+    mon.close()
+
+
+class TestSystemMonitor:
+
+    def test_cpu_info(self, monitor):
+        """Test CPU usage is reported per core and in total"""
+        info = monitor.get_cpu_info()
+        assert 0 <= info["usage_percent"] <= 100
+        assert len(info["per_core_usage"]) == info["total_cores"]
+
+    def test_cpu_sample_waits_only_once(self, monitor):
+        """Test back-to-back samples sleep at most one window each"""
+        start = time.monotonic()
+        monitor.get_cpu_info()
+        monitor.get_cpu_info()
+        elapsed = time.monotonic() - start
+        assert elapsed < CPU_SAMPLE_INTERVAL * 2 + 0.1
+
+    def test_complete_stats(self, monitor):
+        """Test the full snapshot includes every section"""
+        stats = monitor.get_complete_system_stats()
+        assert set(stats) == {
+            "timestamp", "system", "cpu", "memory", "disks",
+            "network", "processes", "temperature", "battery"
+        }
+        assert stats["processes"]["total_processes"] > 0
+
+    def test_top_processes_sorted(self, monitor):
+        """Test the busiest processes are reported in descending CPU order"""
+        info = monitor.get_process_info()
+        usage = [p["cpu_percent"] for p in info["top_processes"]]
+        assert usage == sorted(usage, reverse=True)
+        assert len(usage) <= min(10, info["total_processes"])
+
+    def test_system_info(self, monitor):
+        """Test static host details are combined with a live uptime"""
+        first = monitor.get_system_info()
+        assert first["os"]
+        assert first["uptime_seconds"] >= 0
+        assert first["boot_time"] == monitor.get_system_info()["boot_time"]
+
+    def test_snapshot_reused_within_ttl(self, monitor, monkeypatch):
+        """Test concurrent pollers share one snapshot"""
+        calls = []
+
+        def fake_collect():
+            calls.append(1)
+            time.sleep(0.05)
+            return {"timestamp": len(calls)}
+
+        monkeypatch.setattr(monitor, "_collect_system_stats", fake_collect)
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(lambda _: monitor.get_complete_system_stats(), range(8)))
+
+        assert len(calls) == 1
+        assert all(r is results[0] for r in results)
+
+    def test_partitions_cached(self, monitor, monkeypatch):
+        """Test the partition list is read once within its TTL"""
+        calls = []
+        real = psutil.disk_partitions
+
+        def counting_partitions(*args, **kwargs):
+            calls.append(1)
+            return real(*args, **kwargs)
+
+        monkeypatch.setattr(psutil, "disk_partitions", counting_partitions)
+        monitor.get_disk_info()
+        monitor.get_disk_info()
+        assert len(calls) == 1
+
+    def test_network_family_names(self, monitor):
+        """Test address families are reported by name"""
+        info = monitor.get_network_info()
+        families = {a["family"] for i in info["interfaces"] for a in i["addresses"]}
+        assert "AF_INET" in families
+
+    def test_format_uptime(self, monitor):
+        """Test uptime formatting skips zero components"""
+        assert monitor._format_uptime(0) == "0s"
+        assert monitor._format_uptime(90061) == "1d 1h 1m 1s"
+        assert monitor._format_uptime(7200) == "2h"
+        assert monitor._format_uptime(7200) == "2h"
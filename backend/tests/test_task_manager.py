@@ -0,0 +1,206 @@
+"""
+Tests for Task Manager
+"""
+
+import sqlite3
+
+import pytest
+from modules.task_manager import TaskManager, _parse_task_text
+
+
+@pytest.fixture
+def manager(tmp_path):
+    """Task manager backed by a temporary database"""
+    mgr = TaskManager(db_path=str(tmp_path / "tasks.db"))
+    yield mgr
+    mgr.close()
+
+
+class TestParseNaturalLanguage:
+
+    def test_priority_and_due_date(self, manager):
+        """Test urgent tasks due tomorrow"""
+        task = manager.parse_natural_language("Fix login bug tomorrow urgent")
+        assert task["priority"] == "high"
+        assert task["due_date"] is not None
+        assert task["category"] == "coding"
+        assert task["title"] == "Fix login bug"
+
+    def test_low_priority(self, manager):
+        """Test low priority phrase"""
+        task = manager.parse_natural_language("Read a novel someday")
+        assert task["priority"] == "low"
+        assert task["category"] == "learning"
+        assert task["due_date"] is None
+
+    def test_date_phrase(self, manager):
+        """Test 'by <day>' sets a due date"""
+        task = manager.parse_natural_language("Send report by Friday")
+        assert task["due_date"] is not None
+        assert task["title"] == "Send report by Friday"
+
+    def test_title_cleanup_case_insensitive(self, manager):
+        """Test date and priority keywords are stripped regardless of case"""
+        task = manager.parse_natural_language("ASAP deploy service Next Week")
+        assert task["title"] == "deploy service"
+
+    def test_keyword_precedence(self, manager):
+        """Test the first-listed keyword wins when several match"""
+        task = manager.parse_natural_language("Study the project notes whenever, critical")
+        assert task["priority"] == "high"
+        assert task["category"] == "work"
+
+    def test_whole_words_only(self, manager):
+        """Test keywords inside longer words are ignored"""
+        task = manager.parse_natural_language("Plan a workout")
+        assert task["category"] == "general"
+
+    def test_phrase_spacing(self, manager):
+        """Test multi-word keywords match across any whitespace"""
+        task = manager.parse_natural_language("Tidy desk  low\tpriority next\nweek")
+        assert task["priority"] == "low"
+        assert task["due_date"] is not None
+        assert task["title"] == "Tidy desk low priority"
+
+
+    def test_repeated_parse_uses_cache(self, manager):
+        """Test repeated inputs hit the parse cache but get fresh dates"""
+        _parse_task_text.cache_clear()
+        first = manager.parse_natural_language("Call mom tomorrow")
+        second = manager.parse_natural_language("Call mom tomorrow")
+
+        assert _parse_task_text.cache_info().hits == 1
+        assert first["title"] == second["title"] == "Call mom"
+        assert second["due_date"] >= first["due_date"]
+
+
+class TestTaskStorage:
+
+    def test_create_and_get(self, manager):
+        """Test creating and fetching a task"""
+        created = manager.create_task({"title": "Write docs", "category": "work"})
+        assert created["status"] == "pending"
+        assert manager.get_task(created["id"])["title"] == "Write docs"
+
+    def test_update_and_delete(self, manager):
+        """Test updating status then deleting"""
+        created = manager.create_task({"title": "Ship it"})
+        updated = manager.update_task(created["id"], {"status": "done"})
+        assert updated["status"] == "done"
+        assert updated["completed_at"] is not None
+
+        assert manager.delete_task(created["id"]) is True
+        assert manager.get_task(created["id"]) is None
+
+    def test_filtering(self, manager):
+        """Test filtering by status and category"""
+        a = manager.create_task({"title": "A", "category": "work"})
+        manager.create_task({"title": "B", "category": "personal"})
+        manager.update_task(a["id"], {"status": "in_progress"})
+
+        assert [t["title"] for t in manager.get_all_tasks(category="work")] == ["A"]
+        assert [t["title"] for t in manager.get_all_tasks(status="pending")] == ["B"]
+
+    def test_create_tasks_bulk(self, manager):
+        """Test bulk creation returns IDs in input order"""
+        ids = manager.create_tasks([{"title": "A"}, {"title": "B", "priority": "high"}])
+        assert [manager.get_task(i)["title"] for i in ids] == ["A", "B"]
+        assert manager.get_task(ids[1])["priority"] == "high"
+
+    def test_create_tasks_rolls_back(self, manager):
+        """Test a failing bulk insert writes nothing"""
+        with pytest.raises(Exception):
+            manager.create_tasks([{"title": "A"}, {"title": None}])
+        assert manager.get_all_tasks() == []
+
+    def test_due_timestamp_migration(self, tmp_path):
+        """Test databases without due_ts are migrated and backfilled"""
+        db_path = str(tmp_path / "old.db")
+        conn = sqlite3.connect(db_path)
+        conn.execute("""
+            CREATE TABLE tasks (
+                id TEXT PRIMARY KEY, title TEXT NOT NULL, description TEXT,
+                priority TEXT DEFAULT 'medium', status TEXT DEFAULT 'pending',
+                due_date TEXT, category TEXT, created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL, completed_at TEXT
+            )
+        """)
+        conn.execute(
+            "INSERT INTO tasks (id, title, due_date, created_at, updated_at) "
+            "VALUES ('1', 'Old', '2000-01-01T00:00:00', 'x', 'x')"
+        )
+        conn.commit()
+        conn.close()
+
+        manager = TaskManager(db_path=db_path)
+        assert manager.get_statistics()["overdue"] == 1
+
+        manager.update_task("1", {"due_date": "2999-01-01T00:00:00"})
+        assert manager.get_statistics()["overdue"] == 0
+        manager.close()
+
+    def test_due_timestamp_backfill_resumes(self, tmp_path):
+        """Test rows left without due_ts by an interrupted migration are filled in"""
+        db_path = str(tmp_path / "partial.db")
+        TaskManager(db_path=db_path).close()
+        conn = sqlite3.connect(db_path)
+        conn.execute(
+            "INSERT INTO tasks (id, title, due_date, created_at, updated_at, due_ts) "
+            "VALUES ('1', 'Old', '2000-01-01T00:00:00', 'x', 'x', NULL)"
+        )
+        conn.commit()
+        conn.close()
+
+        manager = TaskManager(db_path=db_path)
+        assert manager.get_statistics()["overdue"] == 1
+        manager.close()
+
+    def test_update_statement_cached(self, manager):
+        """Test updates with the same fields reuse one statement"""
+        a = manager.create_task({"title": "A"})
+        b = manager.create_task({"title": "B"})
+        manager.update_task(a["id"], {"priority": "high", "ignored": 1})
+        manager.update_task(b["id"], {"priority": "low"})
+
+        assert len(manager._update_sql_cache) == 1
+        assert manager.get_task(b["id"])["priority"] == "low"
+
+    def test_iter_tasks(self, manager):
+        """Test streaming tasks yields plain dicts newest first"""
+        manager.create_tasks([{"title": "A"}])
+        manager.create_tasks([{"title": "B"}])
+
+        tasks = list(manager.iter_tasks())
+        assert [type(t) for t in tasks] == [dict, dict]
+        assert {t["title"] for t in tasks} == {"A", "B"}
+
+    def test_connection_reused(self, manager):
+        """Test calls on one thread share a connection"""
+        conn = manager._conn()
+        manager.create_task({"title": "A"})
+        assert manager._conn() is conn
+
+    def test_statistics(self, manager):
+        """Test aggregate counts and overdue detection"""
+        manager.create_task({"title": "A", "category": "work", "priority": "high",
+                             "due_date": "2000-01-01T00:00:00"})
+        b = manager.create_task({"title": "B", "category": "work",
+                                 "due_date": "2000-01-01T00:00:00"})
+        manager.create_task({"title": "C", "category": None})
+        manager.update_task(b["id"], {"status": "done"})
+
+        stats = manager.get_statistics()
+        assert stats["total"] == 3
+        assert stats["pending"] == 2
+        assert stats["done"] == 1
+        assert stats["overdue"] == 1
+        assert stats["by_category"] == {"work": 2, "general": 1}
+        assert stats["by_priority"] == {"high": 1, "medium": 2}
+
+    def test_statistics_empty_category(self, manager):
+        """Test tasks with an empty category count as general"""
+        manager.create_task({"title": "A", "category": ""})
+        manager.create_task({"title": "B", "category": None})
+        manager.create_task({"title": "C", "category": "work"})
+
+        assert manager.get_statistics()["by_category"] == {"general": 2, "work": 1}
@@ -0,0 +1,139 @@
+"""
+Tests for Terminal Manager
+"""
+
+import pytest
+from modules import terminal_manager
+from modules.terminal_manager import TerminalManager
+
+
+@pytest.fixture
+def manager():
+    """Terminal manager with no sessions"""
+    return TerminalManager()
+
+
+class TestSuggestions:
+
+    def test_history_most_recent_first(self, manager):
+        """Test history suggestions are unique and ordered by last use"""
+        session_id = manager.create_session()
+        session = manager.get_session(session_id)
+        for cmd in ["git pull", "git status", "ls", "git pull"]:
+            session.add_to_history(cmd, "", 0)
+
+        suggestions = manager.get_suggestions("git", session_id)
+        assert suggestions[:2] == ["git pull", "git status"]
+        assert suggestions[2:] == ["git log"]
+
+    def test_history_capped_at_five(self, manager):
+        """Test at most five history entries are suggested"""
+        session_id = manager.create_session()
+        session = manager.get_session(session_id)
+        for i in range(8):
+            session.add_to_history(f"echo {i}", "", 0)
+
+        assert manager.get_suggestions("echo", session_id) == [
+            "echo 7", "echo 6", "echo 5", "echo 4", "echo 3"
+        ]
+
+    def test_common_commands(self, manager):
+        """Test common commands are suggested for a fresh session"""
+        session_id = manager.create_session()
+        assert manager.get_suggestions("docker", session_id) == ["docker ps", "docker logs"]
+        assert len(manager.get_suggestions("", session_id)) == 10
+
+    def test_unknown_session(self, manager):
+        """Test suggestions for a missing session"""
+        assert manager.get_suggestions("ls", "missing") == []
+
+
+class TestCommandSafety:
+
+    def test_dangerous_base_command(self, manager):
+        """Test destructive commands need confirmation"""
+        is_safe, message = manager.is_command_safe("  rm -rf build")
+        assert is_safe is False
+        assert "rm" in message
+
+    def test_operators(self, manager):
+        """Test commands with shell operators"""
+        assert manager.is_command_safe("ls | grep py") == (
+            True, "Command contains operators but appears safe"
+        )
+        assert manager.is_command_safe("ls; rm -rf x") == (True, "Command is safe")
+        assert manager.is_command_safe("git status") == (True, "Command is safe")
+
+
+class TestExecuteCommand:
+
+    @pytest.mark.asyncio
+    async def test_output_and_callback(self, manager):
+        """Test output is collected and streamed to the callback"""
+        session_id = manager.create_session()
+        chunks = []
+
+        async def callback(event):
+            chunks.append(event)
+
+        result = await manager.execute_command(session_id, "echo hello", callback)
+        assert result["success"] is True
+        assert result["output"] == "hello\n"
+        assert chunks == [{"type": "stdout", "data": "hello\n"}]
+        assert manager.get_history(session_id)[0]["output"] == "hello\n"
+
+    @pytest.mark.asyncio
+    async def test_truncated_character_streamed(self, manager):
+        """Test a multi-byte character cut off at EOF still reaches the callback"""
+        session_id = manager.create_session()
+        chunks = []
+
+        async def callback(event):
+            chunks.append(event)
+
+        result = await manager.execute_command(session_id, "printf 'ok\\342\\202'", callback)
+        assert result["output"] == "ok\ufffd"
+        assert "".join(c["data"] for c in chunks) == result["output"]
+
+    @pytest.mark.asyncio
+    async def test_output_capped(self, manager, monkeypatch):
+        """Test only the tail of large output is kept"""
+        monkeypatch.setattr(terminal_manager, "MAX_OUTPUT_BYTES", 8)
+
+        session_id = manager.create_session()
+        result = await manager.execute_command(session_id, "printf 'abc\\ndefgh\\nij\\n'")
+        assert result["output"] == "defgh\nij\n"[-8:]
+
+    @pytest.mark.asyncio
+    async def test_long_line(self, manager):
+        """Test output lines longer than one read chunk"""
+        session_id = manager.create_session()
+        result = await manager.execute_command(
+            session_id, "python -c \"print('x' * 200000)\""
+        )
+        assert result["output"] == "x" * 200000 + "\n"
+
+
+class TestChangeDirectory:
+
+    def test_change_directory(self, manager, tmp_path):
+        """Test moving into subdirectories and rejecting files"""
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "file.txt").write_text("x")
+        session_id = manager.create_session(str(tmp_path))
+
+        assert manager.change_directory(session_id, "sub") is True
+        assert manager.get_current_directory(session_id) == str(tmp_path / "sub")
+
+        assert manager.change_directory(session_id, "../file.txt") is False
+        assert manager.change_directory(session_id, "missing") is False
+        assert manager.get_current_directory(session_id) == str(tmp_path / "sub")
+
+    @pytest.mark.asyncio
+    async def test_cd_command(self, manager, tmp_path):
+        """Test a cd command updates the session directory"""
+        (tmp_path / "sub").mkdir()
+        session_id = manager.create_session(str(tmp_path))
+
+        result = await manager.execute_command(session_id, "cd sub")
+        assert result["cwd"] == str(tmp_path / "sub")
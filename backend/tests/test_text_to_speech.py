@@ -0,0 +1,53 @@
+"""
+Tests for Text-to-Speech queueing
+"""
+
+import threading
+
+import pytest
+from modules.text_to_speech import MAX_PENDING_SPEECH, TextToSpeech
+
+
+@pytest.fixture
+def tts():
+    """TTS instance with queueing enabled but no engine or worker thread"""
+    instance = TextToSpeech()
+    instance.enabled = True
+    return instance
+
+
+class TestSpeechQueue:
+
+    def test_priority_goes_first(self, tts):
+        """Test priority speech jumps the queue"""
+        tts.speak("one")
+        tts.speak("two")
+        tts.speak("urgent", priority=True)
+        assert list(tts._deque) == ["urgent", "one", "two"]
+
+    def test_clear_queue(self, tts):
+        """Test clearing pending speech"""
+        tts.speak("one")
+        tts.clear_queue()
+        assert len(tts._deque) == 0
+
+    def test_shutdown_stops_loop(self, tts):
+        """Test the speech loop exits on shutdown before pending speech"""
+        spoken = []
+        tts.engine = object()
+        tts.speak_now = spoken.append
+        tts.speak("one")
+        tts.shutdown()
+
+        worker = threading.Thread(target=tts._speech_loop)
+        worker.start()
+        worker.join(timeout=2)
+        assert not worker.is_alive()
+        assert spoken == []
+
+    def test_queue_drops_oldest(self, tts):
+        """Test a full queue drops the oldest pending speech"""
+        for i in range(MAX_PENDING_SPEECH + 2):
+            tts.speak(str(i))
+        assert len(tts._deque) == MAX_PENDING_SPEECH
+        assert tts._deque[0] == "2"
@@ -0,0 +1,221 @@
+"""
+Tests for Visual Programming
+"""
+
+import json
+import sys
+from dataclasses import asdict
+
+import pytest
+from modules import visual_programming
+from modules.visual_programming import VisualProgramming
+
+
+@pytest.fixture
+def vp():
+    """Visual programming module without an LLM"""
+    return VisualProgramming()
+
+
+class TestWorkflows:
+
+    @pytest.mark.asyncio
+    async def test_create_from_template(self, vp):
+        """Test template workflows get chained nodes"""
+        result = await vp.create_workflow("My API", "CRUD", template="rest_api")
+        workflow = result["workflow"]
+        assert len(workflow["nodes"]) == 5
+        assert len(workflow["connections"]) == 4
+        assert workflow["connections"][0]["source_node"] == workflow["nodes"][0]["id"]
+
+    @pytest.mark.asyncio
+    async def test_template_instances_independent(self, vp):
+        """Test workflows from one template do not share node state"""
+        first = (await vp.create_workflow("A", "a", template="rest_api"))["workflow_id"]
+        second = (await vp.create_workflow("B", "b", template="rest_api"))["workflow_id"]
+
+        vp.workflows[first].nodes[0].position["x"] = 999
+        vp.workflows[first].nodes[0].config["k"] = "v"
+        assert vp.workflows[second].nodes[0].position["x"] == 300
+        assert vp.workflows[second].nodes[0].config == {}
+
+    @pytest.mark.asyncio
+    async def test_to_dict_matches_asdict(self, vp):
+        """Test hand-written serialization matches dataclasses.asdict"""
+        result = await vp.create_workflow("Pipeline", "ETL", template="data_pipeline")
+        workflow = vp.workflows[result["workflow_id"]]
+        indexes = {"outgoing", "incoming"}
+        public = {k: v for k, v in asdict(workflow).items()
+                  if not k.startswith("_") and k not in indexes}
+        assert workflow.to_dict() == public
+
+    @pytest.mark.asyncio
+    async def test_add_and_connect_nodes(self, vp):
+        """Test adding and connecting nodes"""
+        workflow_id = (await vp.create_workflow("Flow", "desc"))["workflow_id"]
+        first = await vp.add_node(workflow_id, "start", "Begin", {"x": 0, "y": 0})
+        second = await vp.add_node(workflow_id, "function", "Work", {"x": 0, "y": 100},
+                                   {"function": "do_work"})
+        conn = await vp.connect_nodes(workflow_id, first["node_id"], second["node_id"])
+
+        assert first["node"]["inputs"] == []
+        assert conn["connection"]["target_node"] == second["node_id"]
+
+        workflow = (await vp.get_workflow(workflow_id))["workflow"]
+        assert [n["label"] for n in workflow["nodes"]] == ["Begin", "Work"]
+
+    @pytest.mark.asyncio
+    async def test_missing_workflow(self, vp):
+        """Test operations on an unknown workflow"""
+        result = await vp.add_node("missing", "start", "x", {"x": 0, "y": 0})
+        assert result == {"success": False, "error": "Workflow not found"}
+
+    @pytest.mark.asyncio
+    async def test_list_workflows_refreshes(self, vp):
+        """Test workflow summaries follow edits"""
+        workflow_id = (await vp.create_workflow("Flow", "desc"))["workflow_id"]
+        listed = await vp.list_workflows()
+        assert listed["total"] == 1
+        assert listed["workflows"][0]["nodes_count"] == 0
+
+        await vp.add_node(workflow_id, "custom", "X", {"x": 0, "y": 0})
+        assert (await vp.list_workflows())["workflows"][0]["nodes_count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_ids_not_reused(self, vp):
+        """Test node ids stay unique after a node is removed"""
+        workflow_id = (await vp.create_workflow("Flow", "desc", template="rest_api"))["workflow_id"]
+        workflow = vp.workflows[workflow_id]
+        workflow.nodes.pop()
+
+        added = await vp.add_node(workflow_id, "custom", "X", {"x": 0, "y": 0})
+        assert added["node_id"] == "node_5"
+        assert (await vp.connect_nodes(workflow_id, "node_0", "node_5"))["connection_id"] == "conn_4"
+
+    @pytest.mark.asyncio
+    async def test_export_import_round_trip(self, vp):
+        """Test exported workflows import with the same content"""
+        workflow_id = (await vp.create_workflow("Flow", "desc", template="rest_api"))["workflow_id"]
+        exported = (await vp.export_workflow(workflow_id))["data"]
+        original = vp.workflows.pop(workflow_id).to_dict()
+
+        assert (await vp.import_workflow(exported))["workflow_id"] == workflow_id
+        imported = vp.workflows[workflow_id]
+        assert imported.to_dict()["nodes"] == original["nodes"]
+        assert imported.to_dict()["connections"] == original["connections"]
+        assert (await vp.add_node(workflow_id, "custom", "X", {"x": 0, "y": 0}))["node_id"] == "node_5"
+
+    @pytest.mark.asyncio
+    async def test_export_without_orjson(self, vp, monkeypatch):
+        """Test export falls back to the standard json module"""
+        monkeypatch.setattr(visual_programming, "ORJSON_AVAILABLE", False)
+        workflow_id = (await vp.create_workflow("Flow", "desc"))["workflow_id"]
+        exported = (await vp.export_workflow(workflow_id))["data"]
+        assert json.loads(exported)["workflow_id"] == workflow_id
+
+    @pytest.mark.asyncio
+    async def test_import_partial_nodes(self, vp):
+        """Test imported nodes missing optional fields get defaults"""
+        data = {
+            "workflow_id": "w1", "name": "Flow", "description": "d", "created_at": 0,
+            "nodes": [{"id": "node_0", "type": "start", "label": "S",
+                       "position": {"x": 0, "y": 0}, "config": {}}],
+            "connections": []
+        }
+        assert (await vp.import_workflow(json.dumps(data)))["success"] is True
+        assert vp.workflows["w1"].nodes[0].inputs == []
+
+    @pytest.mark.asyncio
+    async def test_connection_indexes(self, vp):
+        """Test connections are indexed by source and target node"""
+        workflow_id = (await vp.create_workflow("Flow", "desc", template="rest_api"))["workflow_id"]
+        await vp.connect_nodes(workflow_id, "node_0", "node_3")
+        workflow = vp.workflows[workflow_id]
+
+        assert [c.target_node for c in workflow.outgoing["node_0"]] == ["node_1", "node_3"]
+        assert [c.source_node for c in workflow.incoming["node_3"]] == ["node_2", "node_0"]
+
+    @pytest.mark.asyncio
+    async def test_slotted_instances(self, vp):
+        """Test workflow dataclasses carry no per-instance __dict__"""
+        if sys.version_info < (3, 10):
+            pytest.skip("slotted dataclasses need Python 3.10+")
+        workflow_id = (await vp.create_workflow("Flow", "desc", template="rest_api"))["workflow_id"]
+        exported = (await vp.export_workflow(workflow_id))["data"]
+        vp.workflows.pop(workflow_id)
+        await vp.import_workflow(exported)
+
+        workflow = vp.workflows[workflow_id]
+        for obj in (workflow, workflow.nodes[0], workflow.connections[0]):
+            assert not hasattr(obj, "__dict__")
+
+
+class TestCodeGeneration:
+
+    @pytest.mark.asyncio
+    async def test_execution_order(self, vp):
+        """Test nodes are emitted in dependency order"""
+        workflow_id = (await vp.create_workflow("Flow", "desc"))["workflow_id"]
+        ids = []
+        for label in ["C", "A", "B"]:
+            ids.append((await vp.add_node(workflow_id, "custom", label, {"x": 0, "y": 0}))["node_id"])
+        await vp.connect_nodes(workflow_id, ids[1], ids[2])
+        await vp.connect_nodes(workflow_id, ids[2], ids[0])
+
+        order = vp._get_execution_order(vp.workflows[workflow_id])
+        assert [n.label for n in order] == ["A", "B", "C"]
+
+    @pytest.mark.asyncio
+    async def test_generate_languages(self, vp):
+        """Test code generation for each supported language"""
+        workflow_id = (await vp.create_workflow("My Flow", "Does things",
+                                                template="webhook_handler"))["workflow_id"]
+
+        python = await vp.generate_code(workflow_id, "python", "fastapi")
+        assert "async def my_flow(data: Dict[str, Any]) -> Dict[str, Any]:" in python["code"]
+        assert "@router.post('/my_flow')" in python["code"]
+        compile(python["code"], "<generated>", "exec")
+
+        javascript = await vp.generate_code(workflow_id, "javascript", "express")
+        assert "module.exports = router;" in javascript["code"]
+
+        typescript = await vp.generate_code(workflow_id, "typescript")
+        assert typescript["code"].endswith("export { my_flow };")
+
+        assert (await vp.generate_code(workflow_id, "cobol"))["success"] is False
+
+    @pytest.mark.asyncio
+    async def test_execution_order_cached(self, vp):
+        """Test the sort is reused until the workflow changes"""
+        workflow_id = (await vp.create_workflow("Flow", "desc", template="rest_api"))["workflow_id"]
+        workflow = vp.workflows[workflow_id]
+
+        first = vp._get_execution_order(workflow)
+        assert vp._get_execution_order(workflow) is first
+
+        await vp.add_node(workflow_id, "custom", "Extra", {"x": 0, "y": 0})
+        assert len(vp._get_execution_order(workflow)) == len(first) + 1
+
+    def test_sql_from_schema(self, vp):
+        """Test column constraints are rendered in CREATE TABLE statements"""
+        sql = vp._generate_sql_from_schema({
+            "schema_name": "shop",
+            "tables": [{
+                "name": "items",
+                "columns": [
+                    {"name": "id", "type": "INTEGER", "not_null": True},
+                    {"name": "sku", "type": "TEXT", "unique": True, "default": "''"},
+                    {"name": "qty", "type": "INTEGER", "default": 0},
+                ],
+                "primary_key": "id"
+            }]
+        })
+        assert sql == (
+            "-- Database Schema: shop\n\n"
+            "CREATE TABLE items (\n"
+            "  id INTEGER NOT NULL,\n"
+            "  sku TEXT UNIQUE DEFAULT '',\n"
+            "  qty INTEGER,\n"
+            "  PRIMARY KEY (id)\n"
+            ");\n"
+        )
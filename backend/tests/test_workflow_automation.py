@@ -0,0 +1,161 @@
+"""
+Tests for Workflow Automation
+"""
+
+import asyncio
+from collections import deque
+from dataclasses import asdict
+from datetime import datetime, timedelta
+
+import pytest
+from modules.workflow_automation import (
+    ActionType, NaturalLanguageParser, TriggerType, WorkflowAutomationEngine
+)
+
+
+@pytest.fixture
+def engine():
+    """Fresh workflow automation engine"""
+    return WorkflowAutomationEngine()
+
+
+class TestNaturalLanguageParser:
+
+    def test_parse_triggers_and_actions(self):
+        """Test triggers and actions are extracted case-insensitively"""
+        parsed = NaturalLanguageParser().parse(
+            "Every 2 Hours run command 'make backup' and Send Notification"
+        )
+        assert parsed['triggers'] == [
+            {'type': 'time_based', 'interval': 2, 'unit': 'Hour', 'condition': "every 2 Hour"}
+        ]
+        assert [a['type'] for a in parsed['actions']] == ['run_command', 'send_notification']
+        assert parsed['actions'][0]['command'] == 'make backup'
+
+    def test_parse_git_condition_and_deploy(self):
+        """Test git, conditional and deploy phrases"""
+        parsed = NaturalLanguageParser().parse(
+            "when push, if tests pass then run tests and deploy to staging"
+        )
+        assert [t['type'] for t in parsed['triggers']] == ['git_event', 'condition']
+        assert parsed['triggers'][1]['condition'] == 'tests pass'
+        assert [a['type'] for a in parsed['actions']] == ['run_tests', 'deploy']
+        assert parsed['actions'][1]['environment'] == 'staging'
+
+
+class TestScheduler:
+
+    def test_next_run_hours(self, engine):
+        """Test hourly schedules parse their interval"""
+        next_run = engine.scheduler._calculate_next_run("every 3 hours")
+        assert timedelta(hours=2.9) < next_run - datetime.now() <= timedelta(hours=3)
+
+
+class TestExecution:
+
+    @pytest.mark.asyncio
+    async def test_history_by_workflow(self, engine):
+        """Test execution history is kept overall and per workflow"""
+        first = engine.create_workflow_from_natural_language("run tests", name="First")
+        second = engine.create_workflow_from_natural_language("send notification", name="Second")
+
+        await engine.execute_workflow(first.id)
+        await engine.execute_workflow(second.id)
+        await engine.execute_workflow(first.id)
+
+        assert len(engine.get_execution_history()) == 3
+        assert [h['workflow_name'] for h in engine.get_execution_history(first.id)] == ["First", "First"]
+        assert engine.get_execution_history("missing") == []
+
+    @pytest.mark.asyncio
+    async def test_history_bounded(self, engine):
+        """Test old execution records are dropped past the limit"""
+        engine.executor.execution_history = deque(maxlen=2)
+        workflow = engine.create_workflow_from_natural_language("run tests")
+        for _ in range(3):
+            await engine.execute_workflow(workflow.id)
+
+        assert len(engine.get_execution_history()) == 2
+
+    @pytest.mark.asyncio
+    async def test_independent_actions_run_concurrently(self, engine):
+        """Test actions overlap unless ordered by depends_on"""
+        events = []
+
+        async def slow(action, context):
+            events.append(("start", action.id))
+            await asyncio.sleep(0.01)
+            events.append(("end", action.id))
+            if action.id == "action_1":
+                raise RuntimeError("boom")
+            return action.id
+
+        executor = engine.executor
+        for action_type in list(executor.action_handlers):
+            executor.action_handlers[action_type] = slow
+
+        workflow = engine.create_workflow_from_natural_language(
+            "run tests and send notification and deploy to staging"
+        )
+        record = await engine.execute_workflow(workflow.id)
+
+        assert events[:2] == [("start", "action_0"), ("start", "action_1")]
+        assert events[-2:] == [("start", "action_2"), ("end", "action_2")]
+        assert [r['status'] for r in record['results']] == ['success', 'failed', 'success']
+        assert record['results'][1]['error'] == "boom"
+
+    @pytest.mark.asyncio
+    async def test_ids_unique(self, engine):
+        """Test ids minted in quick succession never collide"""
+        workflows = [engine.create_workflow({'name': str(i)}) for i in range(50)]
+        assert len({w.id for w in workflows}) == 50
+
+        record = await engine.execute_workflow(workflows[0].id)
+        assert record['execution_id'].startswith("exec_")
+        assert workflows[0].last_run == record['executed_at']
+
+    def test_natural_language_types(self, engine):
+        """Test parsed trigger and action names map onto their enums"""
+        workflow = engine.create_workflow_from_natural_language(
+            "when commit, every 1 day run command 'lint' and deploy to prod"
+        )
+        assert [t.type for t in workflow.triggers] == [TriggerType.TIME_BASED, TriggerType.GIT_EVENT]
+        assert [a.type for a in workflow.actions] == [ActionType.RUN_COMMAND, ActionType.DEPLOY]
+
+    def test_run_pending_in_due_order(self, engine):
+        """Test only due tasks run, disabled ones are skipped, and both are rescheduled"""
+        scheduler = engine.scheduler
+        ran = []
+        scheduler.schedule_task("daily", "every day", lambda: ran.append("daily"))
+        hourly = scheduler.schedule_task("hourly", "every 1 hour", lambda: ran.append("hourly"))
+        scheduler.schedule_task("weekly", "every week", lambda: ran.append("weekly"))
+
+        due = scheduler.tasks[hourly]['next_run']
+        delay = scheduler.run_pending(now=due.timestamp())
+        assert ran == ["hourly"]
+        assert scheduler.tasks[hourly]['next_run'] >= due
+        assert delay <= 60 * 60
+
+        scheduler.disable_task(hourly)
+        scheduler.run_pending(now=scheduler.tasks[hourly]['next_run'].timestamp())
+        assert ran == ["hourly"]
+        assert [t['name'] for t in scheduler.get_scheduled_tasks()] == ["daily", "hourly", "weekly"]
+
+    @pytest.mark.asyncio
+    async def test_list_workflows_tracks_changes(self, engine):
+        """Test listed workflows match their fields and refresh after changes"""
+        workflow = engine.create_workflow_from_natural_language("every 1 hour run tests")
+        expected = asdict(workflow)
+        expected.pop('_cached_dict')
+        for item in expected['triggers'] + expected['actions']:
+            item['type'] = item['type'].value
+        assert engine.list_workflows() == [expected]
+
+        engine.disable_workflow(workflow.id)
+        assert engine.list_workflows()[0]['enabled'] is False
+
+        engine.enable_workflow(workflow.id)
+        await engine.execute_workflow(workflow.id)
+        listed = engine.list_workflows()[0]
+        assert listed['run_count'] == 1
+        assert listed['last_run'] == workflow.last_run